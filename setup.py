@@ -11,11 +11,12 @@ setup(
     description="Visualise how different sorting algorithms manage an array.",
     long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     license="MIT",
     platforms="any",
     include_package_data=True,
     install_requires=["customtkinter", "pillow"],
+    extras_require={"numpy": ["numpy"]},
     entry_points={
         "gui_scripts": [
             "sorting-ctk = sorting_vis.__main__:start",
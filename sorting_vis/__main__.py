@@ -1,10 +1,90 @@
-from sorting_vis.gui import Home
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+from time import perf_counter
+from typing import List, Optional
 
+# Commands are imported only when they are run, so that opening the gui
+# doesn't pay for the process pools and image export of the cli.
+COMMANDS = {
+    "bench": (
+        "sorting_vis.benchmark",
+        "benchmark the bare algorithms without a gui",
+    ),
+    "complexity": (
+        "sorting_vis.complexity",
+        "fit the bare algorithms' scaling over a geometric size sweep",
+    ),
+    "regress": (
+        "sorting_vis.regression",
+        "check the algorithms for slowdowns against stored baselines",
+    ),
+    "trace": (
+        "sorting_vis.trace_file",
+        "record a sort run to a binary trace file",
+    ),
+    "export": (
+        "sorting_vis.export",
+        "render a sort run to a gif or png sequence",
+    ),
+}
+STARTUP_BUDGET = 0.5
 
-def start() -> None:
+
+def start(profile: bool = False) -> None:
+    started = perf_counter()
+    from sorting_vis.gui import Home
+
+    imported = perf_counter()
     app = Home()
+    app.update_idletasks()
+    built = perf_counter()
+
+    if profile:
+        total = built - started
+        print(
+            f"imports: {(imported - started) * 1000:.0f} ms, "
+            f"window: {(built - imported) * 1000:.0f} ms, "
+            f"total: {total * 1000:.0f} ms "
+            f"({'within' if total <= STARTUP_BUDGET else 'over'} the "
+            f"{STARTUP_BUDGET * 1000:.0f} ms budget)",
+            file=sys.stderr,
+        )
     app.mainloop()
 
 
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        module_name, description = COMMANDS[argv[0]]
+        module = import_module(module_name)
+        parser = ArgumentParser(
+            prog=f"sorting_vis {argv[0]}", description=description
+        )
+        module.add_arguments(parser)
+        args = parser.parse_args(argv[1:])
+        # Checks that involve several options, reported like argparse's own
+        if hasattr(module, "check_arguments"):
+            module.check_arguments(parser, args)
+        sys.exit(module.run(args))
+
+    parser = ArgumentParser(
+        prog="sorting_vis",
+        description="Run without a command to open the visualiser.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report how long the gui takes to import and build",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    for name, (_, description) in COMMANDS.items():
+        subparsers.add_parser(name, help=description)
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        parser.error(f"options must follow the {args.command} command")
+    start(args.profile_startup)
+
+
 if __name__ == "__main__":  # this is needed for some reason
-    start()
+    main()
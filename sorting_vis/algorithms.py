@@ -1,171 +1,233 @@
-from random import shuffle
-from tkinter import messagebox
-from typing import List
+from bisect import bisect_right
+from random import Random, shuffle
+from typing import Iterable, Iterator, List
+
+from sorting_vis.operations import (
+    COMPARE,
+    MARK,
+    STAGE,
+    SWAP,
+    WRITE,
+    Operation,
+)
+
+# Workers simulated by the parallel algorithms, each drawn in its own colour
+SIMULATED_WORKERS = 4
+
+
+def _insertion_sort(
+    arr: List[int], begin: int, end: int
+) -> Iterator[Operation]:
+    for i in range(begin + 1, end):
+        j = i
+        while j > begin:
+            yield Operation(COMPARE, j - 1, j)
+            if arr[j - 1] <= arr[j]:
+                break
+            arr[j], arr[j - 1] = arr[j - 1], arr[j]
+            yield Operation(SWAP, j, j - 1)
+            j -= 1
+
+
+def _median_of_three(
+    arr: List[int], a: int, b: int, c: int
+) -> Iterator[Operation]:
+    yield Operation(COMPARE, a, b)
+    if arr[a] > arr[b]:
+        a, b = b, a
+    yield Operation(COMPARE, b, c)
+    if arr[b] <= arr[c]:
+        return b
+    yield Operation(COMPARE, a, c)
+    return c if arr[a] <= arr[c] else a
+
+
+def _sift_down(
+    arr: List[int], begin: int, end: int, root: int
+) -> Iterator[Operation]:
+    # Restores the max-heap in arr[begin:end] below ``root``. Indices are
+    # absolute, so the children of node i are at 2 * i - begin + 1 and + 2.
+    while True:
+        largest = root
+        left = 2 * root - begin + 1
+        right = left + 1
+
+        if left < end:
+            yield Operation(COMPARE, root, left)
+            if arr[root] < arr[left]:
+                largest = left
 
+        if right < end:
+            yield Operation(COMPARE, largest, right)
+            if arr[largest] < arr[right]:
+                largest = right
 
-class Algorithms:
-    def __init__(self, master: object) -> None:
-        self.master = master
-        self.paused = False
-        self.paused_arr = []
-        self.arr_length = self.master.arr_length
-
-    def _on_finish(self, arr):
-        flag = True
-        if self.render_checking_complete:
-            self.master.b_toggle_sort.configure(state="disabled")
-            if not self.master._render_checking_complete(arr):
-                flag = False
+        if largest == root:
+            return
+        arr[root], arr[largest] = arr[largest], arr[root]
+        yield Operation(SWAP, root, largest)
+        root = largest
+
+
+def _heap_sort(arr: List[int], begin: int, end: int) -> Iterator[Operation]:
+    for root in range(begin + (end - begin) // 2 - 1, begin - 1, -1):
+        yield from _sift_down(arr, begin, end, root)
+
+    for last in range(end - 1, begin, -1):
+        arr[begin], arr[last] = arr[last], arr[begin]
+        yield Operation(SWAP, begin, last)
+        yield from _sift_down(arr, begin, last, begin)
+
+
+def _interleave(
+    generators: Iterable[Iterator[Operation]],
+) -> Iterator[Operation]:
+    # One step of each generator in turn, until all of them are exhausted
+    generators = list(generators)
+    while generators:
+        for generator in generators[:]:
+            op = next(generator, None)
+            if op is None:
+                generators.remove(generator)
+            else:
+                yield op
+
+
+def _claim(bounds: List[int], w: int) -> Iterator[Operation]:
+    # Tags the chunk of worker ``w`` with its colour
+    for i in range(bounds[w], bounds[w + 1]):
+        yield Operation(MARK, i, w + 1)
+
+
+def _merge_sort_recursive(
+    arr: List[int], left_index: int, right_index: int
+) -> Iterator[Operation]:
+    if left_index >= right_index:
+        return
+
+    mid = (left_index + right_index) // 2
+    yield from _merge_sort_recursive(arr, left_index, mid)
+    yield from _merge_sort_recursive(arr, mid + 1, right_index)
+    yield from _merge(arr, left_index, mid, right_index)
+
+
+def _merge(
+    arr: List[int], left_index: int, mid: int, right_index: int
+) -> Iterator[Operation]:
+    left_copy = arr[left_index : mid + 1]
+    right_copy = arr[mid + 1 : right_index + 1]
+
+    left_copy_index = right_copy_index = 0
+    sorted_index = left_index
+
+    while left_copy_index < len(left_copy) and right_copy_index < len(
+        right_copy
+    ):
+        yield Operation(
+            COMPARE,
+            left_index + left_copy_index,
+            mid + 1 + right_copy_index,
+        )
+        if left_copy[left_copy_index] <= right_copy[right_copy_index]:
+            value = left_copy[left_copy_index]
+            left_copy_index += 1
         else:
-            self.master._render_arr(arr, complete=True)
-        if flag:
-            messagebox.showinfo(
-                "Info",
-                f"{self.master.algorithm} took {self.master.sorting_time}{'s' if self.master.parsed_algorithm != 'bogo_sort' else ''}",
-            )
+            value = right_copy[right_copy_index]
+            right_copy_index += 1
+        arr[sorted_index] = value
+        yield Operation(WRITE, sorted_index, value)
+        sorted_index += 1
+
+    while left_copy_index < len(left_copy):
+        value = left_copy[left_copy_index]
+        arr[sorted_index] = value
+        yield Operation(WRITE, sorted_index, value)
+        left_copy_index += 1
+        sorted_index += 1
+
+    while right_copy_index < len(right_copy):
+        value = right_copy[right_copy_index]
+        arr[sorted_index] = value
+        yield Operation(WRITE, sorted_index, value)
+        right_copy_index += 1
+        sorted_index += 1
 
-    def bubble_sort(self, arr: List[int]) -> None:
-        for i in range(self.arr_length):
-            for j in range(self.arr_length - i - 1):
+
+class Algorithms:
+    """Sorting algorithms written as generators.
+
+    Each algorithm sorts ``arr`` in place and yields an ``Operation`` after
+    every comparison and every change it makes, so a caller can stop pulling
+    operations at any point and resume from the exact same position later.
+    """
+
+    @staticmethod
+    def bubble_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        for i in range(length):
+            for j in range(length - i - 1):
+                yield Operation(COMPARE, j, j + 1)
                 if arr[j] > arr[j + 1]:
                     arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
-                    self.master._render_arr(arr, [j, j + 1])
-
-        self._on_finish(arr)
+                    yield Operation(SWAP, j, j + 1)
 
-    def selection_sort(self, arr: List[int]) -> None:
-        for i in range(self.arr_length):
+    @staticmethod
+    def selection_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        for i in range(length):
             min_index = i
-            for j in range(i, self.arr_length):
+            for j in range(i, length):
+                yield Operation(COMPARE, j, min_index)
                 if arr[j] < arr[min_index]:
                     min_index = j
             if min_index != i:
                 arr[i], arr[min_index] = arr[min_index], arr[i]
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [i, min_index])
-
-        self._on_finish(arr)
-
-    def insertion_sort(self, arr: List[int]) -> None:
-        for i in range(1, self.arr_length):
-            j = i
-            while j > 0 and arr[j - 1] > arr[j]:
-                arr[j], arr[j - 1] = arr[j - 1], arr[j]
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [j, j - 1])
-                j -= 1
-
-        self._on_finish(arr)
-
-    def merge_sort(self, arr: List[int]) -> None:
-        def merge_sort_recursive(arr, left_index, right_index):
-            if left_index >= right_index:
-                return None
-
-            mid = (left_index + right_index) // 2
-            if merge_sort_recursive(arr, left_index, mid) == "pause":
-                return "pause"
-            if merge_sort_recursive(arr, mid + 1, right_index) == "pause":
-                return "pause"
-            if merge(arr, left_index, mid, right_index) == "pause":
-                return "pause"
-            return None
-
-        def merge(arr, left_index, mid, right_index):
-            left_copy = arr[left_index : mid + 1]
-            right_copy = arr[mid + 1 : right_index + 1]
-
-            left_copy_index = right_copy_index = 0
-            sorted_index = left_index
-
-            while left_copy_index < len(left_copy) and right_copy_index < len(
-                right_copy
-            ):
-                if left_copy[left_copy_index] <= right_copy[right_copy_index]:
-                    arr[sorted_index] = left_copy[left_copy_index]
-                    left_copy_index += 1
-                else:
-                    arr[sorted_index] = right_copy[right_copy_index]
-                    right_copy_index += 1
-                sorted_index += 1
-
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [sorted_index])
-
-            while left_copy_index < len(left_copy):
-                arr[sorted_index] = left_copy[left_copy_index]
-                left_copy_index += 1
-                sorted_index += 1
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [sorted_index])
-
-            while right_copy_index < len(right_copy):
-                arr[sorted_index] = right_copy[right_copy_index]
-                right_copy_index += 1
-                sorted_index += 1
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [sorted_index])
-            return None
-
-        if merge_sort_recursive(arr, 0, self.arr_length - 1) != "pause":
-            self._on_finish(arr)
-        else:
-            return "pause"
+                yield Operation(SWAP, i, min_index)
 
-    def shell_sort(self, arr: List[int]) -> None:
-        gap = self.arr_length // 2
+    @staticmethod
+    def insertion_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        yield from _insertion_sort(arr, 0, length)
+
+    @staticmethod
+    def merge_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        yield from _merge_sort_recursive(arr, 0, length - 1)
+
+    @staticmethod
+    def shell_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        gap = length // 2
 
         while gap > 0:
-            for i in range(gap, self.arr_length):
+            for i in range(gap, length):
                 temp = arr[i]
                 j = i
-                while j >= gap and arr[j - gap] > temp:
-                    arr[j] = arr[j - gap]
+                while j >= gap:
+                    yield Operation(COMPARE, j - gap, j)
+                    if arr[j - gap] <= temp:
+                        break
+                    value = arr[j - gap]
+                    arr[j] = value
+                    yield Operation(WRITE, j, value)
                     j -= gap
 
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
-                    self.master._render_arr(arr, [j, j - gap])
-
                 arr[j] = temp
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [j, i])
+                yield Operation(WRITE, j, temp)
 
             gap //= 2
 
-        self._on_finish(arr)
-
-    def cocktail_shaker_sort(self, arr: List[int]) -> None:
+    @staticmethod
+    def cocktail_shaker_sort(
+        arr: List[int], length: int
+    ) -> Iterator[Operation]:
         start = 0
-        end = self.arr_length - 1
+        end = length - 1
 
         while start <= end:
             swapped = False
 
             for i in range(start, end):
+                yield Operation(COMPARE, i, i + 1)
                 if arr[i] > arr[i + 1]:
                     arr[i], arr[i + 1] = arr[i + 1], arr[i]
+                    yield Operation(SWAP, i, i + 1)
                     swapped = True
-                self.master._render_arr(arr, [i, i + 1])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
 
             if not swapped:
                 break
@@ -175,85 +237,78 @@ class Algorithms:
             swapped = False
 
             for i in range(end, start, -1):
+                yield Operation(COMPARE, i - 1, i)
                 if arr[i - 1] > arr[i]:
                     arr[i], arr[i - 1] = arr[i - 1], arr[i]
+                    yield Operation(SWAP, i - 1, i)
                     swapped = True
-                self.master._render_arr(arr, [i - 1, i])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
 
             start += 1
 
-        self._on_finish(arr)
+    @staticmethod
+    def quick_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        def choose_pivot(arr, low, high):
+            mid = (low + high) // 2
+            if high - low < 40:
+                return (yield from _median_of_three(arr, low, mid, high))
+
+            # Tukey's ninther: the median of three medians of three
+            step = (high - low) // 8
+            a = yield from _median_of_three(
+                arr, low, low + step, low + 2 * step
+            )
+            b = yield from _median_of_three(arr, mid - step, mid, mid + step)
+            c = yield from _median_of_three(
+                arr, high - 2 * step, high - step, high
+            )
+            return (yield from _median_of_three(arr, a, b, c))
 
-    def quick_sort(self, arr: List[int]) -> None:
         def partition(arr, low, high):
-            pivot = arr[high]
-            i = low - 1
-            for j in range(low, high):
-                if arr[j] <= pivot:
+            # Leaves arr[low:lt] < pivot, arr[lt:gt + 1] == pivot and
+            # arr[gt + 1:high + 1] > pivot.
+            p = yield from choose_pivot(arr, low, high)
+            if p != low:
+                arr[low], arr[p] = arr[p], arr[low]
+                yield Operation(SWAP, low, p)
+            pivot = arr[low]
+            yield Operation(MARK, low)
+
+            lt, i, gt = low, low + 1, high
+            while i <= gt:
+                yield Operation(COMPARE, i, lt)
+                if arr[i] < pivot:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    yield Operation(SWAP, lt, i)
+                    lt += 1
                     i += 1
-                    arr[i], arr[j] = arr[j], arr[i]
-                    self.master._render_arr(arr, [i, j])
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
-            arr[i + 1], arr[high] = arr[high], arr[i + 1]
-            self.master._render_arr(arr, [i + 1, high])
-            return i + 1
-
-        def quick_sort_recursive(arr, low, high):
-            if low < high:
-                pi = partition(arr, low, high)
-                if pi == "pause":
-                    return "pause"
-                if quick_sort_recursive(arr, low, pi - 1) == "pause":
-                    return "pause"
-                if quick_sort_recursive(arr, pi + 1, high) == "pause":
-                    return "pause"
-
-        if quick_sort_recursive(arr, 0, len(arr) - 1) is None:
-            self._on_finish(arr)
-        else:
-            return "pause"
-
-    def heap_sort(self, arr: List[int]) -> None:
-        def heapify(arr, n, i):
-            largest = i
-            left = 2 * i + 1
-            right = 2 * i + 2
-
-            if left < n and arr[i] < arr[left]:
-                largest = left
-
-            if right < n and arr[largest] < arr[right]:
-                largest = right
-
-            if largest != i:
-                arr[i], arr[largest] = arr[largest], arr[i]
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [i, largest])
-
-                heapify(arr, n, largest)
-
-        for i in range(self.arr_length // 2 - 1, -1, -1):
-            heapify(arr, self.arr_length, i)
-
-        for i in range(self.arr_length - 1, 0, -1):
-            arr[i], arr[0] = arr[0], arr[i]
-            if self.paused:
-                self.paused_arr = arr.copy()
-                return "pause"
-            self.master._render_arr(arr, [i, 0])
-
-            heapify(arr, i, 0)
+                elif arr[i] > pivot:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    yield Operation(SWAP, i, gt)
+                    gt -= 1
+                else:
+                    i += 1
+            return lt, gt
+
+        # The larger side is deferred to the stack and the smaller one is
+        # sorted next, so the stack never holds more than log2(n) ranges.
+        stack = [(0, length - 1)]
+        while stack:
+            low, high = stack.pop()
+            while low < high:
+                lt, gt = yield from partition(arr, low, high)
+                if lt - low < high - gt:
+                    stack.append((gt + 1, high))
+                    high = lt - 1
+                else:
+                    stack.append((low, lt - 1))
+                    low = gt + 1
 
-        self._on_finish(arr)
+    @staticmethod
+    def heap_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        yield from _heap_sort(arr, 0, length)
 
-    def radix_sort(self, arr: List[int]) -> None:
+    @staticmethod
+    def radix_sort(arr: List[int], length: int) -> Iterator[Operation]:
         def counting_sort(arr, exp, n):
             output = [0] * n
             count = [0] * 10
@@ -270,111 +325,155 @@ class Algorithms:
                 index = arr[i] // exp
                 output[count[index % 10] - 1] = arr[i]
                 count[index % 10] -= 1
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(output, [count[index % 10]])
+                yield Operation(MARK, i)
 
                 i -= 1
 
             for i in range(n):
                 arr[i] = output[i]
+                yield Operation(WRITE, i, output[i])
+
+        if not length:
+            return
 
         max_value = max(arr)
         exp = 1
 
         while max_value // exp > 0:
-            if counting_sort(arr, exp, self.arr_length) is None:
-                exp *= 10
-            else:
-                return "pause"
+            yield from counting_sort(arr, exp, length)
+            exp *= 10
 
-        self._on_finish(arr)
-
-    def gnome_sort(self, arr: List[int]) -> None:
+    @staticmethod
+    def gnome_sort(arr: List[int], length: int) -> Iterator[Operation]:
         index = 0
 
-        while index < self.arr_length:
+        while index < length:
             if index == 0:
                 index += 1
+                continue
+            yield Operation(COMPARE, index, index - 1)
             if arr[index] >= arr[index - 1]:
                 index += 1
             else:
                 arr[index], arr[index - 1] = arr[index - 1], arr[index]
+                yield Operation(SWAP, index, index - 1)
                 index -= 1
 
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-                self.master._render_arr(arr, [index, index + 1])
-
-        self._on_finish(arr)
-
-    def odd_even_sort(self, arr: List[int]) -> None:
+    @staticmethod
+    def odd_even_sort(arr: List[int], length: int) -> Iterator[Operation]:
         is_sorted = False
 
         while not is_sorted:
             is_sorted = True
 
-            for i in range(1, self.arr_length - 1, 2):
+            for i in range(1, length - 1, 2):
+                yield Operation(COMPARE, i, i + 1)
                 if arr[i] > arr[i + 1]:
                     arr[i], arr[i + 1] = arr[i + 1], arr[i]
+                    yield Operation(SWAP, i, i + 1)
                     is_sorted = False
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
-                    self.master._render_arr(arr, [i, i + 1])
 
-            for i in range(0, self.arr_length - 1, 2):
+            for i in range(0, length - 1, 2):
+                yield Operation(COMPARE, i, i + 1)
                 if arr[i] > arr[i + 1]:
                     arr[i], arr[i + 1] = arr[i + 1], arr[i]
+                    yield Operation(SWAP, i, i + 1)
                     is_sorted = False
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
-                    self.master._render_arr(arr, [i, i + 1])
-
-        self._on_finish(arr)
 
-    def double_selection_sort(self, arr: List[int]) -> None:
-        for i in range(self.arr_length // 2):
+    @staticmethod
+    def bitonic_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        # The network for the next power of two sorts any length, as long as
+        # the comparators that reach past the end are skipped: every one of
+        # them moves the smaller value to the lower index, so the missing
+        # positions behave like +infinity.
+        size = 1 << max(0, length - 1).bit_length()
+        block = 2
+        while block <= size:
+            # Each element of a block's first half against its mirror in
+            # the second half, then half-cleaners of shrinking distance
+            yield Operation(STAGE, 0)
+            for i in range(length):
+                j = i ^ (block - 1)
+                if i < j < length:
+                    yield Operation(COMPARE, i, j)
+                    if arr[i] > arr[j]:
+                        arr[i], arr[j] = arr[j], arr[i]
+                        yield Operation(SWAP, i, j)
+
+            distance = block // 4
+            while distance:
+                yield Operation(STAGE, 0)
+                for i in range(length):
+                    j = i ^ distance
+                    if i < j < length:
+                        yield Operation(COMPARE, i, j)
+                        if arr[i] > arr[j]:
+                            arr[i], arr[j] = arr[j], arr[i]
+                            yield Operation(SWAP, i, j)
+                distance //= 2
+            block *= 2
+
+    @staticmethod
+    def odd_even_merge_sort(
+        arr: List[int], length: int
+    ) -> Iterator[Operation]:
+        # Batcher's network for the next power of two, skipping the
+        # comparators that reach past the end like in bitonic_sort
+        size = 1 << max(0, length - 1).bit_length()
+        p = 1
+        while p < size:
+            k = p
+            while k:
+                yield Operation(STAGE, 0)
+                for j in range(k % p, length - k, 2 * k):
+                    for i in range(j, min(j + k, length - k)):
+                        if i // (2 * p) == (i + k) // (2 * p):
+                            yield Operation(COMPARE, i, i + k)
+                            if arr[i] > arr[i + k]:
+                                arr[i], arr[i + k] = arr[i + k], arr[i]
+                                yield Operation(SWAP, i, i + k)
+                k //= 2
+            p *= 2
+
+    @staticmethod
+    def double_selection_sort(
+        arr: List[int], length: int
+    ) -> Iterator[Operation]:
+        for i in range(length // 2):
             min_index = i
             max_index = i
-            for j in range(i + 1, self.arr_length - i):
+            for j in range(i + 1, length - i):
+                yield Operation(COMPARE, j, min_index)
                 if arr[j] < arr[min_index]:
                     min_index = j
+                yield Operation(COMPARE, j, max_index)
                 if arr[j] > arr[max_index]:
                     max_index = j
 
             if min_index != i:
                 arr[i], arr[min_index] = arr[min_index], arr[i]
-                self.master._render_arr(arr, [i, min_index])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
+                yield Operation(SWAP, i, min_index)
 
             if max_index == i:
                 max_index = min_index
 
-            if max_index != self.arr_length - i - 1:
-                arr[self.arr_length - i - 1], arr[max_index] = (
+            if max_index != length - i - 1:
+                arr[length - i - 1], arr[max_index] = (
                     arr[max_index],
-                    arr[self.arr_length - i - 1],
+                    arr[length - i - 1],
                 )
-                self.master._render_arr(
-                    arr, [self.arr_length - i - 1, max_index]
-                )
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-
-        self._on_finish(arr)
+                yield Operation(SWAP, length - i - 1, max_index)
 
-    def cycle_sort(self, arr: List[int]) -> None:
-        for cycle_start in range(self.arr_length - 1):
+    @staticmethod
+    def cycle_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        for cycle_start in range(length - 1):
+            # The item being placed is held outside the array once the cycle
+            # starts writing, so each element is compared with it alone
             item = arr[cycle_start]
+            yield Operation(MARK, cycle_start)
             pos = cycle_start
-            for i in range(cycle_start + 1, self.arr_length):
+            for i in range(cycle_start + 1, length):
+                yield Operation(COMPARE, i, i)
                 if arr[i] < item:
                     pos += 1
 
@@ -384,30 +483,29 @@ class Algorithms:
             while item == arr[pos]:
                 pos += 1
 
-            arr[pos], item = item, arr[pos]
-            self.master._render_arr(arr, [pos])
-            if self.paused:
-                self.paused_arr = arr.copy()
-                return "pause"
+            value, item = item, arr[pos]
+            arr[pos] = value
+            yield Operation(WRITE, pos, value)
 
             while pos != cycle_start:
                 pos = cycle_start
-                for i in range(cycle_start + 1, self.arr_length):
+                for i in range(cycle_start + 1, length):
+                    yield Operation(COMPARE, i, i)
                     if arr[i] < item:
                         pos += 1
 
                 while item == arr[pos]:
                     pos += 1
 
-                arr[pos], item = item, arr[pos]
-                self.master._render_arr(arr, [pos])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
+                value, item = item, arr[pos]
+                arr[pos] = value
+                yield Operation(WRITE, pos, value)
 
-        self._on_finish(arr)
+    @staticmethod
+    def pigeonhole_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        if not length:
+            return
 
-    def pigeonhole_sort(self, arr: List[int]) -> None:
         min_value = min(arr)
         max_value = max(arr)
         size = max_value - min_value + 1
@@ -419,18 +517,15 @@ class Algorithms:
         index = 0
         for i in range(size):
             while holes[i] > 0:
-                arr[index] = i + min_value
+                value = i + min_value
+                arr[index] = value
+                yield Operation(WRITE, index, value)
                 index += 1
                 holes[i] -= 1
-                self.master._render_arr(arr, [i, index])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-
-        self._on_finish(arr)
 
-    def comb_sort(self, arr: List[int]) -> None:
-        gap = self.arr_length
+    @staticmethod
+    def comb_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        gap = length
         shrink_factor = 1.3
         swapped = True
 
@@ -441,45 +536,602 @@ class Algorithms:
 
             swapped = False
 
-            for i in range(len(arr) - gap):
+            for i in range(length - gap):
+                yield Operation(COMPARE, i, i + gap)
                 if arr[i] > arr[i + gap]:
                     arr[i], arr[i + gap] = arr[i + gap], arr[i]
+                    yield Operation(SWAP, i, i + gap)
                     swapped = True
-                    self.master._render_arr(arr, [i, i + gap])
-                    if self.paused:
-                        self.paused_arr = arr.copy()
-                        return "pause"
 
-        self._on_finish(arr)
-
-    def pancake_sort(self, arr: List[int]) -> None:
-        def flip(arr: List[int], k: int) -> None:
+    @staticmethod
+    def pancake_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        def flip(arr: List[int], k: int) -> Iterator[Operation]:
             left = 0
             while left < k:
                 arr[left], arr[k] = arr[k], arr[left]
+                yield Operation(SWAP, left, k)
                 left += 1
                 k -= 1
 
-        for size in range(self.arr_length, 1, -1):
+        for size in range(length, 1, -1):
             max_index = arr.index(max(arr[:size]))
             if max_index != size - 1:
-                flip(arr, max_index)
-                flip(arr, size - 1)
-                self.master._render_arr(arr, [max_index, size - 1])
-                if self.paused:
-                    self.paused_arr = arr.copy()
-                    return "pause"
-
-        self._on_finish(arr)
-
-    def bogo_sort(self, arr: List[int]) -> None:
-        while not all(
-            arr[i] <= arr[i + 1] for i in range(self.arr_length - 1)
-        ):
+                yield from flip(arr, max_index)
+                yield from flip(arr, size - 1)
+
+    @staticmethod
+    def bogo_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        while not all(arr[i] <= arr[i + 1] for i in range(length - 1)):
             shuffle(arr)
-            if self.paused:
-                self.paused_arr = arr.copy()
-                return "pause"
-            self.master._render_arr(arr)
+            for i in range(length):
+                yield Operation(WRITE, i, arr[i])
+
+    @staticmethod
+    def intro_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        def partition(arr, low, high):
+            median = yield from _median_of_three(
+                arr, low, (low + high) // 2, high
+            )
+            if median != high:
+                arr[median], arr[high] = arr[high], arr[median]
+                yield Operation(SWAP, median, high)
+
+            pivot = arr[high]
+            yield Operation(MARK, high)
+            i = low - 1
+            for j in range(low, high):
+                yield Operation(COMPARE, j, high)
+                if arr[j] <= pivot:
+                    i += 1
+                    arr[i], arr[j] = arr[j], arr[i]
+                    yield Operation(SWAP, i, j)
+            arr[i + 1], arr[high] = arr[high], arr[i + 1]
+            yield Operation(SWAP, i + 1, high)
+            return i + 1
+
+        def intro_sort_recursive(arr, low, high, depth):
+            # Recurse into the smaller side and loop on the larger one, so
+            # the stack stays O(log n) deep.
+            while high - low > 16:
+                if depth == 0:
+                    yield from _heap_sort(arr, low, high + 1)
+                    return
+                depth -= 1
+
+                pi = yield from partition(arr, low, high)
+                if pi - low < high - pi:
+                    yield from intro_sort_recursive(arr, low, pi - 1, depth)
+                    low = pi + 1
+                else:
+                    yield from intro_sort_recursive(arr, pi + 1, high, depth)
+                    high = pi - 1
+
+            yield from _insertion_sort(arr, low, high + 1)
+
+        yield from intro_sort_recursive(
+            arr, 0, length - 1, 2 * length.bit_length()
+        )
+
+    @staticmethod
+    def tim_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        min_gallop = 7
+
+        def min_run_length(n):
+            r = 0
+            while n >= 64:
+                r |= n & 1
+                n >>= 1
+            return n + r
+
+        def count_run(arr, low):
+            # Return the end of the run starting at low, reversing it if it
+            # is strictly descending.
+            high = low + 1
+            if high == length:
+                return high
+
+            yield Operation(COMPARE, low, high)
+            if arr[high] < arr[low]:
+                high += 1
+                while high < length:
+                    yield Operation(COMPARE, high - 1, high)
+                    if arr[high] >= arr[high - 1]:
+                        break
+                    high += 1
+
+                i, j = low, high - 1
+                while i < j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    yield Operation(SWAP, i, j)
+                    i += 1
+                    j -= 1
+            else:
+                high += 1
+                while high < length:
+                    yield Operation(COMPARE, high - 1, high)
+                    if arr[high] < arr[high - 1]:
+                        break
+                    high += 1
+            return high
+
+        def binary_insertion_sort(arr, low, high, start):
+            # arr[low:start] is already sorted
+            for i in range(start, high):
+                pivot = arr[i]
+                left, right = low, i
+                while left < right:
+                    mid = (left + right) // 2
+                    yield Operation(COMPARE, i, mid)
+                    if pivot < arr[mid]:
+                        right = mid
+                    else:
+                        left = mid + 1
+
+                for j in range(i, left, -1):
+                    value = arr[j - 1]
+                    arr[j] = value
+                    yield Operation(WRITE, j, value)
+                if left != i:
+                    arr[left] = pivot
+                    yield Operation(WRITE, left, pivot)
+
+        def gallop(key, key_index, run, start, n, offset, right):
+            # Count the elements of run[start:start + n] that belong before
+            # key (with right, equal elements do too) by probing at
+            # exponentially growing distances, then binary searching.
+            # Elements of run are reported at index offset + position.
+            low, high, probe = 0, n, 0
+            while probe < n:
+                yield Operation(COMPARE, key_index, offset + start + probe)
+                value = run[start + probe]
+                if value < key or right and value == key:
+                    low = probe + 1
+                    probe = probe * 2 + 1
+                else:
+                    high = probe
+                    break
+
+            while low < high:
+                mid = (low + high) // 2
+                yield Operation(COMPARE, key_index, offset + start + mid)
+                value = run[start + mid]
+                if value < key or right and value == key:
+                    low = mid + 1
+                else:
+                    high = mid
+            return low
+
+        def merge_lo(arr, base1, len1, base2, len2):
+            nonlocal min_gallop
+
+            temp = arr[base1 : base1 + len1]
+            i, j, dest = 0, base2, base1
+            end2 = base2 + len2
+
+            while i < len1 and j < end2:
+                # Merge one element at a time until one run keeps winning
+                count1 = count2 = 0
+                while (
+                    i < len1 and j < end2 and max(count1, count2) < min_gallop
+                ):
+                    yield Operation(COMPARE, j, base1 + i)
+                    value = arr[j]
+                    if value < temp[i]:
+                        j += 1
+                        count2 += 1
+                        count1 = 0
+                    else:
+                        value = temp[i]
+                        i += 1
+                        count1 += 1
+                        count2 = 0
+                    arr[dest] = value
+                    yield Operation(WRITE, dest, value)
+                    dest += 1
+
+                # then move whole blocks while galloping keeps paying off
+                while i < len1 and j < end2:
+                    count2 = yield from gallop(
+                        temp[i], base1 + i, arr, j, end2 - j, 0, False
+                    )
+                    for _ in range(count2):
+                        value = arr[j]
+                        arr[dest] = value
+                        yield Operation(WRITE, dest, value)
+                        dest += 1
+                        j += 1
+                    if j == end2:
+                        break
+
+                    count1 = yield from gallop(
+                        arr[j], j, temp, i, len1 - i, base1, True
+                    )
+                    for _ in range(count1):
+                        value = temp[i]
+                        arr[dest] = value
+                        yield Operation(WRITE, dest, value)
+                        dest += 1
+                        i += 1
+
+                    if count1 < 7 and count2 < 7:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+
+            while i < len1:
+                value = temp[i]
+                arr[dest] = value
+                yield Operation(WRITE, dest, value)
+                dest += 1
+                i += 1
+
+        def merge_at(arr, runs, n):
+            base1, len1 = runs[n]
+            base2, len2 = runs[n + 1]
+            runs[n] = (base1, len1 + len2)
+            del runs[n + 1]
+
+            # Elements already in their final place at either end are
+            # skipped before merging.
+            skipped = yield from gallop(
+                arr[base2], base2, arr, base1, len1, 0, True
+            )
+            base1 += skipped
+            len1 -= skipped
+            if len1 == 0:
+                return
+            len2 = yield from gallop(
+                arr[base1 + len1 - 1],
+                base1 + len1 - 1,
+                arr,
+                base2,
+                len2,
+                0,
+                False,
+            )
+            if len2 == 0:
+                return
+            yield from merge_lo(arr, base1, len1, base2, len2)
+
+        def merge_collapse(arr, runs):
+            # Keep the run lengths growing at least like the Fibonacci
+            # numbers, so merges stay balanced.
+            while len(runs) > 1:
+                n = len(runs) - 2
+                if (
+                    n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]
+                ) or (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                    if runs[n - 1][1] < runs[n + 1][1]:
+                        n -= 1
+                elif runs[n][1] > runs[n + 1][1]:
+                    break
+                yield from merge_at(arr, runs, n)
+
+        min_run = min_run_length(length)
+        runs = []
+        low = 0
+        while low < length:
+            high = yield from count_run(arr, low)
+            if high - low < min_run:
+                forced = min(low + min_run, length)
+                yield from binary_insertion_sort(arr, low, forced, high)
+                high = forced
+            runs.append((low, high - low))
+            yield from merge_collapse(arr, runs)
+            low = high
+
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            yield from merge_at(arr, runs, n)
+
+    @staticmethod
+    def pdq_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        def partial_insertion_sort(arr, begin, end):
+            # Give up once more than 8 elements have been moved, returning
+            # whether the range ended up sorted.
+            moves = 0
+            for i in range(begin + 1, end):
+                j = i
+                while j > begin:
+                    yield Operation(COMPARE, j - 1, j)
+                    if arr[j - 1] <= arr[j]:
+                        break
+                    arr[j], arr[j - 1] = arr[j - 1], arr[j]
+                    yield Operation(SWAP, j, j - 1)
+                    j -= 1
+                moves += i - j
+                if moves > 8:
+                    return False
+            return True
+
+        def sort2(arr, a, b):
+            yield Operation(COMPARE, a, b)
+            if arr[b] < arr[a]:
+                arr[a], arr[b] = arr[b], arr[a]
+                yield Operation(SWAP, a, b)
+
+        def sort3(arr, a, b, c):
+            yield from sort2(arr, a, b)
+            yield from sort2(arr, b, c)
+            yield from sort2(arr, a, b)
+
+        def partition_right(arr, begin, end):
+            # Partition around the pivot at begin, putting elements equal to
+            # it on the right. Also returns whether the range was already
+            # partitioned.
+            pivot = arr[begin]
+            yield Operation(MARK, begin)
+
+            # The median-of-three leaves an element >= pivot at end - 1,
+            # which stops this scan.
+            first = begin + 1
+            while True:
+                yield Operation(COMPARE, first, begin)
+                if not arr[first] < pivot:
+                    break
+                first += 1
+
+            last = end - 1
+            if first - 1 == begin:
+                while first < last:
+                    yield Operation(COMPARE, last, begin)
+                    if arr[last] < pivot:
+                        break
+                    last -= 1
+            else:
+                while True:
+                    yield Operation(COMPARE, last, begin)
+                    if arr[last] < pivot:
+                        break
+                    last -= 1
+
+            already_partitioned = first >= last
+            while first < last:
+                arr[first], arr[last] = arr[last], arr[first]
+                yield Operation(SWAP, first, last)
+                while True:
+                    first += 1
+                    yield Operation(COMPARE, first, begin)
+                    if not arr[first] < pivot:
+                        break
+                while True:
+                    last -= 1
+                    yield Operation(COMPARE, last, begin)
+                    if arr[last] < pivot:
+                        break
+
+            pivot_index = first - 1
+            if pivot_index != begin:
+                arr[begin], arr[pivot_index] = arr[pivot_index], arr[begin]
+                yield Operation(SWAP, begin, pivot_index)
+            return pivot_index, already_partitioned
+
+        def partition_left(arr, begin, end):
+            # Used when the pivot equals the previous pivot: everything equal
+            # to it goes left and is then already in place.
+            pivot = arr[begin]
+            yield Operation(MARK, begin)
+
+            last = end - 1
+            while True:
+                yield Operation(COMPARE, begin, last)
+                if not pivot < arr[last]:
+                    break
+                last -= 1
+
+            first = begin + 1
+            if last + 1 == end:
+                while first < last:
+                    yield Operation(COMPARE, begin, first)
+                    if pivot < arr[first]:
+                        break
+                    first += 1
+            else:
+                while True:
+                    yield Operation(COMPARE, begin, first)
+                    if pivot < arr[first]:
+                        break
+                    first += 1
+
+            while first < last:
+                arr[first], arr[last] = arr[last], arr[first]
+                yield Operation(SWAP, first, last)
+                while True:
+                    last -= 1
+                    yield Operation(COMPARE, begin, last)
+                    if not pivot < arr[last]:
+                        break
+                while True:
+                    first += 1
+                    yield Operation(COMPARE, begin, first)
+                    if pivot < arr[first]:
+                        break
+
+            if last != begin:
+                arr[begin], arr[last] = arr[last], arr[begin]
+                yield Operation(SWAP, begin, last)
+            return last
+
+        def pdq_loop(arr, begin, end, bad_allowed, leftmost):
+            while True:
+                size = end - begin
+                if size < 24:
+                    yield from _insertion_sort(arr, begin, end)
+                    return
+
+                # Move the median of three (or for large ranges the median
+                # of three medians) to begin as the pivot
+                half = size // 2
+                if size > 128:
+                    yield from sort3(arr, begin, begin + half, end - 1)
+                    yield from sort3(arr, begin + 1, begin + half - 1, end - 2)
+                    yield from sort3(arr, begin + 2, begin + half + 1, end - 3)
+                    yield from sort3(
+                        arr, begin + half - 1, begin + half, begin + half + 1
+                    )
+                    arr[begin], arr[begin + half] = (
+                        arr[begin + half],
+                        arr[begin],
+                    )
+                    yield Operation(SWAP, begin, begin + half)
+                else:
+                    yield from sort3(arr, begin + half, begin, end - 1)
 
-        self._on_finish(arr)
+                if not leftmost:
+                    yield Operation(COMPARE, begin - 1, begin)
+                    if not arr[begin - 1] < arr[begin]:
+                        begin = yield from partition_left(arr, begin, end)
+                        begin += 1
+                        continue
+
+                pivot_index, already_partitioned = yield from partition_right(
+                    arr, begin, end
+                )
+                left_size = pivot_index - begin
+                right_size = end - pivot_index - 1
+
+                if left_size < size // 8 or right_size < size // 8:
+                    # A bad partition: after too many fall back to heap sort,
+                    # otherwise swap a few elements to break up patterns.
+                    bad_allowed -= 1
+                    if bad_allowed == 0:
+                        yield from _heap_sort(arr, begin, end)
+                        return
+
+                    if left_size >= 24:
+                        for a, b in (
+                            (begin, begin + left_size // 4),
+                            (pivot_index - 1, pivot_index - left_size // 4),
+                        ):
+                            arr[a], arr[b] = arr[b], arr[a]
+                            yield Operation(SWAP, a, b)
+                    if right_size >= 24:
+                        for a, b in (
+                            (
+                                pivot_index + 1,
+                                pivot_index + 1 + right_size // 4,
+                            ),
+                            (end - 1, end - right_size // 4),
+                        ):
+                            arr[a], arr[b] = arr[b], arr[a]
+                            yield Operation(SWAP, a, b)
+                elif already_partitioned:
+                    # The range may well be sorted already, which a cheap
+                    # insertion sort can confirm.
+                    left_sorted = yield from partial_insertion_sort(
+                        arr, begin, pivot_index
+                    )
+                    right_sorted = yield from partial_insertion_sort(
+                        arr, pivot_index + 1, end
+                    )
+                    if left_sorted and right_sorted:
+                        return
+
+                yield from pdq_loop(
+                    arr, begin, pivot_index, bad_allowed, leftmost
+                )
+                begin = pivot_index + 1
+                leftmost = False
+
+        yield from pdq_loop(arr, 0, length, length.bit_length(), True)
+
+    @staticmethod
+    def parallel_merge_sort(
+        arr: List[int], length: int
+    ) -> Iterator[Operation]:
+        # The workers' steps are interleaved to show them running at once,
+        # and every index is tagged with the worker that owns it.
+        workers = max(1, min(SIMULATED_WORKERS, length))
+        bounds = [length * w // workers for w in range(workers + 1)]
+
+        yield from _interleave(_claim(bounds, w) for w in range(workers))
+        yield from _interleave(
+            _merge_sort_recursive(arr, bounds[w], bounds[w + 1] - 1)
+            for w in range(workers)
+        )
+
+        # The k-way merge runs on a single process; each written value is
+        # tagged with the worker whose run it came from.
+        runs = [arr[bounds[w] : bounds[w + 1]] for w in range(workers)]
+        heads = [0] * workers
+        for sorted_index in range(length):
+            best = None
+            for w in range(workers):
+                if heads[w] == len(runs[w]):
+                    continue
+                if best is not None:
+                    yield Operation(
+                        COMPARE,
+                        bounds[best] + heads[best],
+                        bounds[w] + heads[w],
+                    )
+                    if runs[w][heads[w]] >= runs[best][heads[best]]:
+                        continue
+                best = w
+
+            value = runs[best][heads[best]]
+            arr[sorted_index] = value
+            heads[best] += 1
+            yield Operation(MARK, sorted_index, best + 1)
+            yield Operation(WRITE, sorted_index, value)
+
+    @staticmethod
+    def sample_sort(arr: List[int], length: int) -> Iterator[Operation]:
+        workers = max(1, min(SIMULATED_WORKERS, length))
+        bounds = [length * w // workers for w in range(workers + 1)]
+
+        def scatter(w, source, buckets, offsets):
+            for i in range(bounds[w], bounds[w + 1]):
+                bucket = buckets[i]
+                sorted_index = offsets[bucket]
+                offsets[bucket] += 1
+                value = source[i]
+                arr[sorted_index] = value
+                yield Operation(MARK, sorted_index, bucket + 1)
+                yield Operation(WRITE, sorted_index, value)
+
+        yield from _interleave(_claim(bounds, w) for w in range(workers))
+
+        # Splitters are drawn from a sorted random sample of the array
+        sample = sorted(
+            Random(length).sample(range(length), min(length, workers * 4))
+        )
+        for i in sample:
+            yield Operation(MARK, i)
+        values = sorted(arr[i] for i in sample)
+        splitters = [
+            values[len(values) * k // workers] for k in range(1, workers)
+        ]
+
+        # Every worker classifies its chunk, then scatters it into the
+        # buckets at offsets worked out from all of the workers' counts.
+        buckets = [bisect_right(splitters, value) for value in arr]
+        counts = [[0] * workers for _ in range(workers)]
+        for w in range(workers):
+            for i in range(bounds[w], bounds[w + 1]):
+                counts[w][buckets[i]] += 1
+        bucket_starts = [0]
+        for b in range(workers):
+            bucket_starts.append(
+                bucket_starts[-1] + sum(chunk[b] for chunk in counts)
+            )
+        offsets = [
+            [
+                bucket_starts[b] + sum(chunk[b] for chunk in counts[:w])
+                for b in range(workers)
+            ]
+            for w in range(workers)
+        ]
+
+        source = arr[:]
+        yield from _interleave(
+            scatter(w, source, buckets, offsets[w]) for w in range(workers)
+        )
+        yield from _interleave(
+            _merge_sort_recursive(
+                arr, bucket_starts[b], bucket_starts[b + 1] - 1
+            )
+            for b in range(workers)
+        )
@@ -0,0 +1,48 @@
+"""The interchangeable implementations of the bare sorting algorithms.
+
+Every backend exposes the same ``(arr, length)`` static methods as
+``BareAlgorithms``; ``convert`` turns a list into the container the backend
+sorts, which must support ``copy()``.
+"""
+
+from typing import Callable, List, NamedTuple, Sequence
+
+from sorting_vis.bare_algorithms import BareAlgorithms
+from sorting_vis.optimised_algorithms import OptimisedAlgorithms
+
+
+class Backend(NamedTuple):
+    name: str
+    algorithms: type
+    convert: Callable[[List[int]], Sequence[int]]
+
+
+BACKEND_NAMES = ["python", "optimised", "numpy"]
+# Backends whose kernels can also run on an ``InstrumentedList``
+PURE_PYTHON_BACKENDS = ["python", "optimised"]
+
+
+def get_backend(name: str) -> Backend:
+    if name == "python":
+        return Backend(name, BareAlgorithms, list)
+    if name == "optimised":
+        return Backend(name, OptimisedAlgorithms, list)
+    if name == "numpy":
+        try:
+            import numpy as np
+
+            from sorting_vis.numpy_algorithms import NumpyAlgorithms
+        except ImportError as e:
+            raise ImportError(
+                "The numpy backend requires numpy: pip install numpy"
+            ) from e
+        return Backend(
+            name, NumpyAlgorithms, lambda arr: np.array(arr, dtype=np.int64)
+        )
+    raise ValueError(f"Unknown backend: {name}")
+
+
+def sorting_functions(backend: Backend) -> List[str]:
+    return [
+        attr for attr in dir(backend.algorithms) if not attr.startswith("_")
+    ]
@@ -0,0 +1,437 @@
+"""Headless benchmarks of the bare sorting algorithms, runnable with
+``python -m sorting_vis bench``
+
+Every (algorithm, size, distribution, repeat) sample is an independent job
+run on a process pool. Input arrays are written once to shared memory and
+read by the workers, and a job that exceeds its timeout is interrupted
+inside its worker so it cannot stall the rest of the run.
+"""
+
+import csv
+import json
+import signal
+import sys
+from _thread import interrupt_main
+from argparse import ArgumentParser, Namespace
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from statistics import median, pstdev
+from threading import Timer
+from time import perf_counter
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.backends import (
+    BACKEND_NAMES,
+    PURE_PYTHON_BACKENDS,
+    Backend,
+    get_backend,
+    sorting_functions,
+)
+from sorting_vis.constants import MAXIMUM_ARRAY_VALUE, MINIMUM_ARRAY_VALUE
+from sorting_vis.counters import COUNT_FIELDS, count_operations
+from sorting_vis.distributions import DISTRIBUTIONS, generate
+from sorting_vis.parallel import (
+    PARALLEL_ALGORITHMS,
+    available_workers,
+    terminate_pool,
+)
+from sorting_vis.settings import add_input_arguments, check_input_arguments
+
+BARE_SORTING_FUNCTIONS = sorting_functions(get_backend("python"))
+DEFAULT_SIZES = [100, 500, 1000]
+RESULT_FIELDS = [
+    "algorithm",
+    "backend",
+    "size",
+    "distribution",
+    "repeats",
+    "min",
+    "median",
+    "stddev",
+    "baseline_median",
+    "slowdown",
+    "speedup",  # over the serial merge sort, for the parallel algorithms
+    "timed_out",
+    *COUNT_FIELDS,
+]
+
+
+class BenchmarkJob(NamedTuple):
+    # "time" for one timed sample, "count" for an instrumented run, and
+    # "reference" for one sample of the serial merge sort that the parallel
+    # algorithms are compared with
+    kind: str
+    algorithm: str
+    backend: str
+    size: int
+    distribution: str
+    shm_name: str
+    warmups: int
+    timeout: Optional[float]
+
+
+class JobTimeout(Exception):
+    pass
+
+
+_job_running = False
+
+
+def _list_sort(arr: List[int], length: int) -> None:
+    arr.sort()
+
+
+def time_algorithm(
+    func: Callable[[Sequence[int], int], None],
+    arr: Sequence[int],
+    warmups: int,
+    repeats: int,
+) -> List[float]:
+    """Time ``func`` on fresh copies of ``arr``, returning one sample per
+    repeat in seconds.
+    """
+    for _ in range(warmups):
+        func(arr.copy(), len(arr))
+
+    samples = []
+    for _ in range(repeats):
+        data = arr.copy()
+        start = perf_counter()
+        func(data, len(data))
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def _share_array(arr: List[int]) -> SharedMemory:
+    data = array("q", arr).tobytes()
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    return shm
+
+
+def _read_shared_array(name: str, size: int) -> List[int]:
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("q")
+        arr = view[:size].tolist()
+        view.release()
+    finally:
+        shm.close()
+    return arr
+
+
+def _raise_timeout(signum, frame) -> None:
+    # Only the timer of a running job triggers this, but a late timer must
+    # not raise between jobs and break the worker.
+    if _job_running:
+        raise JobTimeout
+
+
+def _init_worker() -> None:
+    signal.signal(signal.SIGINT, _raise_timeout)
+
+
+def _run_job(job: BenchmarkJob) -> Optional[object]:
+    """Run one job in a pool worker. Returns the sample time (or the
+    operation counts as a dict), or ``None`` if the job timed out.
+    """
+    global _job_running
+
+    arr = _read_shared_array(job.shm_name, job.size)
+    if job.kind != "count":
+        backend = get_backend(job.backend)
+        func = getattr(backend.algorithms, job.algorithm)
+        data = backend.convert(arr)
+    elif job.backend in PURE_PYTHON_BACKENDS and job.backend != "python":
+        func = getattr(get_backend(job.backend).algorithms, job.algorithm)
+    else:
+        # The generators run exactly the reference kernels' code, and also
+        # yield the swaps that an instrumented list can't see
+        func = getattr(Algorithms, job.algorithm)
+
+    timer = None
+    if job.timeout is not None:
+        timer = Timer(job.timeout, interrupt_main)
+        timer.daemon = True
+
+    try:
+        _job_running = True
+        if timer is not None:
+            timer.start()
+        if job.kind != "count":
+            result = time_algorithm(func, data, job.warmups, 1)[0]
+        else:
+            result = count_operations(func, arr).as_dict()
+        _job_running = False
+    except JobTimeout:
+        return None
+    finally:
+        _job_running = False
+        if timer is not None:
+            timer.cancel()
+        if job.algorithm in PARALLEL_ALGORITHMS:
+            # The kernel's pool would keep this worker from ever exiting,
+            # since its workers don't see the shutdown of a forked parent,
+            # and after a timeout they would still be sorting
+            terminate_pool()
+    return result
+
+
+def run_benchmarks(
+    algorithms: List[str],
+    sizes: List[int],
+    distributions: List[str],
+    warmups: int = 1,
+    repeats: int = 5,
+    seed: int = 0,
+    backend: Backend = get_backend("python"),
+    counts: bool = True,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    lower: int = MINIMUM_ARRAY_VALUE,
+    upper: int = MAXIMUM_ARRAY_VALUE,
+) -> List[Dict[str, object]]:
+    """Time every algorithm on every size and distribution. Unless
+    ``counts`` is false, each row also holds the operation counts of one
+    untimed run on an instrumented copy: by the backend's own kernel if it
+    is pure Python and not the reference, whose swaps can't be counted, and
+    by the step-by-step generator otherwise.
+
+    Jobs run on ``workers`` processes (all available cores by default) and
+    each timed sample does its own warmups, since consecutive repeats may
+    land on different workers.
+    """
+    inputs: Dict[Tuple[int, str], Tuple[List[int], SharedMemory]] = {}
+    try:
+        for size in sizes:
+            for distribution in distributions:
+                arr = generate(distribution, size, lower, upper, seed)
+                inputs[size, distribution] = (arr, _share_array(arr))
+
+        # The workers of the parallel algorithms cannot be instrumented
+        counted = [
+            algorithm
+            for algorithm in algorithms
+            if counts and algorithm not in PARALLEL_ALGORITHMS
+        ]
+        jobs = [
+            BenchmarkJob(
+                kind,
+                algorithm,
+                backend.name,
+                size,
+                distribution,
+                shm.name,
+                warmups,
+                timeout,
+            )
+            for (size, distribution), (_, shm) in inputs.items()
+            for algorithm in algorithms
+            for kind in ["time"] * repeats
+            + (["count"] if algorithm in counted else [])
+        ]
+        # The parallel kernels sort their chunks with the reference merge
+        # sort, which is timed alongside them on the same pool, unless the
+        # run already times it
+        reuse_reference = (
+            backend.name == "python" and "merge_sort" in algorithms
+        )
+        if not reuse_reference and any(
+            algorithm in PARALLEL_ALGORITHMS for algorithm in algorithms
+        ):
+            jobs += [
+                BenchmarkJob(
+                    "reference",
+                    "merge_sort",
+                    "python",
+                    size,
+                    distribution,
+                    shm.name,
+                    warmups,
+                    timeout,
+                )
+                for (size, distribution), (_, shm) in inputs.items()
+                for _ in range(repeats)
+            ]
+
+        samples: Dict[Tuple[str, int, str], List[float]] = {}
+        reference_samples: Dict[Tuple[int, str], List[float]] = {}
+        timed_out = set()
+        operation_counts = {}
+        with ProcessPoolExecutor(
+            max_workers=workers or available_workers(),
+            initializer=_init_worker,
+        ) as executor:
+            futures = {executor.submit(_run_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                key = (job.algorithm, job.size, job.distribution)
+                result = future.result()
+                if job.kind == "reference":
+                    if result is not None:
+                        reference_samples.setdefault(
+                            (job.size, job.distribution), []
+                        ).append(result)
+                elif result is None:
+                    timed_out.add(key)
+                elif job.kind == "time":
+                    samples.setdefault(key, []).append(result)
+                else:
+                    operation_counts[key] = result
+
+        results = []
+        for (size, distribution), (arr, _) in inputs.items():
+            baseline = median(
+                time_algorithm(_list_sort, arr, warmups, repeats)
+            )
+            serial_merge = (
+                samples.get(("merge_sort", size, distribution))
+                if reuse_reference
+                else reference_samples.get((size, distribution))
+            )
+            for algorithm in algorithms:
+                key = (algorithm, size, distribution)
+                key_samples = samples.get(key)
+                row = {
+                    "algorithm": algorithm,
+                    "backend": backend.name,
+                    "size": size,
+                    "distribution": distribution,
+                    "repeats": len(key_samples or ()),
+                    "min": None,
+                    "median": None,
+                    "stddev": None,
+                    "baseline_median": baseline,
+                    "slowdown": None,
+                    "speedup": None,
+                    "timed_out": key in timed_out,
+                }
+                if key_samples:
+                    row.update(
+                        {
+                            "min": min(key_samples),
+                            "median": median(key_samples),
+                            "stddev": pstdev(key_samples),
+                            "slowdown": median(key_samples) / baseline,
+                        }
+                    )
+                    if algorithm in PARALLEL_ALGORITHMS and serial_merge:
+                        row["speedup"] = median(serial_merge) / median(
+                            key_samples
+                        )
+                row.update(operation_counts.get(key, {}))
+                results.append(row)
+    finally:
+        for _, shm in inputs.values():
+            shm.close()
+            shm.unlink()
+    return results
+
+
+def write_results(
+    results: List[Dict[str, object]], fmt: str, file: TextIO
+) -> None:
+    if fmt == "json":
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    else:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "-a",
+        "--algorithms",
+        nargs="+",
+        choices=BARE_SORTING_FUNCTIONS,
+        metavar="ALGORITHM",
+        help="defaults to every algorithm the backend implements",
+    )
+    parser.add_argument(
+        "-b", "--backend", choices=BACKEND_NAMES, default="python"
+    )
+    parser.add_argument(
+        "-n", "--sizes", nargs="+", type=int, default=DEFAULT_SIZES
+    )
+    parser.add_argument(
+        "-d",
+        "--distributions",
+        nargs="+",
+        choices=list(DISTRIBUTIONS),
+        default=["random"],
+    )
+    parser.add_argument("--warmups", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    add_input_arguments(parser)
+    parser.add_argument(
+        "--no-counts",
+        dest="counts",
+        action="store_false",
+        help="skip the instrumented run that counts comparisons, swaps, etc.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="worker processes, defaults to the number of available cores; "
+        "use 1 for the least noisy timings",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="seconds after which a single job is abandoned",
+    )
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("-o", "--output", help="defaults to stdout")
+
+
+def check_arguments(parser: ArgumentParser, args: Namespace) -> None:
+    check_input_arguments(parser, args)
+
+
+def run(args: Namespace) -> int:
+    backend = get_backend(args.backend)
+    available = sorting_functions(backend)
+    algorithms = args.algorithms or available
+    unsupported = [algo for algo in algorithms if algo not in available]
+    if unsupported:
+        print(
+            f"The {backend.name} backend does not implement: "
+            + ", ".join(unsupported),
+            file=sys.stderr,
+        )
+        return 2
+
+    results = run_benchmarks(
+        algorithms,
+        args.sizes,
+        args.distributions,
+        args.warmups,
+        args.repeats,
+        args.seed,
+        backend,
+        args.counts,
+        args.jobs,
+        args.timeout,
+        args.lower,
+        args.upper,
+    )
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_results(results, args.format, f)
+    else:
+        write_results(results, args.format, sys.stdout)
+    return 0
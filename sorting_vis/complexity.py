@@ -0,0 +1,343 @@
+"""Empirical complexity of the bare algorithms from geometric size sweeps,
+runnable with ``python -m sorting_vis complexity``
+
+Every algorithm is benchmarked at sizes growing by a constant factor. Its
+median times and comparison counts are fitted by a least-squares line in
+log-log space, whose slope is the measured exponent, and compared against
+each candidate growth model. An algorithm is flagged when its exponent is
+further from the exponent of its documented class than the fit's own
+uncertainty allows.
+"""
+
+import json
+import sys
+from argparse import ArgumentParser, Namespace
+from math import log, log2, sqrt
+from typing import Callable, Dict, List, NamedTuple, TextIO, Tuple
+
+from sorting_vis.backends import BACKEND_NAMES, get_backend, sorting_functions
+from sorting_vis.benchmark import run_benchmarks
+from sorting_vis.constants import MAXIMUM_ARRAY_VALUE, MINIMUM_ARRAY_VALUE
+from sorting_vis.distributions import DISTRIBUTIONS
+
+# The value range, k in n + k
+VALUE_RANGE = MAXIMUM_ARRAY_VALUE - MINIMUM_ARRAY_VALUE + 1
+MODELS: Dict[str, Callable[[int], float]] = {
+    "n": lambda n: n,
+    "n+k": lambda n: n + VALUE_RANGE,
+    "n log n": lambda n: n * log2(n),
+    "n log^2 n": lambda n: n * log2(n) ** 2,
+    "n^1.5": lambda n: n**1.5,
+    "n^2": lambda n: n**2,
+}
+# Average-case classes; bogo_sort has none worth sweeping
+DOCUMENTED_COMPLEXITY = {
+    "bitonic_sort": "n log^2 n",
+    "bubble_sort": "n^2",
+    "cocktail_shaker_sort": "n^2",
+    "comb_sort": "n log n",
+    "cycle_sort": "n^2",
+    "double_selection_sort": "n^2",
+    "gnome_sort": "n^2",
+    "heap_sort": "n log n",
+    "insertion_sort": "n^2",
+    "intro_sort": "n log n",
+    "merge_sort": "n log n",
+    "odd_even_merge_sort": "n log^2 n",
+    "odd_even_sort": "n^2",
+    "pancake_sort": "n^2",
+    "parallel_merge_sort": "n log n",
+    "pdq_sort": "n log n",
+    "pigeonhole_sort": "n+k",
+    "quick_sort": "n log n",
+    "radix_sort": "n",
+    "sample_sort": "n log n",
+    "selection_sort": "n^2",
+    "shell_sort": "n^1.5",
+    "tim_sort": "n log n",
+}
+# Their comparisons only find the value range, so they don't scale like
+# the sort itself
+NON_COMPARISON_SORTS = ["pigeonhole_sort", "radix_sort"]
+METRICS = ["median", "comparisons"]
+EXPONENT_TOLERANCE = 0.2
+DEFAULT_MIN_SIZE = 128
+DEFAULT_MAX_SIZE = 2048
+
+
+class Fit(NamedTuple):
+    exponent: float
+    stderr: float  # standard error of the exponent
+    best_model: str
+
+
+def geometric_sizes(min_size: int, max_size: int, factor: float) -> List[int]:
+    sizes = []
+    size = float(min_size)
+    while round(size) <= max_size:
+        if not sizes or round(size) > sizes[-1]:
+            sizes.append(round(size))
+        size *= factor
+    return sizes
+
+
+def _least_squares(
+    xs: List[float], ys: List[float]
+) -> Tuple[float, float, float]:
+    """Fit ``y = intercept + slope * x``, returning the slope, intercept and
+    standard error of the slope.
+    """
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    stderr = sqrt(residual / (n - 2) / sxx) if n > 2 else float("inf")
+    return slope, intercept, stderr
+
+
+def model_exponent(model: str, sizes: List[int]) -> float:
+    """The exponent ``model`` appears to have over ``sizes``, e.g. a little
+    over 1 for n log n.
+    """
+    xs = [log(n) for n in sizes]
+    return _least_squares(xs, [log(MODELS[model](n)) for n in sizes])[0]
+
+
+def expected_exponents(model: str, sizes: List[int]) -> Tuple[float, float]:
+    """The range of exponents consistent with ``model`` over ``sizes``."""
+    exponent = model_exponent(model, sizes)
+    if model == "n+k":
+        # Anywhere from the exponent of n + k, with equal costs for elements
+        # and values, up to linear when the values are much cheaper
+        return exponent, 1.0
+    return exponent, exponent
+
+
+def fit_complexity(sizes: List[int], values: List[float]) -> Fit:
+    """Fit ``values`` measured at ``sizes`` to a power law and pick the
+    model that explains them best up to a constant factor.
+    """
+    xs = [log(n) for n in sizes]
+    ys = [log(value) for value in values]
+    exponent, _, stderr = _least_squares(xs, ys)
+
+    def spread(model):
+        # Scatter of log(value / model(n)), which is constant for a perfect
+        # fit whatever the constant factor is
+        ratios = [y - log(MODELS[model](n)) for n, y in zip(sizes, ys)]
+        mean = sum(ratios) / len(ratios)
+        return sum((ratio - mean) ** 2 for ratio in ratios)
+
+    return Fit(exponent, stderr, min(MODELS, key=spread))
+
+
+def analyse(
+    results: List[Dict[str, object]],
+) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+    """Fit every (algorithm, distribution, metric) of benchmark ``results``
+    and find the sizes at which one algorithm overtakes another. Sizes that
+    timed out or measured nothing are left out of the fits.
+    """
+    series: Dict[Tuple[str, str], List[Dict[str, object]]] = {}
+    for row in results:
+        key = (row["algorithm"], row["distribution"])
+        series.setdefault(key, []).append(row)
+
+    fits = []
+    for (algorithm, distribution), rows in series.items():
+        rows.sort(key=lambda row: row["size"])
+        documented = DOCUMENTED_COMPLEXITY.get(algorithm)
+        for metric in METRICS:
+            if metric == "comparisons" and algorithm in NON_COMPARISON_SORTS:
+                continue
+            points = [
+                (row["size"], row[metric])
+                for row in rows
+                if row.get(metric) is not None and row[metric] > 0
+            ]
+            if len(points) < 3:
+                continue
+            sizes = [size for size, _ in points]
+            fit = fit_complexity(sizes, [value for _, value in points])
+
+            expected = None
+            flagged = False
+            if documented is not None:
+                expected = expected_exponents(documented, sizes)
+                margin = EXPONENT_TOLERANCE + 2 * fit.stderr
+                flagged = not (
+                    expected[0] - margin
+                    <= fit.exponent
+                    <= expected[1] + margin
+                )
+            fits.append(
+                {
+                    "algorithm": algorithm,
+                    "distribution": distribution,
+                    "metric": metric,
+                    "points": len(points),
+                    "exponent": fit.exponent,
+                    "stderr": fit.stderr,
+                    "best_model": fit.best_model,
+                    "documented": documented,
+                    "expected_exponents": expected,
+                    "flagged": flagged,
+                }
+            )
+
+    crossovers = []
+    distributions = sorted({distribution for _, distribution in series})
+    algorithms = sorted({algorithm for algorithm, _ in series})
+    for distribution in distributions:
+        for i, first in enumerate(algorithms):
+            for second in algorithms[i + 1 :]:
+                first_times = {
+                    row["size"]: row["median"]
+                    for row in series.get((first, distribution), ())
+                }
+                second_times = {
+                    row["size"]: row["median"]
+                    for row in series.get((second, distribution), ())
+                }
+                sizes = sorted(
+                    size
+                    for size in first_times.keys() & second_times.keys()
+                    if first_times[size] is not None
+                    and second_times[size] is not None
+                )
+                for smaller, larger in zip(sizes, sizes[1:]):
+                    before = first_times[smaller] < second_times[smaller]
+                    after = first_times[larger] < second_times[larger]
+                    if before != after:
+                        crossovers.append(
+                            {
+                                "distribution": distribution,
+                                "faster_below": first if before else second,
+                                "faster_above": first if after else second,
+                                "size": round(sqrt(smaller * larger)),
+                            }
+                        )
+    return fits, crossovers
+
+
+def write_report(
+    fits: List[Dict[str, object]],
+    crossovers: List[Dict[str, object]],
+    fmt: str,
+    file: TextIO,
+) -> None:
+    if fmt == "json":
+        json.dump({"fits": fits, "crossovers": crossovers}, file, indent=2)
+        file.write("\n")
+        return
+
+    for fit in fits:
+        expected = "-"
+        if fit["documented"]:
+            low, high = fit["expected_exponents"]
+            exponents = (
+                f"n^{low:.2f}" if low == high else f"n^{low:.2f}..n^{high:.2f}"
+            )
+            expected = f"{fit['documented']} (~{exponents})"
+        file.write(
+            f"{fit['algorithm']:<22} {fit['distribution']:<13} "
+            f"{fit['metric']:<11} n^{fit['exponent']:.2f} "
+            f"± {2 * fit['stderr']:.2f}  best: {fit['best_model']:<9}  "
+            f"documented: {expected}"
+            f"{'  <-- differs' if fit['flagged'] else ''}\n"
+        )
+    for crossover in crossovers:
+        file.write(
+            f"{crossover['distribution']}: {crossover['faster_below']} is "
+            f"faster below ~{crossover['size']:,}, "
+            f"{crossover['faster_above']} above\n"
+        )
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "-a",
+        "--algorithms",
+        nargs="+",
+        metavar="ALGORITHM",
+        help="defaults to every algorithm with a documented complexity",
+    )
+    parser.add_argument(
+        "-b", "--backend", choices=BACKEND_NAMES, default="python"
+    )
+    parser.add_argument(
+        "-d",
+        "--distributions",
+        nargs="+",
+        choices=list(DISTRIBUTIONS),
+        default=["random"],
+    )
+    parser.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE)
+    parser.add_argument(
+        "--factor", type=float, default=2.0, help="growth between sizes"
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="worker processes, defaults to the number of available cores",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=10.0,
+        help="seconds after which a single job is abandoned; its size is "
+        "left out of the fit",
+    )
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("-o", "--output", help="defaults to stdout")
+
+
+def run(args: Namespace) -> int:
+    backend = get_backend(args.backend)
+    available = sorting_functions(backend)
+    algorithms = args.algorithms or [
+        algorithm
+        for algorithm in available
+        if algorithm in DOCUMENTED_COMPLEXITY
+    ]
+    unsupported = [algo for algo in algorithms if algo not in available]
+    if unsupported:
+        print(
+            f"The {backend.name} backend does not implement: "
+            + ", ".join(unsupported),
+            file=sys.stderr,
+        )
+        return 2
+    sizes = (
+        geometric_sizes(args.min_size, args.max_size, args.factor)
+        if args.factor > 1
+        else []
+    )
+    if len(sizes) < 3:
+        print("The sweep needs at least 3 distinct sizes", file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(
+        algorithms,
+        sizes,
+        args.distributions,
+        repeats=args.repeats,
+        seed=args.seed,
+        backend=backend,
+        workers=args.jobs,
+        timeout=args.timeout,
+    )
+    fits, crossovers = analyse(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            write_report(fits, crossovers, args.format, f)
+    else:
+        write_report(fits, crossovers, args.format, sys.stdout)
+    return 0
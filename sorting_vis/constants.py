@@ -5,9 +5,24 @@ from sorting_vis.algorithms import Algorithms
 MINIMUM_ARRAY_VALUE = 10
 MAXIMUM_ARRAY_VALUE = 1000
 MINIMUM_ARRAY_SAMPLES = 10
-MAXIMUM_ARRAY_SAMPLES = 1000
+MAXIMUM_ARRAY_SAMPLES = 1_000_000
+# Larger arrays are drawn as an aggregated raster instead of one bar each
+MAXIMUM_BAR_SAMPLES = 1000
+TARGET_FPS = 60
+DEFAULT_OPS_PER_FRAME = 10
+DEFAULT_CHECK_FRAMES = 60
+MAXIMUM_OPS_PER_FRAME = 5000
+# While paused, the run is recorded at most this far ahead of the drawn
+# step, this many operations per frame
+MAXIMUM_SEEK_RECORDING = 5_000_000
+RECORD_AHEAD_OPS_PER_FRAME = 10_000
+ESTIMATE_SAMPLES = 5
+ESTIMATE_TIMEOUT = 5.0
+# Larger arrays are estimated from a subsample of this size
+ESTIMATE_MAXIMUM_SAMPLES = 10_000
 DIR_PATH = Path(__file__).resolve().parents[0]
 ASSETS_PATH = DIR_PATH / "assets"
+ASSET_CACHE_PATH = DIR_PATH / "asset_cache"
 CONFIG_PATH = DIR_PATH / "config.ini"
 SMARTFILL_PATH = DIR_PATH / "smartfill.json"
 LOWER_SAMPLE_BOUND_PLACEHOLDER = f"< upper, >= {MINIMUM_ARRAY_VALUE}"
@@ -15,6 +30,22 @@ UPPER_SAMPLE_BOUND_PLACEHOLDER = f"> lower, <= {MAXIMUM_ARRAY_VALUE}"
 SAMPLE_COUNT_PLACEHOLDER = (
     f">= {MINIMUM_ARRAY_SAMPLES}, <= {MAXIMUM_ARRAY_SAMPLES}"
 )
+CANVAS_BACKGROUND = "#2d4485"
+BAR_FILL = "#aebac2"
+BAR_OUTLINE = "#c7cdd1"
+ACTIVE_BAR_FILL = "#eb3f3f"
+ACTIVE_BAR_OUTLINE = "#eb6e6e"
+SORTED_BAR_FILL = "#28b842"
+SORTED_BAR_OUTLINE = "#229937"
+FAILED_BAR_FILL = "#ed3b4d"
+FAILED_BAR_OUTLINE = "#590911"
+# (fill, outline) of the bars owned by each worker of a parallel algorithm
+WORKER_BAR_COLOURS = [
+    ("#e0a030", "#f0c060"),
+    ("#9b59d0", "#b98ae0"),
+    ("#2bb3c0", "#6fd3dc"),
+    ("#d05fa0", "#e08fc0"),
+]
 AVAILABLE_SORTING_FUNCTIONS = [
     attr for attr in dir(Algorithms) if not attr.startswith("_")
 ]
@@ -0,0 +1,185 @@
+"""An instrumented sequence that counts what a sorting algorithm does to it"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+
+from sorting_vis.operations import SWAP, Operation
+
+COUNT_FIELDS = ["comparisons", "swaps", "reads", "writes", "allocations"]
+# Operations between the snapshots of a CountsHistory
+COUNTS_INTERVAL = 16
+
+
+class OperationCounts:
+    __slots__ = tuple(COUNT_FIELDS)
+
+    def __init__(self) -> None:
+        for field in COUNT_FIELDS:
+            setattr(self, field, 0)
+
+    def as_dict(self) -> Dict[str, Optional[int]]:
+        return {field: getattr(self, field) for field in COUNT_FIELDS}
+
+    def __str__(self) -> str:
+        return "  ".join(
+            f"{field.title()}: " + ("n/a" if count is None else f"{count:,}")
+            for field, count in self.as_dict().items()
+        )
+
+
+def _counted_int_type(counts: OperationCounts) -> type:
+    """Make an ``int`` subclass whose comparisons are added to ``counts``.
+
+    Values read from an ``InstrumentedList`` are instances of it, so they
+    still behave exactly like ints (indexing, arithmetic, hashing) while
+    every comparison an algorithm makes between them is counted.
+    """
+
+    def counted(compare):
+        def method(self, other):
+            counts.comparisons += 1
+            return compare(self, other)
+
+        return method
+
+    return type(
+        "CountedInt",
+        (int,),
+        {
+            "__slots__": (),
+            "__lt__": counted(int.__lt__),
+            "__le__": counted(int.__le__),
+            "__gt__": counted(int.__gt__),
+            "__ge__": counted(int.__ge__),
+            "__eq__": counted(int.__eq__),
+            "__ne__": counted(int.__ne__),
+            "__hash__": int.__hash__,
+        },
+    )
+
+
+class InstrumentedList:
+    """Wraps a list of ints, counting element reads, writes, comparisons and
+    the auxiliary sequences sliced or copied from it.
+
+    The wrapped list is sorted in place. Swaps can't be told apart from
+    other writes here, so they are counted from the ``SWAP`` operations of
+    the step-by-step algorithms instead (see ``count_swaps``). Buffers that
+    an algorithm builds without touching the array (e.g. ``[0] * n``) cannot
+    be seen, so ``allocations`` only covers slices and copies.
+    """
+
+    __slots__ = ("data", "counts", "_value_type")
+
+    def __init__(
+        self, data: List[int], counts: Optional[OperationCounts] = None
+    ) -> None:
+        self.data = data
+        self.counts = counts if counts is not None else OperationCounts()
+        self._value_type = _counted_int_type(self.counts)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            values = self.data[index]
+            self.counts.reads += len(values)
+            self.counts.allocations += 1
+            return [self._value_type(value) for value in values]
+
+        self.counts.reads += 1
+        return self._value_type(self.data[index])
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.data[index] = int(value)
+        self.counts.writes += 1
+
+    def __iter__(self) -> Iterator[int]:
+        for value in self.data:
+            self.counts.reads += 1
+            yield self._value_type(value)
+
+    def index(self, value: int) -> int:
+        value = int(value)
+        for i, item in enumerate(self.data):
+            self.counts.reads += 1
+            self.counts.comparisons += 1
+            if item == value:
+                return i
+        raise ValueError(f"{value} is not in list")
+
+    def copy(self) -> List[int]:
+        self.counts.reads += len(self.data)
+        self.counts.allocations += 1
+        return [*self.data]
+
+
+def count_swaps(
+    steps: Iterator[Operation], counts: OperationCounts
+) -> Iterator[Operation]:
+    """Pass on the operations of ``steps``, adding its swaps to ``counts``."""
+    for op in steps:
+        if op.kind == SWAP:
+            counts.swaps += 1
+        yield op
+
+
+class CountsHistory:
+    """Snapshots of ``counts`` taken every ``interval`` operations of a
+    step-by-step algorithm, so that the counts can be shown at any step of
+    its trace rather than only at the furthest one.
+
+    The snapshots are taken by whichever thread runs the algorithm and read
+    by another, so each one is only used once all of its fields are in.
+    """
+
+    def __init__(
+        self, counts: OperationCounts, interval: int = COUNTS_INTERVAL
+    ) -> None:
+        self.counts = counts
+        self.interval = interval
+        self.snapshots = array("Q")
+        self._take_snapshot()
+
+    def _take_snapshot(self) -> None:
+        self.snapshots.extend(
+            getattr(self.counts, field) for field in COUNT_FIELDS
+        )
+
+    def record(self, steps: Iterator[Operation]) -> Iterator[Operation]:
+        """Pass on the operations of ``steps``, taking a snapshot after
+        every ``interval`` of them.
+        """
+        interval = self.interval
+        for produced, op in enumerate(steps, 1):
+            if not produced % interval:
+                self._take_snapshot()
+            yield op
+
+    def at(self, step: int) -> OperationCounts:
+        """Return the counts after the last snapshot at or before ``step``
+        operations.
+        """
+        fields = len(COUNT_FIELDS)
+        index = min(step // self.interval, len(self.snapshots) // fields - 1)
+        counts = OperationCounts()
+        for i, field in enumerate(COUNT_FIELDS):
+            setattr(counts, field, self.snapshots[index * fields + i])
+        return counts
+
+
+def count_operations(func, arr: List[int]) -> OperationCounts:
+    """Run a bare algorithm, or exhaust a step-by-step one, on an
+    instrumented copy of ``arr`` and return what it counted. Only a
+    step-by-step algorithm reports its swaps; for a bare one they are
+    ``None``.
+    """
+    counts = OperationCounts()
+    steps = func(InstrumentedList([*arr], counts), len(arr))
+    if steps is None:
+        counts.swaps = None
+    else:
+        for _ in count_swaps(steps, counts):
+            pass
+    return counts
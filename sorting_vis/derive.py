@@ -0,0 +1,174 @@
+"""Derive the bare sorting kernels from the step-by-step generators.
+
+Every algorithm is written once, as a generator of ``Algorithms``. Its bare
+kernel is the same function with the instrumentation compiled out: each
+``yield <operation>`` statement is deleted and each ``yield from helper(...)``
+becomes a plain ``helper(...)`` call, so helpers that return a value through
+``yield from`` keep returning it. Generator helpers shared by several
+algorithms live at module level, and are stripped the same way. What is left
+runs the exact code that is animated, without building a single
+``Operation``.
+
+Parsing and compiling the generators takes a noticeable part of startup, so
+the derived code object is cached next to the module's own bytecode (and,
+like it, not written when ``sys.dont_write_bytecode`` is set) and reused
+until either source file changes.
+"""
+
+import ast
+import marshal
+import os
+import sys
+from hashlib import sha256
+from importlib.util import MAGIC_NUMBER, cache_from_source
+from typing import Iterable, Optional
+
+CACHE_TAG = "bare"
+
+
+class _StripOperations(ast.NodeTransformer):
+    def visit_Expr(self, node: ast.Expr) -> Optional[ast.AST]:
+        if isinstance(node.value, ast.Yield):
+            return None
+        return self.generic_visit(node)
+
+    def visit_YieldFrom(self, node: ast.YieldFrom) -> ast.AST:
+        return self.visit(node.value)
+
+    def visit_Yield(self, node: ast.Yield) -> ast.AST:
+        raise SyntaxError(
+            f"line {node.lineno}: only yield statements can be stripped, "
+            "not yields whose value is used"
+        )
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        # They are no longer generators
+        node.returns = None
+        return self.generic_visit(node)
+
+    def visit_For(self, node: ast.For) -> Optional[ast.AST]:
+        self.generic_visit(node)
+        # A loop over a range that only yielded does nothing at all now
+        if (
+            all(isinstance(stmt, ast.Pass) for stmt in node.body)
+            and not node.orelse
+            and isinstance(node.iter, ast.Call)
+            and isinstance(node.iter.func, ast.Name)
+            and node.iter.func.id == "range"
+        ):
+            return None
+        return node
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        # Statements whose whole body was yields still need one
+        body = getattr(node, "body", None)
+        if isinstance(body, list) and not body:
+            node.body = [ast.copy_location(ast.Pass(), node)]
+        return node
+
+
+def _is_generator(node: ast.FunctionDef) -> bool:
+    return any(
+        isinstance(child, (ast.Yield, ast.YieldFrom))
+        for child in ast.walk(node)
+    )
+
+
+def _strip_class(
+    tree: ast.Module, class_name: str, name: str, exclude: Iterable[str]
+) -> ast.Module:
+    cls = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == class_name
+    )
+    # The bare helpers replace the generators of the same name in the
+    # kernels' globals
+    helpers = [
+        node
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and _is_generator(node)
+    ]
+    excluded = set(exclude)
+    cls.name = name
+    cls.body = [
+        node
+        for node in cls.body
+        if isinstance(node, ast.FunctionDef) and node.name not in excluded
+    ]
+    for node in [*helpers, cls]:
+        _StripOperations().visit(node)
+    for method in cls.body:
+        method.returns = ast.copy_location(ast.Constant(None), method)
+    return ast.fix_missing_locations(
+        ast.Module([*helpers, cls], type_ignores=[])
+    )
+
+
+def _load_cached(path: str, key: bytes) -> Optional[object]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = MAGIC_NUMBER + key
+    if not data.startswith(header):
+        return None
+    try:
+        return marshal.loads(data[len(header) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _store_cached(path: str, key: bytes, code: object) -> None:
+    # Written to a temporary file first, so that a concurrent import never
+    # reads half a cache file. Installs without write access just skip it.
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp, "wb") as f:
+            f.write(MAGIC_NUMBER + key + marshal.dumps(code))
+        os.replace(temp, path)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def derive_bare(
+    generators: type, name: str, exclude: Iterable[str] = ()
+) -> type:
+    """Return a class named ``name`` holding a bare kernel for every static
+    generator method of ``generators``, except those in ``exclude``.
+
+    The kernels run in the globals of the generators' module.
+    """
+    exclude = sorted(exclude)
+    module = sys.modules[generators.__module__]
+    source_path = module.__file__
+    with open(source_path, "rb") as f:
+        source = f.read()
+    with open(__file__, "rb") as f:
+        key = sha256(
+            source
+            + f.read()
+            + repr((generators.__name__, name, exclude)).encode()
+        ).digest()[:16]
+
+    cache_path = cache_from_source(source_path, optimization=CACHE_TAG)
+    code = _load_cached(cache_path, key)
+    if code is None:
+        tree = _strip_class(
+            ast.parse(source, source_path), generators.__name__, name, exclude
+        )
+        code = compile(tree, source_path, "exec")
+        if not sys.dont_write_bytecode:
+            _store_cached(cache_path, key, code)
+
+    namespace = dict(vars(module))
+    exec(code, namespace)
+    derived = namespace[name]
+    derived.__module__ = module.__name__
+    return derived
@@ -0,0 +1,121 @@
+"""Seeded generators for the input arrays of the gui, benchmarks and traces
+
+Every generator returns ``n`` integers within ``[lower, upper]`` and is fully
+determined by its seed. Arrays of ``NUMPY_THRESHOLD`` elements or more are
+generated with the vectorised versions in ``numpy_distributions`` when NumPy
+is installed, which draw from NumPy's own generator; a seed therefore only
+reproduces such an array on machines that agree on whether NumPy is
+available.
+"""
+
+from random import Random
+from typing import Callable, Dict, List
+
+NUMPY_THRESHOLD = 10_000
+NEARLY_SORTED_SWAPS = 0.01  # swaps as a fraction of the array length
+FEW_UNIQUE_VALUES = 8
+SAWTOOTH_TEETH = 8
+
+
+def nearly_sorted_swaps(n: int) -> int:
+    return max(1, int(n * NEARLY_SORTED_SWAPS)) if n else 0
+
+
+def few_unique_values(lower: int, upper: int) -> List[int]:
+    return sorted(
+        {
+            lower + (upper - lower) * k // (FEW_UNIQUE_VALUES - 1)
+            for k in range(FEW_UNIQUE_VALUES)
+        }
+    )
+
+
+def _random(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    return [rng.randint(lower, upper) for _ in range(n)]
+
+
+def _sorted(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    return sorted(_random(rng, n, lower, upper))
+
+
+def _reversed(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    return sorted(_random(rng, n, lower, upper), reverse=True)
+
+
+def _nearly_sorted(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    arr = _sorted(rng, n, lower, upper)
+    for _ in range(nearly_sorted_swaps(n)):
+        i = rng.randrange(n)
+        j = rng.randrange(n)
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+def _few_unique(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    values = few_unique_values(lower, upper)
+    return [rng.choice(values) for _ in range(n)]
+
+
+def _sawtooth(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    tooth = -(-n // SAWTOOTH_TEETH)
+    return [
+        lower + (upper - lower) * (i % tooth) // max(1, tooth - 1)
+        for i in range(n)
+    ]
+
+
+def _organ_pipe(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    arr = _sorted(rng, n, lower, upper)
+    return arr[::2] + arr[1::2][::-1]
+
+
+def _gaussian(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    mean = (lower + upper) / 2
+    deviation = (upper - lower) / 6
+    return [
+        min(upper, max(lower, round(rng.gauss(mean, deviation))))
+        for _ in range(n)
+    ]
+
+
+def _partitioned(rng: Random, n: int, lower: int, upper: int) -> List[int]:
+    # Partitioned around the median, with each side left in random order
+    arr = _random(rng, n, lower, upper)
+    pivot = sorted(arr)[n // 2] if n else 0
+    return (
+        [value for value in arr if value < pivot]
+        + [value for value in arr if value == pivot]
+        + [value for value in arr if value > pivot]
+    )
+
+
+DISTRIBUTIONS: Dict[str, Callable[[Random, int, int, int], List[int]]] = {
+    "random": _random,
+    "sorted": _sorted,
+    "reversed": _reversed,
+    "nearly_sorted": _nearly_sorted,
+    "few_unique": _few_unique,
+    "sawtooth": _sawtooth,
+    "organ_pipe": _organ_pipe,
+    "gaussian": _gaussian,
+    "partitioned": _partitioned,
+}
+
+
+def generate(
+    distribution: str, n: int, lower: int, upper: int, seed: int
+) -> List[int]:
+    """Generate ``n`` values in ``[lower, upper]`` shaped like
+    ``distribution``.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+
+    if n >= NUMPY_THRESHOLD:
+        try:
+            from sorting_vis.numpy_distributions import generate_numpy
+        except ImportError:
+            pass
+        else:
+            return generate_numpy(distribution, n, lower, upper, seed)
+    return DISTRIBUTIONS[distribution](Random(seed), n, lower, upper)
@@ -0,0 +1,299 @@
+"""Sorting-time estimates measured in a separate process, so generating a
+new array never blocks the gui
+"""
+
+import signal
+import traceback
+from array import array
+from hashlib import blake2b
+from multiprocessing import get_context, util
+from multiprocessing.connection import Connection
+from statistics import median
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+from sorting_vis.backends import Backend, get_backend, sorting_functions
+from sorting_vis.parallel import terminate_pool
+
+# Forking the gui's process would copy Tk's state and the locks held by its
+# other threads into the child
+_context = get_context("spawn")
+# How often the collecting thread notices a cancelled job
+POLL_INTERVAL = 0.1
+
+# The jobs whose process is still running
+_running: Set["EstimateJob"] = set()
+
+
+def _cancel_running() -> None:
+    for job in list(_running):
+        job.cancel()
+
+
+# The processes are not daemons, so that the parallel algorithms can start
+# their pools, which means multiprocessing waits for them at exit. Its exit
+# handler runs this first.
+util.Finalize(None, _cancel_running, exitpriority=0)
+
+
+def _exit(signum, frame) -> None:
+    raise SystemExit(1)
+
+
+class Estimate(NamedTuple):
+    median: float
+    spread: float  # median absolute deviation of the samples
+    samples: int
+    timeout: float
+    # The size of the subsample that was timed, if the estimate is
+    # extrapolated from one
+    measured_size: Optional[int] = None
+    # Why the measuring process failed, if it did
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.error is not None:
+            return f"an unknown time (estimating failed: {self.error})"
+        if not self.samples:
+            return f"over {self.timeout:g}s"
+        text = f"{self.median:.4f}s ± {self.spread:.4f}s"
+        if self.measured_size is not None:
+            text = (
+                f"~{text} (extrapolated from {self.measured_size:,} "
+                "elements)"
+            )
+        return text
+
+
+def _measure(
+    backend_name: str,
+    algorithm: str,
+    arr: List[int],
+    sample_count: int,
+    connection: Connection,
+) -> None:
+    # Runs in the job's process, sending each sample as soon as it is taken,
+    # or the exception that stopped it.
+    # Terminating the job exits through the finally clause, so that the
+    # pool of a parallel algorithm doesn't outlive it
+    signal.signal(signal.SIGTERM, _exit)
+    try:
+        backend = get_backend(backend_name)
+        func = getattr(backend.algorithms, algorithm)
+        arr = backend.convert(arr)
+        for _ in range(sample_count):
+            data = arr.copy()
+            start = perf_counter()
+            func(data, len(data))
+            connection.send(perf_counter() - start)
+    except Exception as e:
+        traceback.print_exc()
+        connection.send("".join(traceback.format_exception_only(e)).strip())
+    finally:
+        terminate_pool()
+        connection.close()
+
+
+class EstimateJob:
+    """A single estimate being measured by its own process.
+
+    A daemon thread collects the samples as they arrive, or the error that
+    stopped the process. Cancelling the job, or reaching the timeout,
+    terminates the process and the pool of a parallel algorithm with it, so
+    a sample that is still running never keeps a cpu busy in the background.
+    """
+
+    def __init__(
+        self,
+        estimator: "SortingTimeEstimator",
+        key: Tuple[str, Hashable],
+        arr: List[int],
+        scale: float = 1.0,
+        measured_size: Optional[int] = None,
+    ) -> None:
+        self.estimator = estimator
+        self.key = key
+        self.arr = arr
+        self.scale = scale
+        self.measured_size = measured_size
+        self.samples: List[float] = []
+        self.error: Optional[str] = None
+        self.result: Optional[Estimate] = None
+        self.cancelled = Event()
+        self.stopped = False
+        self.deadline = perf_counter() + estimator.timeout
+        self.process = None
+
+    def start(self) -> None:
+        receiver, sender = _context.Pipe(duplex=False)
+        self.process = _context.Process(
+            target=_measure,
+            args=(
+                self.estimator._backend_for(self.key[0]).name,
+                self.key[0],
+                self.arr,
+                self.estimator.sample_count,
+                sender,
+            ),
+            daemon=False,
+        )
+        self.process.start()
+        _running.add(self)
+        # Only the child's end stays open, so its exit reads as EOF here
+        sender.close()
+        self.arr = None
+        Thread(target=self._collect, args=(receiver,), daemon=True).start()
+
+    def _collect(self, receiver: Connection) -> None:
+        try:
+            while not self.cancelled.is_set():
+                remaining = self.deadline - perf_counter()
+                if remaining <= 0:
+                    # The sample that is running would finish too late
+                    self._stop()
+                    break
+                if receiver.poll(min(remaining, POLL_INTERVAL)):
+                    message = receiver.recv()
+                    if isinstance(message, str):
+                        self.error = message
+                    else:
+                        self.samples.append(message)
+        except EOFError:
+            # Every sample has been sent, or the process died
+            pass
+        finally:
+            self.process.join()
+            receiver.close()
+            _running.discard(self)
+
+        if (
+            self.error is None
+            and not self.stopped
+            and self.process.exitcode != 0
+        ):
+            self.error = (
+                f"the process exited with code {self.process.exitcode}"
+            )
+        if not self.cancelled.is_set():
+            self.result = self._make_estimate()
+            # A failure may not happen again, so it is not remembered
+            if self.error is None:
+                self.estimator._store(self.key, self.result)
+
+    def _stop(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.stopped = True
+            self.process.terminate()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        self._stop()
+
+    def poll(self) -> Optional[Estimate]:
+        """Return the estimate if it is ready, or whatever could be measured
+        once the timeout has passed, otherwise ``None``.
+        """
+        if self.result is None and perf_counter() > self.deadline:
+            self.cancel()
+            self.result = self._make_estimate()
+        return self.result
+
+    def _make_estimate(self) -> Estimate:
+        return self.estimator._make_estimate(
+            [sample * self.scale for sample in self.samples],
+            self.measured_size,
+            self.error,
+        )
+
+
+class SortingTimeEstimator:
+    def __init__(
+        self,
+        sample_count: int = 5,
+        timeout: float = 5.0,
+        backend: str = "python",
+        maximum_size: int = 10_000,
+    ) -> None:
+        self.sample_count = sample_count
+        self.timeout = timeout
+        self.maximum_size = maximum_size
+        self.backend = get_backend(backend)
+        self._fallback_backend = get_backend("python")
+        self._cache: Dict[Tuple[str, Hashable], Estimate] = {}
+        self._lock = Lock()
+
+    def _backend_for(self, algorithm: str) -> Backend:
+        # Algorithms the chosen backend does not vectorise are estimated with
+        # the pure Python kernels.
+        if algorithm in sorting_functions(self.backend):
+            return self.backend
+        return self._fallback_backend
+
+    def _make_estimate(
+        self,
+        samples: List[float],
+        measured_size: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> Estimate:
+        if not samples:
+            return Estimate(0.0, 0.0, 0, self.timeout, measured_size, error)
+        mid = median(samples)
+        return Estimate(
+            mid,
+            median(abs(sample - mid) for sample in samples),
+            len(samples),
+            self.timeout,
+            measured_size,
+            error,
+        )
+
+    def _store(self, key: Tuple[str, Hashable], estimate: Estimate) -> None:
+        with self._lock:
+            self._cache[key] = estimate
+
+    def submit(
+        self,
+        algorithm: str,
+        arr: List[int],
+        fingerprint: Optional[Hashable] = None,
+    ) -> Optional[EstimateJob]:
+        """Start estimating how long ``algorithm`` takes to sort ``arr``.
+
+        Estimates are memoised by algorithm and ``fingerprint``, so an
+        identical array is answered straight from the cache. Arrays that
+        were generated should be fingerprinted by what generated them;
+        otherwise a digest of their contents is used.
+
+        Arrays longer than ``maximum_size`` are estimated from an evenly
+        spaced subsample of that size, scaled up by the algorithm's
+        documented complexity. Quadratic algorithms (and any without a
+        documented complexity) are not estimated at those sizes, and
+        ``None`` is returned.
+        """
+        scale = 1.0
+        measured_size = None
+        if len(arr) > self.maximum_size:
+            # Imported here because the complexity command pulls in the
+            # benchmark's process pools, which the gui doesn't need
+            from sorting_vis.complexity import DOCUMENTED_COMPLEXITY, MODELS
+
+            model = DOCUMENTED_COMPLEXITY.get(algorithm)
+            if model is None or model == "n^2":
+                return None
+            # Every k-th element keeps the shape of the distribution
+            sample = arr[:: -(-len(arr) // self.maximum_size)]
+            scale = MODELS[model](len(arr)) / MODELS[model](len(sample))
+            measured_size = len(sample)
+        else:
+            sample = arr
+
+        if fingerprint is None:
+            fingerprint = blake2b(array("q", arr)).digest()
+        key = (algorithm, fingerprint)
+        job = EstimateJob(self, key, sample, scale, measured_size)
+        with self._lock:
+            job.result = self._cache.get(key)
+        if job.result is None:
+            job.start()
+        return job
@@ -0,0 +1,302 @@
+"""Headless rendering of sort runs to animated GIFs or PNG sequences,
+runnable with ``python -m sorting_vis export``
+
+The run is recorded to a trace file first. The frames are then split into
+chunks that are rendered on a process pool, each worker memory-mapping the
+trace and starting its chunk from the nearest keyframe, and every frame only
+redraws the bars its operations touched.
+"""
+
+import os
+import sys
+import tempfile
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from math import ceil
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+from PIL import Image, ImageDraw
+
+from sorting_vis.constants import (
+    AVAILABLE_SORTING_FUNCTIONS,
+    MAXIMUM_BAR_SAMPLES,
+)
+from sorting_vis.distributions import DISTRIBUTIONS
+from sorting_vis.operations import apply_operation
+from sorting_vis.parallel import available_workers
+from sorting_vis.raster import ACTIVE_BAR, BACKGROUND, BAR, PALETTE, SORTED_BAR
+from sorting_vis.settings import add_input_arguments
+from sorting_vis.trace_file import (
+    TraceFile,
+    check_recording_arguments,
+    record_trace,
+)
+
+DEFAULT_FRAME_COUNT = 300
+DEFAULT_FPS = 30
+FINAL_FRAME_DURATION = 1000
+
+
+class ExportJob(NamedTuple):
+    trace_path: str
+    first_frame: int
+    stop_frame: int
+    ops_per_frame: int
+    width: int
+    height: int
+    png_dir: Optional[str]  # None to return the frames instead of saving
+
+
+class FrameRenderer:
+    """Draws bars onto a persistent image with the same geometry and colours
+    as ``ArrayVisualiser``'s canvas.
+    """
+
+    def __init__(
+        self, arr: Sequence[int], width: int, height: int, minval: int
+    ) -> None:
+        self.arr = arr
+        self.image = Image.new("P", (width, height), BACKGROUND)
+        self.image.putpalette(PALETTE)
+        self.draw = ImageDraw.Draw(self.image)
+        self.canvas_width = width - 10
+        self.canvas_height = height - 21
+        self.bar_width = self.canvas_width / len(arr)
+        self.minval = minval
+        self.range = max(arr) - minval or 1
+        self.colours = [BAR] * len(arr)
+
+    def _draw_bar(self, i: int) -> None:
+        colour = self.colours[i]
+        x1 = i * self.bar_width + 3
+        self.draw.rectangle(
+            (
+                x1,
+                self.canvas_height
+                * (1 - (self.arr[i] - self.minval) / self.range),
+                x1 + self.bar_width,
+                self.canvas_height,
+            ),
+            fill=colour * 2 - 1,
+            outline=colour * 2,
+        )
+
+    def draw_all(self, colour: int = BAR) -> None:
+        self.colours = [colour] * len(self.arr)
+        self.draw.rectangle(
+            (0, 0, *self.image.size), fill=BACKGROUND, outline=BACKGROUND
+        )
+        for i in range(len(self.arr)):
+            self._draw_bar(i)
+
+    def update(self, indices: Iterable[int], colour: int = BAR) -> None:
+        """Clear the columns at ``indices`` and redraw their bars, along with
+        the neighbours that share the cleared pixels.
+        """
+        redraw = set()
+        for i in indices:
+            self.colours[i] = colour
+            x1 = i * self.bar_width + 3
+            self.draw.rectangle(
+                (x1, 0, x1 + self.bar_width, self.canvas_height),
+                fill=BACKGROUND,
+            )
+            # Thin bars share pixels with several neighbours on each side.
+            first = max(0, int((x1 - 4) / self.bar_width))
+            stop = min(len(self.arr), int((x1 + 2) / self.bar_width) + 2)
+            redraw.update(range(first, stop))
+        for i in sorted(redraw):
+            self._draw_bar(i)
+
+
+def _render_chunk(job: ExportJob) -> List[bytes]:
+    """Render frames ``[first_frame, stop_frame)``, returning their pixels or
+    saving them to ``png_dir``.
+
+    Frame 0 is the unsorted array, frame ``f`` shows the array after the
+    operations of frame ``f - 1`` with the bars they touched highlighted,
+    and the final frame shows the sorted array.
+    """
+    with TraceFile(job.trace_path) as trace:
+        final_frame = 1 + ceil(len(trace) / job.ops_per_frame)
+        start = max(0, job.first_frame - 1) * job.ops_per_frame
+        arr = trace.state_at(start)
+        renderer = FrameRenderer(
+            arr, job.width, job.height, min(trace.keyframe(0))
+        )
+        renderer.draw_all()
+
+        frames = []
+        highlighted = set()
+        operations = trace.operations(start)
+        for frame in range(job.first_frame, job.stop_frame):
+            if frame == final_frame:
+                renderer.draw_all(SORTED_BAR)
+            elif frame:
+                dirty = set()
+                for op in islice(operations, job.ops_per_frame):
+                    apply_operation(arr, op)
+                    dirty.update(op.indices)
+                renderer.update(highlighted - dirty)
+                renderer.update(dirty, ACTIVE_BAR)
+                highlighted = dirty
+
+            if job.png_dir is None:
+                frames.append(renderer.image.tobytes())
+            else:
+                renderer.image.save(Path(job.png_dir, f"{frame:05d}.png"))
+    return frames
+
+
+def export_trace(
+    trace_path: str,
+    output: str,
+    ops_per_frame: Optional[int] = None,
+    width: int = 640,
+    height: int = 360,
+    fps: int = DEFAULT_FPS,
+    workers: Optional[int] = None,
+) -> int:
+    """Render the trace at ``trace_path`` to ``output``, an animated GIF if
+    it ends in ``.gif`` and otherwise a directory of numbered PNGs. Returns
+    the number of frames.
+
+    By default enough operations are drawn per frame to give about
+    ``DEFAULT_FRAME_COUNT`` frames.
+    """
+    with TraceFile(trace_path) as trace:
+        op_count = len(trace)
+    if ops_per_frame is None:
+        ops_per_frame = max(1, ceil(op_count / DEFAULT_FRAME_COUNT))
+    frame_count = ceil(op_count / ops_per_frame) + 2
+
+    gif = output.lower().endswith(".gif")
+    png_dir = None
+    if not gif:
+        os.makedirs(output, exist_ok=True)
+        png_dir = output
+
+    # A few chunks per worker keeps the workers busy when chunks finish
+    # unevenly; each chunk costs one keyframe replay and one full redraw.
+    workers = workers or available_workers()
+    chunk_size = max(1, ceil(frame_count / (workers * 4)))
+    jobs = [
+        ExportJob(
+            trace_path,
+            first,
+            min(first + chunk_size, frame_count),
+            ops_per_frame,
+            width,
+            height,
+            png_dir,
+        )
+        for first in range(0, frame_count, chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(_render_chunk, jobs)
+        if gif:
+            frames = []
+            for chunk in chunks:
+                for data in chunk:
+                    frame = Image.frombytes("P", (width, height), data)
+                    frame.putpalette(PALETTE)
+                    frames.append(frame)
+            durations = [1000 // fps] * (frame_count - 1)
+            frames[0].save(
+                output,
+                save_all=True,
+                append_images=frames[1:],
+                duration=durations + [FINAL_FRAME_DURATION],
+                loop=0,
+                # The palette is already minimal, and optimising it is by
+                # far the slowest part of the export.
+                optimize=False,
+            )
+        else:
+            for _ in chunks:
+                pass
+    return frame_count
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "algorithm", nargs="?", choices=AVAILABLE_SORTING_FUNCTIONS
+    )
+    source.add_argument(
+        "--trace", help="export an existing trace file instead"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="a .gif file, or a directory for a numbered png sequence",
+    )
+    parser.add_argument(
+        "-n", "--samples", type=int, default=MAXIMUM_BAR_SAMPLES
+    )
+    parser.add_argument(
+        "-d", "--distribution", choices=list(DISTRIBUTIONS), default="random"
+    )
+    add_input_arguments(parser)
+    parser.add_argument(
+        "--ops-per-frame",
+        type=int,
+        help=f"defaults to about {DEFAULT_FRAME_COUNT} frames in total",
+    )
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="worker processes, defaults to the number of available cores",
+    )
+    parser.add_argument(
+        "--max-operations",
+        type=int,
+        help="stop recording after this many operations (e.g. for bogo_sort)",
+    )
+
+
+def check_arguments(parser: ArgumentParser, args: Namespace) -> None:
+    if not args.trace:
+        check_recording_arguments(parser, args)
+
+
+def run(args: Namespace) -> int:
+    if args.trace:
+        trace_path = args.trace
+    else:
+        fd, trace_path = tempfile.mkstemp(suffix=".svtrace")
+        os.close(fd)
+
+    try:
+        if not args.trace:
+            record_trace(
+                trace_path,
+                args.algorithm,
+                args.samples,
+                args.lower,
+                args.upper,
+                args.seed,
+                max_operations=args.max_operations,
+                distribution=args.distribution,
+            )
+        frame_count = export_trace(
+            trace_path,
+            args.output,
+            args.ops_per_frame,
+            args.width,
+            args.height,
+            args.fps,
+            args.jobs,
+        )
+    finally:
+        if not args.trace:
+            os.remove(trace_path)
+    print(f"Wrote {frame_count:,} frames to {args.output}", file=sys.stderr)
+    return 0
@@ -2,12 +2,11 @@
 how an array is sorted
 """
 
-from configparser import ConfigParser
-from os import path
+from math import ceil, log
 from random import randint
-from time import time
+from time import perf_counter
 from tkinter import BOTH, END, Canvas, messagebox
-from typing import List
+from typing import List, Optional, Sequence
 
 from customtkinter import (
     CTk,
@@ -19,27 +18,64 @@ from customtkinter import (
     CTkLabel,
     CTkOptionMenu,
     CTkSegmentedButton,
+    CTkSlider,
     CTkToplevel,
+    ScalingTracker,
     set_appearance_mode,
     set_default_color_theme,
     set_widget_scaling,
 )
-from PIL import Image
+from PIL import ImageTk
 
+from sorting_vis.algorithms import Algorithms
 from sorting_vis.constants import (
+    ACTIVE_BAR_FILL,
+    ACTIVE_BAR_OUTLINE,
     ASSETS_PATH,
     AVAILABLE_SORTING_FUNCTIONS,
+    BAR_FILL,
+    BAR_OUTLINE,
+    CANVAS_BACKGROUND,
     CONFIG_PATH,
+    ESTIMATE_MAXIMUM_SAMPLES,
+    ESTIMATE_SAMPLES,
+    ESTIMATE_TIMEOUT,
     LOWER_SAMPLE_BOUND_PLACEHOLDER,
     MAXIMUM_ARRAY_SAMPLES,
     MAXIMUM_ARRAY_VALUE,
+    MAXIMUM_BAR_SAMPLES,
+    MAXIMUM_OPS_PER_FRAME,
+    MAXIMUM_SEEK_RECORDING,
     MINIMUM_ARRAY_SAMPLES,
     MINIMUM_ARRAY_VALUE,
+    RECORD_AHEAD_OPS_PER_FRAME,
     SAMPLE_COUNT_PLACEHOLDER,
+    SORTED_BAR_FILL,
+    SORTED_BAR_OUTLINE,
+    TARGET_FPS,
     UPPER_SAMPLE_BOUND_PLACEHOLDER,
 )
-
-cfg = ConfigParser()
+from sorting_vis.counters import (
+    CountsHistory,
+    InstrumentedList,
+    OperationCounts,
+    count_swaps,
+)
+from sorting_vis.distributions import DISTRIBUTIONS, generate
+from sorting_vis.estimator import SortingTimeEstimator
+from sorting_vis.images import load_image
+from sorting_vis.operations import MARK, STAGE, Operation, apply_operation
+from sorting_vis.producer import OperationProducer
+from sorting_vis.raster import (
+    BAR,
+    BAR_COLOURS,
+    FAILED_BAR,
+    SORTED_BAR,
+    WORKER_BARS,
+    RasterColumns,
+)
+from sorting_vis.settings import Settings
+from sorting_vis.trace import KEYFRAME_INTERVAL, Trace
 
 
 class Home(CTk):
@@ -59,27 +95,28 @@ class Home(CTk):
         self.screen_width = self.winfo_screenwidth()
         self.screen_height = self.winfo_screenheight()
         self.validate_command = self.register(Home._validate_entry)
+        self.estimator = SortingTimeEstimator(
+            ESTIMATE_SAMPLES,
+            ESTIMATE_TIMEOUT,
+            maximum_size=ESTIMATE_MAXIMUM_SAMPLES,
+        )
+        self.settings = Settings(CONFIG_PATH)
 
         self._make_content()
         self._place_content()
-        self._update_entries_from_cfg_data()
+        self._update_entries_from_settings()
 
-    @staticmethod
-    def _update_config(cfg, sec, opt, val):
-        cfg.read(CONFIG_PATH)
-        cfg[sec][opt] = str(val)
-
-        with open(CONFIG_PATH, "w") as f:
-            cfg.write(f)
+    def _save_entry(self, name: str, entry: CTkEntry) -> None:
+        self.settings.set(name, int(entry.get() or 0))
 
-    def _update_entries_from_cfg_data(self):
+    def _update_entries_from_settings(self):
         entries = [
-            cfg.get("main", "lsb"),
-            cfg.get("main", "usb"),
-            cfg.get("main", "sc"),
+            self.settings.get("lsb"),
+            self.settings.get("usb"),
+            self.settings.get("sc"),
         ]
         for i in range(len(entries)):
-            val = int(entries[i])
+            val = entries[i]
             if not val:
                 continue
             if i == 0:
@@ -108,9 +145,17 @@ class Home(CTk):
 
     def _handle_exit(self) -> None:
         if hasattr(self, "array_visualiser"):
-            self.array_visualiser.sorter.paused = True
+            self.array_visualiser.currently_sorting = False
+        self.settings.close()
         self.destroy()
 
+    def _load_image(self, name: str, width: int, height: int) -> CTkImage:
+        # Load the asset at the size CTkImage scales it to, so that it can be
+        # served from the cache without any resizing.
+        scaling = ScalingTracker.get_widget_scaling(self)
+        size = (round(width * scaling), round(height * scaling))
+        return CTkImage(load_image(name, size), size=(width, height))
+
     def _make_content(self) -> None:
         self.l_title = CTkLabel(
             self,
@@ -118,27 +163,13 @@ class Home(CTk):
             font=self.title_font,
         )
         self.img_sorting = CTkLabel(
-            self,
-            text="",
-            image=CTkImage(
-                Image.open(path.join(ASSETS_PATH, "sorting_vis.png")),
-                size=(300, 150),
-            ),
+            self, text="", image=self._load_image("sorting_vis.png", 300, 150)
         )
         self.img_bluemoji_1 = CTkLabel(
-            self,
-            text="",
-            image=CTkImage(
-                Image.open(path.join(ASSETS_PATH, "gasp.png")), size=(100, 100)
-            ),
+            self, text="", image=self._load_image("gasp.png", 100, 100)
         )
         self.img_bluemoji_2 = CTkLabel(
-            self,
-            text="",
-            image=CTkImage(
-                Image.open(path.join(ASSETS_PATH, "thumbs_up.png")),
-                size=(100, 100),
-            ),
+            self, text="", image=self._load_image("thumbs_up.png", 100, 100)
         )
 
         self.opts_algorithm = CTkOptionMenu(
@@ -148,12 +179,11 @@ class Home(CTk):
                 for func in AVAILABLE_SORTING_FUNCTIONS
             ],
             font=self.default_font,
-            command=lambda algo: self._update_config(
-                cfg, "main", "algo", algo.replace(" ", "_")
+            command=lambda algo: self.settings.set(
+                "algo", algo.replace(" ", "_")
             ),
         )
-        cfg.read(CONFIG_PATH)
-        self.opts_algorithm.set(cfg.get("main", "algo").replace("_", " "))
+        self.opts_algorithm.set(self.settings.get("algo").replace("_", " "))
         self.l_algorithm = CTkLabel(
             self, text="Algorithm", font=self.default_font
         )
@@ -167,9 +197,7 @@ class Home(CTk):
         )
         self.e_lower_bound.bind(
             "<KeyRelease>",
-            lambda _: Home._update_config(
-                cfg, "main", "lsb", self.e_lower_bound.get()
-            ),
+            lambda _: self._save_entry("lsb", self.e_lower_bound),
         )
 
         self.e_upper_bound = CTkEntry(
@@ -181,9 +209,7 @@ class Home(CTk):
         )
         self.e_upper_bound.bind(
             "<KeyRelease>",
-            lambda _: Home._update_config(
-                cfg, "main", "usb", self.e_upper_bound.get()
-            ),
+            lambda _: self._save_entry("usb", self.e_upper_bound),
         )
 
         self.l_lower_bound = CTkLabel(
@@ -201,9 +227,7 @@ class Home(CTk):
         )
         self.e_sample_count.bind(
             "<KeyRelease>",
-            lambda _: Home._update_config(
-                cfg, "main", "sc", self.e_sample_count.get()
-            ),
+            lambda _: self._save_entry("sc", self.e_sample_count),
         )
 
         self.l_sample_count = CTkLabel(
@@ -305,8 +329,8 @@ class Home(CTk):
         self.e_upper_bound.focus()
         self.e_sample_count.focus()
         self.focus()
-        for sec in ["lsb", "usb", "sc"]:
-            Home._update_config(cfg, "main", sec, "0")
+        for name in ["lsb", "usb", "sc"]:
+            self.settings.set(name, 0)
 
     def _randomly_fill_entries(self) -> None:
         self._clear_entries()
@@ -318,20 +342,20 @@ class Home(CTk):
             f"{randint(int(self.e_lower_bound.get()) + 1, MAXIMUM_ARRAY_VALUE)}",
         )
         self.e_sample_count.insert(
-            0, f"{randint(MINIMUM_ARRAY_SAMPLES, MAXIMUM_ARRAY_SAMPLES)}"
+            0, f"{randint(MINIMUM_ARRAY_SAMPLES, MAXIMUM_BAR_SAMPLES)}"
         )
-        Home._update_config(cfg, "main", "lsb", self.e_lower_bound.get())
-        Home._update_config(cfg, "main", "usb", self.e_upper_bound.get())
-        Home._update_config(cfg, "main", "sc", self.e_sample_count.get())
+        self._save_entry("lsb", self.e_lower_bound)
+        self._save_entry("usb", self.e_upper_bound)
+        self._save_entry("sc", self.e_sample_count)
 
     def _fill_max_entries(self) -> None:
         self._clear_entries()
         self.e_lower_bound.insert(0, MINIMUM_ARRAY_VALUE)
         self.e_upper_bound.insert(0, MAXIMUM_ARRAY_VALUE)
         self.e_sample_count.insert(0, MAXIMUM_ARRAY_SAMPLES)
-        Home._update_config(cfg, "main", "lsb", MINIMUM_ARRAY_VALUE)
-        Home._update_config(cfg, "main", "usb", MAXIMUM_ARRAY_VALUE)
-        Home._update_config(cfg, "main", "sc", MAXIMUM_ARRAY_SAMPLES)
+        self.settings.set("lsb", MINIMUM_ARRAY_VALUE)
+        self.settings.set("usb", MAXIMUM_ARRAY_VALUE)
+        self.settings.set("sc", MAXIMUM_ARRAY_SAMPLES)
 
 
 class ArrayVisualiser(CTkToplevel):
@@ -360,24 +384,30 @@ class ArrayVisualiser(CTkToplevel):
         self.algorithm = algorithm
         self.parsed_algorithm = "_".join(self.algorithm.casefold().split(" "))
 
+        self.render_checking_complete = master.settings.get("check")
+        self.check_frames = master.settings.get("check_frames")
+        self.ops_per_frame = master.settings.get("speed")
+        self.distribution = master.settings.get("distribution")
+        self.seed = master.settings.get("seed")
+        self.currently_sorting = False
+        self.producer = None
+        self.trace = None
+        self.step = 0
+        # The pending frame of the sort, of its check or of recording ahead
+        self.sort_job = None
+        self.estimate_job = None
+
         self._make_content()
         self._place_content()
         self._init_arr()
 
-        from sorting_vis.algorithms import Algorithms
-
-        self.sorter = Algorithms(self)
-        cfg.read(CONFIG_PATH)
-        setattr(
-            self.sorter,
-            "render_checking_complete",
-            bool(int(cfg.get("main", "check"))),
-        )
-        self.currently_sorting = False
-
     def _handle_exit(self) -> None:
         if self.currently_sorting:
             self.b_toggle_sort.invoke()
+        self._cancel_sort_job()
+        self._cancel_producer()
+        if self.estimate_job is not None:
+            self.estimate_job.cancel()
         self.master.after(10, self.destroy)
         del self.master.array_visualiser
 
@@ -386,14 +416,14 @@ class ArrayVisualiser(CTkToplevel):
         self.b_init_sort = CTkButton(
             self.frame,
             text="Start",
-            command=lambda: self._init_sort(self.arr),
+            command=self._init_sort,
             state="disabled",
             font=self.master.large_button_font,
         )
         self.b_new_arr = CTkButton(
             self.frame,
             text="New",
-            command=self._init_arr,
+            command=self._new_arr,
             font=self.master.large_button_font,
         )
         self.b_toggle_sort = CTkButton(
@@ -421,22 +451,60 @@ class ArrayVisualiser(CTkToplevel):
             command=self._toggle_checking,
         )
         self.sb_toggle_checking.set(
-            {"0": "Off", "1": "On"}[cfg.get("main", "check")]
+            "On" if self.render_checking_complete else "Off"
         )
         for button in self.sb_toggle_checking._buttons_dict.values():
             button.configure(width=self.master.winfo_screenwidth() * 0.09 / 2)
 
+        self.l_distribution = CTkLabel(
+            self, font=self.master.default_font, text="Distribution"
+        )
+        self.opts_distribution = CTkOptionMenu(
+            self,
+            values=[
+                " ".join(name.split("_")).title() for name in DISTRIBUTIONS
+            ],
+            font=self.master.default_font,
+            command=self._set_distribution,
+        )
+        self.opts_distribution.set(
+            " ".join(self.distribution.split("_")).title()
+        )
+        self.l_seed = CTkLabel(self, font=self.master.default_font)
+
+        self.l_counts = CTkLabel(self, font=self.master.default_font)
+        self.l_speed = CTkLabel(self, font=self.master.default_font)
+        self.s_speed = CTkSlider(
+            self,
+            from_=0,
+            to=1,
+            command=self._set_speed,
+        )
+        # The slider is logarithmic so that the low end still gives fine
+        # control while the high end reaches thousands of ops per frame.
+        self.s_speed.set(log(self.ops_per_frame, MAXIMUM_OPS_PER_FRAME))
+        self._update_speed_label()
+
+        self.l_timeline = CTkLabel(self, font=self.master.default_font)
+        self.s_timeline = CTkSlider(
+            self, from_=0, to=1, command=self._seek, state="disabled"
+        )
+
         self.arr_canvas = Canvas(
             self.frame,
             width=self.master.screen_width - 60,
             height=self.master.screen_height * 0.9 - 60,
-            background="#2d4485",
+            background=CANVAS_BACKGROUND,
         )
         self.canvas_width = self.arr_canvas.winfo_reqwidth() - 10
         self.canvas_height = self.arr_canvas.winfo_reqheight() - 21
 
     def _place_content(self):
         self.frame.pack(fill=BOTH, expand=True)
+        self.l_distribution.place(relx=0.18, rely=0.9, anchor="c")
+        self.opts_distribution.place(
+            relx=0.18, rely=0.93725, relheight=0.05, relwidth=0.11, anchor="c"
+        )
         self.l_checking.place(relx=0.30, rely=0.9, anchor="c")
         self.sb_toggle_checking.place(
             relx=0.30, rely=0.93725, relheight=0.05, relwidth=0.09, anchor="c"
@@ -453,125 +521,465 @@ class ArrayVisualiser(CTkToplevel):
         self.b_exit.place(
             relx=0.70, rely=0.93725, relheight=0.05, relwidth=0.09, anchor="c"
         )
+        self.l_counts.place(relx=0.5, rely=0.015, anchor="c")
+        self.l_speed.place(relx=0.82, rely=0.9, anchor="c")
+        self.s_speed.place(relx=0.82, rely=0.93725, relwidth=0.12, anchor="c")
+        self.l_timeline.place(relx=0.27, rely=0.985, anchor="c")
+        self.s_timeline.place(relx=0.5, rely=0.985, relwidth=0.4, anchor="c")
+        self.l_seed.place(relx=0.75, rely=0.985, anchor="c")
         self.arr_canvas.pack(padx=30, pady=(30, 78))
 
     def _toggle_checking(self, choice) -> None:
-        if choice == "On":
-            val = 1
-        else:
-            val = 0
-        Home._update_config(cfg, "main", "check", val)
-        setattr(self.sorter, "render_checking_complete", val)
+        self.render_checking_complete = choice == "On"
+        self.master.settings.set("check", self.render_checking_complete)
+
+    def _set_distribution(self, choice: str) -> None:
+        self.distribution = "_".join(choice.casefold().split(" "))
+        self.master.settings.set("distribution", self.distribution)
+        self._init_arr()
+
+    def _set_speed(self, value: float) -> None:
+        self.ops_per_frame = round(MAXIMUM_OPS_PER_FRAME**value)
+        self._update_speed_label()
+        self.master.settings.set("speed", self.ops_per_frame)
+
+    def _update_speed_label(self) -> None:
+        self.l_speed.configure(text=f"Speed: {self.ops_per_frame} ops/frame")
 
     def _estimate_sorting_time(self) -> None:
+        if self.estimate_job is not None:
+            self.estimate_job.cancel()
+
         if self.parsed_algorithm == "bogo_sort":
-            return "a long time... probably"
+            self.estimate_job = None
+        else:
+            # The array is fully determined by how it was generated
+            self.estimate_job = self.master.estimator.submit(
+                self.parsed_algorithm,
+                self.arr,
+                (
+                    self.distribution,
+                    self.seed,
+                    self.arr_length,
+                    self.lowerbound,
+                    self.upperbound,
+                ),
+            )
 
-        from sorting_vis.bare_algorithms import BareAlgorithms
+    def _describe_sorting_time(self) -> str:
+        if self.estimate_job is None:
+            return "a long time... probably"
 
-        start = time()
-        getattr(BareAlgorithms, self.parsed_algorithm)(
-            [*self.arr], self.arr_length
-        )
-        end = time()
+        estimate = self.estimate_job.poll()
+        if estimate is None:
+            return "an unknown time (still estimating)"
+        return str(estimate)
 
-        return end - start
+    def _new_arr(self) -> None:
+        self.seed += 1
+        self.master.settings.set("seed", self.seed)
+        self._init_arr()
 
     def _init_arr(self) -> None:
         self.currently_sorting = False
+        self._cancel_producer()
+        self.trace = None
+        self.step = 0
+        self._cancel_sort_job()
         self.b_toggle_sort.configure(state="disabled", text="Pause")
         self.b_init_sort.configure(state="normal")
 
-        self.arr = [
-            randint(self.lowerbound, self.upperbound)
-            for _ in range(self.samplecount)
-        ]
+        self.arr = generate(
+            self.distribution,
+            self.samplecount,
+            self.lowerbound,
+            self.upperbound,
+            self.seed,
+        )
         self.arr_length = len(self.arr)
         self.minval = min(self.arr)
         self.maxval = max(self.arr)
         self.range = self.maxval - self.minval
 
         self.bar_width = self.canvas_width / self.arr_length
+        self.raster = self.arr_length > MAXIMUM_BAR_SAMPLES
+        # The resting colour of each bar, set by the worker tags of the
+        # parallel algorithms
+        self.owners = [BAR] * self.arr_length
+        self.tagged = False
+        self.staged = False
 
-        self.sorting_time = self._estimate_sorting_time()
+        self._estimate_sorting_time()
 
-        self._render_arr(self.arr)
+        self.counts = OperationCounts()
+        self.l_counts.configure(text=str(self.counts))
+        self.l_seed.configure(text=f"Seed: {self.seed}")
+        self.s_timeline.set(0)
+        self.s_timeline.configure(state="disabled")
+        self.l_timeline.configure(text="")
 
-    def _init_sort(self, arr: List[int]) -> None:
+        self._draw_bars()
+
+    def _init_sort(self) -> None:
         self.currently_sorting = True
-        self.sorter.paused = False
         self.b_toggle_sort.configure(state="normal")
         self.b_init_sort.configure(state="disabled")
         self.b_new_arr.configure(state="disabled")
 
-        getattr(self.sorter, self.parsed_algorithm)(arr)
+        # The algorithm sorts its own copy on the producer thread; the
+        # displayed array only changes by replaying the recorded operations,
+        # which is what lets the timeline seek backwards.
+        # The counts are ahead of the drawn step, so they are shown from
+        # the snapshots taken as the operations were produced.
+        self.counts_history = CountsHistory(self.counts)
+        self.producer = OperationProducer(
+            self.counts_history.record(
+                count_swaps(
+                    getattr(Algorithms, self.parsed_algorithm)(
+                        InstrumentedList([*self.arr], self.counts),
+                        self.arr_length,
+                    ),
+                    self.counts,
+                )
+            )
+        )
+        # Full snapshots of large arrays are expensive, so take them no more
+        # often than once per array length's worth of operations; seeking
+        # still only replays one keyframe interval.
+        self.trace = Trace(self.arr, KEYFRAME_INTERVAL, self.arr_length)
+        self.step = 0
+        self.s_timeline.configure(state="normal")
+        self._run_sort()
+
+    def _next_operation(self) -> Optional[Operation]:
+        """Return the next operation to draw, or ``None`` if the sort has
+        finished (``self.producer`` is ``None``) or hasn't computed it yet.
+        """
+        if self.step == len(self.trace) and self.producer is not None:
+            if not self.producer.drain_into(self.trace, self.ops_per_frame):
+                self.producer = None
+        if self.step == len(self.trace):
+            return None
+
+        op = self.trace.operation(self.step)
+        self.step += 1
+        apply_operation(self.arr, op)
+        if op.kind == MARK and op.value:
+            self._set_owner(op.index, op.value)
+        return op
+
+    def _set_owner(self, index: int, tag: int) -> None:
+        colour = WORKER_BARS[(tag - 1) % len(WORKER_BARS)]
+        self.tagged = True
+        self.owners[index] = colour
+        if self.raster:
+            self.columns.set_base(index, colour)
+
+    def _replay_owners(self) -> None:
+        # Ownership is only recorded by MARK operations, so after seeking it
+        # has to be replayed from the start of the trace.
+        self.owners = [BAR] * self.arr_length
+        if self.raster:
+            self.columns.bases = [BAR] * self.columns.columns
+        if not self.tagged:
+            return
+
+        ops = self.trace.ops
+        for i in range(0, self.step * 3, 3):
+            if ops[i] == MARK and ops[i + 2]:
+                self._set_owner(ops[i + 1], ops[i + 2])
+
+    def _run_sort(self) -> None:
+        # The producer stops computing once its buffer is full, so pausing
+        # only has to stop scheduling frames.
+        self.sort_job = None
+        if not self.currently_sorting:
+            return
+
+        frame_start = perf_counter()
+        dirty_indices = set()
+        # Sorting networks announce their stages, and are drawn a whole
+        # stage per frame regardless of the speed.
+        op_count = 0
+        while self.staged or op_count < self.ops_per_frame:
+            op = self._next_operation()
+            if op is None and self.producer is None:
+                self._render_arr(self.arr, tuple(dirty_indices))
+                self._update_progress()
+                self._on_sort_finish()
+                return
+            if op is None:
+                # Drawing has caught up with the sort, so show what there is
+                break
+            if op.kind == STAGE:
+                self.staged = True
+                if op_count:
+                    break
+                continue
+            dirty_indices.update(op.indices)
+            op_count += 1
+
+        self._render_arr(self.arr, tuple(dirty_indices))
+        self._update_progress()
+        elapsed = int((perf_counter() - frame_start) * 1000)
+        self.sort_job = self.after(
+            max(1, 1000 // TARGET_FPS - elapsed), self._run_sort
+        )
+
+    def _update_progress(self) -> None:
+        if self.producer is None and self.step == len(self.trace):
+            # Includes whatever the algorithm did after its last operation
+            counts = self.counts
+        else:
+            counts = self.counts_history.at(self.step)
+        self.l_counts.configure(text=str(counts))
+        self.s_timeline.configure(to=max(1, len(self.trace)))
+        self.s_timeline.set(self.step)
+        self.l_timeline.configure(
+            text=f"Step: {self.step:,} / {len(self.trace):,}"
+        )
+
+    def _seek(self, value: float) -> None:
+        if self.currently_sorting:
+            self._toggle_sort()
+
+        # The slider only spans the recorded operations
+        self.step = min(round(value), len(self.trace))
+        self.arr[:] = self.trace.state_at(self.step)
+        self._replay_owners()
+        self._reset_bars()
+        self._update_progress()
+        self.b_toggle_sort.configure(text="Resume", state="normal")
+        self.b_new_arr.configure(state="normal")
+        if self.sort_job is None:
+            self.sort_job = self.after(1000 // TARGET_FPS, self._record_ahead)
+
+    def _record_ahead(self) -> None:
+        # While paused, the rest of the run is recorded without drawing it
+        # and the timeline grows to cover it. Only what the producer has
+        # already buffered is taken, so a frame never waits on the sort.
+        self.sort_job = None
+        if self.producer is None or self.currently_sorting:
+            return
+
+        limit = min(
+            RECORD_AHEAD_OPS_PER_FRAME,
+            self.step + MAXIMUM_SEEK_RECORDING - len(self.trace),
+        )
+        if limit <= 0:
+            return
+        if not self.producer.drain_into(self.trace, limit):
+            self.producer = None
+        self._update_progress()
+        if self.producer is not None:
+            self.sort_job = self.after(1000 // TARGET_FPS, self._record_ahead)
+
+    def _cancel_producer(self) -> None:
+        if self.producer is not None:
+            self.producer.cancel()
+            self.producer = None
+
+    def _cancel_sort_job(self) -> None:
+        if self.sort_job is not None:
+            self.after_cancel(self.sort_job)
+            self.sort_job = None
+
+    def _on_sort_finish(self) -> None:
+        if self.render_checking_complete:
+            self.b_toggle_sort.configure(state="disabled")
+            self.check_step = ceil(self.arr_length / self.check_frames)
+            self._run_check(0)
+        else:
+            self._render_arr(self.arr, complete=True)
+            self._show_sorting_time()
+
+    def _show_sorting_time(self) -> None:
+        messagebox.showinfo(
+            "Info",
+            f"{self.algorithm} took {self._describe_sorting_time()}",
+        )
+
+    def _run_check(self, start: int) -> None:
+        # Verifying and colouring the bars in the same sweep stops it at the
+        # first inversion, and spreading it over check_frames frames keeps
+        # its length independent of the array size.
+        self.sort_job = None
+        stop = min(start + self.check_step, self.arr_length)
+        for i in range(max(start, 1), stop):
+            if self.arr[i - 1] > self.arr[i]:
+                self._recolour_bars(start, i - 1, SORTED_BAR)
+                self._recolour_bars(i - 1, i + 1, FAILED_BAR)
+                self._end_sort()
+                messagebox.showerror(
+                    "Error", "Array could not be sorted properly."
+                )
+                return
+
+        self._recolour_bars(start, stop, SORTED_BAR)
+        if stop == self.arr_length:
+            self._render_arr(self.arr, complete=True)
+            self._show_sorting_time()
+        else:
+            self.sort_job = self.after(
+                1000 // TARGET_FPS, self._run_check, stop
+            )
 
     def _toggle_sort(self) -> None:
         if self.currently_sorting:
-            self.sorter.paused = True
             self.currently_sorting = False
+            self._cancel_sort_job()
             self.b_toggle_sort.configure(text="Resume", state="normal")
             self.b_new_arr.configure(state="normal")
+            self._record_ahead()
         else:
-            self.sorter.paused = False
             self.currently_sorting = True
+            self._cancel_sort_job()
             self.b_toggle_sort.configure(text="Pause", state="normal")
             self.b_new_arr.configure(state="disabled")
-            self._init_sort(self.sorter.paused_arr)
+            self._run_sort()
+
+    def _draw_bars(self) -> None:
+        self.arr_canvas.delete("columns")
+        self.highlighted_indices = ()
+        if self.raster:
+            self.columns = RasterColumns(
+                self.arr,
+                int(self.canvas_width),
+                int(self.canvas_height),
+                self.minval,
+                self.maxval,
+            )
+            self.photo = ImageTk.PhotoImage(self.columns.image)
+            self.columns.take_dirty_box()
+            self.arr_canvas.create_image(
+                3, 0, anchor="nw", image=self.photo, tags="columns"
+            )
+            return
+
+        # One long-lived rectangle per index; later renders only move and
+        # recolour the bars that an operation touched.
+        self.bar_tops = [
+            self.canvas_height * (1 - (value - self.minval) / self.range)
+            for value in range(self.minval, self.maxval + 1)
+        ]
+        self.bars = [
+            self.arr_canvas.create_rectangle(
+                i * self.bar_width + 3,
+                self.bar_tops[item - self.minval],
+                i * self.bar_width + 3 + self.bar_width,
+                self.canvas_height,
+                fill=BAR_FILL,
+                outline=BAR_OUTLINE,
+                tags="columns",
+            )
+            for i, item in enumerate(self.arr)
+        ]
+
+    def _reset_bars(self) -> None:
+        self.highlighted_indices = ()
+        if self.raster:
+            self.columns.draw_all(self.arr)
+            self._paste_raster()
+            return
+
+        for i, item in enumerate(self.arr):
+            x1 = i * self.bar_width + 3
+            self.arr_canvas.coords(
+                self.bars[i],
+                x1,
+                self.bar_tops[item - self.minval],
+                x1 + self.bar_width,
+                self.canvas_height,
+            )
+        self.arr_canvas.itemconfigure(
+            "columns", fill=BAR_FILL, outline=BAR_OUTLINE
+        )
+        for i, colour in enumerate(self.owners):
+            if colour != BAR:
+                fill, outline = BAR_COLOURS[colour]
+                self.arr_canvas.itemconfigure(
+                    self.bars[i], fill=fill, outline=outline
+                )
 
     def _render_arr(
         self,
         arr: List[int],
-        sorting_indices: List[int] = [],
-        green_up_to: int = 0,
+        sorting_indices: Sequence[int] = (),
         complete: bool = False,
-        fail: bool = False,
     ) -> None:
-        self.arr_canvas.delete("columns")
+        if self.raster:
+            self._render_raster(arr, sorting_indices, complete)
+            return
 
-        for i, item in enumerate(arr):
+        for i in self.highlighted_indices:
+            fill, outline = BAR_COLOURS[self.owners[i]]
+            self.arr_canvas.itemconfigure(
+                self.bars[i], fill=fill, outline=outline
+            )
+
+        for i in sorting_indices:
             x1 = i * self.bar_width + 3
-            y1 = self.canvas_height * (1 - (item - self.minval) / self.range)
-            x2 = x1 + self.bar_width
-            y2 = self.canvas_height
-
-            if not fail:
-                if green_up_to > 0 and i <= green_up_to:
-                    fill = "#28b842"
-                    outline = "#229937"
-                elif not complete:
-                    fill = "#eb3f3f" if i in sorting_indices else "#aebac2"
-                    outline = "#eb6e6e" if i in sorting_indices else "#c7cdd1"
-                else:
-                    fill = "#28b842"
-                    outline = "#229937"
-            else:
-                fill = "#ed3b4d"
-                outline = "#590911"
+            self.arr_canvas.coords(
+                self.bars[i],
+                x1,
+                self.bar_tops[arr[i] - self.minval],
+                x1 + self.bar_width,
+                self.canvas_height,
+            )
+            self.arr_canvas.itemconfigure(
+                self.bars[i], fill=ACTIVE_BAR_FILL, outline=ACTIVE_BAR_OUTLINE
+            )
+        self.highlighted_indices = sorting_indices
 
-            self.arr_canvas.create_rectangle(
-                x1, y1, x2, y2, fill=fill, outline=outline, tags="columns"
+        if complete:
+            self.arr_canvas.itemconfigure(
+                "columns", fill=SORTED_BAR_FILL, outline=SORTED_BAR_OUTLINE
             )
+            self._end_sort()
 
+    def _render_raster(
+        self, arr: List[int], sorting_indices: Sequence[int], complete: bool
+    ) -> None:
         if complete:
-            self.currently_sorting = False
-            self.b_toggle_sort.configure(state="disabled")
-            self.b_new_arr.configure(state="normal")
+            self.columns.draw_all(arr, SORTED_BAR)
+        else:
+            self.columns.update(arr, sorting_indices)
+        self._paste_raster()
 
-        self.update()
+        if complete:
+            self._end_sort()
 
-    def _render_checking_complete(self, arr: List[int]) -> bool:
-        if all(arr[i] <= arr[i + 1] for i in range(self.arr_length - 1)):
-            for i in range(self.arr_length):
-                self._render_arr(arr, green_up_to=i)
-            self._render_arr(arr, complete=True)
-            return True
-        else:
-            self._render_arr(arr, fail=True, complete=True)
-            messagebox.showerror(
-                "Error", "Array could not be sorted properly."
+    def _paste_raster(self) -> None:
+        # Only the columns redrawn since the last paste are copied into the
+        # displayed photo, through a photo of just their size.
+        box = self.columns.take_dirty_box()
+        if box is None:
+            return
+        if box[2] - box[0] == self.columns.width:
+            self.photo.paste(self.columns.image)
+            return
+        region = ImageTk.PhotoImage(self.columns.image.crop(box))
+        self.photo.tk.call(
+            str(self.photo), "copy", str(region), "-to", box[0], box[1]
+        )
+
+    def _recolour_bars(self, start: int, stop: int, colour: int) -> None:
+        if self.raster:
+            self.columns.recolour(self.arr, start, stop, colour)
+            self._paste_raster()
+            return
+
+        fill, outline = BAR_COLOURS[colour]
+        for i in range(start, stop):
+            self.arr_canvas.itemconfigure(
+                self.bars[i], fill=fill, outline=outline
             )
-            return False
+
+    def _end_sort(self) -> None:
+        self.highlighted_indices = ()
+        self.currently_sorting = False
+        self.b_toggle_sort.configure(state="disabled")
+        self.b_new_arr.configure(state="normal")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""Image assets cached at the size they are displayed at
+
+Decoding the full-size PNGs and resizing them was a large part of building
+the home screen, so scaled copies are saved once and reused until the
+original asset changes.
+"""
+
+from pathlib import Path
+from typing import Tuple
+
+from PIL import Image
+
+from sorting_vis.constants import ASSET_CACHE_PATH, ASSETS_PATH
+
+
+def load_image(name: str, size: Tuple[int, int]) -> Image.Image:
+    source = ASSETS_PATH / name
+    cached = ASSET_CACHE_PATH / f"{Path(name).stem}-{size[0]}x{size[1]}.png"
+    try:
+        if cached.stat().st_mtime >= source.stat().st_mtime:
+            image = Image.open(cached)
+            image.load()
+            return image
+    except OSError:
+        pass
+
+    image = Image.open(source).resize(size, Image.LANCZOS)
+    try:
+        ASSET_CACHE_PATH.mkdir(exist_ok=True)
+        temp_path = cached.with_suffix(".tmp")
+        image.save(temp_path, format="PNG")
+        temp_path.replace(cached)
+    except OSError:
+        # e.g. a read-only installation, which just goes without the cache
+        pass
+    return image
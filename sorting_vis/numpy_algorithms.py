@@ -0,0 +1,224 @@
+"""Vectorised NumPy kernels for the algorithms that can be expressed as
+whole-array passes. NumPy is an optional dependency, so this module should
+only be imported through ``sorting_vis.backends``.
+"""
+
+import numpy as np
+
+
+def _compare_exchange(
+    arr: np.ndarray, low: np.ndarray, high: np.ndarray
+) -> bool:
+    """Order every pair ``(arr[low], arr[high])`` at once. The index sets
+    must be disjoint. Returns whether anything moved.
+    """
+    left = arr[low]
+    right = arr[high]
+    if not (left > right).any():
+        return False
+    arr[low] = np.minimum(left, right)
+    arr[high] = np.maximum(left, right)
+    return True
+
+
+class NumpyAlgorithms:
+    @staticmethod
+    def odd_even_sort(arr: np.ndarray, length: int) -> None:
+        is_sorted = False
+
+        while not is_sorted:
+            is_sorted = True
+
+            for start in (1, 0):
+                left = arr[start : length - 1 : 2]
+                right = arr[start + 1 : length : 2]
+                if (left > right).any():
+                    left[:], right[:] = (
+                        np.minimum(left, right),
+                        np.maximum(left, right),
+                    )
+                    is_sorted = False
+
+    @staticmethod
+    def bitonic_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        # Padding to a power of two with the maximum lets every stage be a
+        # single compare-exchange between two strided views of a reshape.
+        size = 1 << max(0, length - 1).bit_length()
+        padded = np.full(size, arr.max(), dtype=arr.dtype)
+        padded[:length] = arr
+
+        block = 2
+        while block <= size:
+            halves = padded.reshape(-1, 2, block // 2)
+            low, high = halves[:, 0], halves[:, 1, ::-1]
+            low[:], high[:] = np.minimum(low, high), np.maximum(low, high)
+
+            distance = block // 4
+            while distance:
+                halves = padded.reshape(-1, 2, distance)
+                low, high = halves[:, 0], halves[:, 1]
+                low[:], high[:] = (
+                    np.minimum(low, high),
+                    np.maximum(low, high),
+                )
+                distance //= 2
+            block *= 2
+
+        arr[:] = padded[:length]
+
+    @staticmethod
+    def odd_even_merge_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        size = 1 << max(0, length - 1).bit_length()
+        padded = np.full(size, arr.max(), dtype=arr.dtype)
+        padded[:length] = arr
+
+        p = 1
+        while p < size:
+            blocks = padded.reshape(-1, 2 * p)
+            halves = blocks.reshape(-1, 2, p)
+            low, high = halves[:, 0], halves[:, 1]
+            low[:], high[:] = np.minimum(low, high), np.maximum(low, high)
+
+            # Within every block of 2p, the runs of k from offset k onwards
+            # are compared with the run that follows them.
+            k = p // 2
+            while k:
+                runs = blocks[:, k : 2 * p - k].reshape(len(blocks), -1, 2, k)
+                low, high = runs[:, :, 0], runs[:, :, 1]
+                low[:], high[:] = (
+                    np.minimum(low, high),
+                    np.maximum(low, high),
+                )
+                k //= 2
+            p *= 2
+
+        arr[:] = padded[:length]
+
+    @staticmethod
+    def comb_sort(arr: np.ndarray, length: int) -> None:
+        gap = length
+        shrink_factor = 1.3
+        swapped = True
+
+        while gap > 1 or swapped:
+            gap = int(gap / shrink_factor)
+            if gap < 1:
+                gap = 1
+
+            # Pairs (i, i + gap) whose i lies in an even block of ``gap``
+            # elements are disjoint, as are the ones in odd blocks, so each
+            # half of the pass is a single compare-exchange.
+            indices = np.arange(length - gap)
+            even_blocks = (indices // gap) % 2 == 0
+            swapped = False
+            for low in (indices[even_blocks], indices[~even_blocks]):
+                if _compare_exchange(arr, low, low + gap):
+                    swapped = True
+
+    @staticmethod
+    def shell_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        gap = length // 2
+        padding = arr.max()
+
+        while gap > 0:
+            # Lay the gap-interleaved subsequences out as the columns of a
+            # matrix and sort every column at once with row-wise
+            # compare-exchange phases.
+            rows = -(-length // gap)
+            grid = np.full(rows * gap, padding, dtype=arr.dtype)
+            grid[:length] = arr
+            grid = grid.reshape(rows, gap)
+
+            is_sorted = False
+            while not is_sorted:
+                is_sorted = True
+                for start in (0, 1):
+                    top = grid[start : rows - 1 : 2]
+                    bottom = grid[start + 1 : rows : 2]
+                    if (top > bottom).any():
+                        top[:], bottom[:] = (
+                            np.minimum(top, bottom),
+                            np.maximum(top, bottom),
+                        )
+                        is_sorted = False
+
+            arr[:] = grid.ravel()[:length]
+            gap //= 2
+
+    @staticmethod
+    def merge_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        # Merges the ranks of the values rather than the values, so that the
+        # keys below stay under length ** 2 however far apart the values are
+        values, ranks = np.unique(arr, return_inverse=True)
+        span = len(values)
+        indices = np.arange(length)
+        output = np.empty_like(ranks)
+        width = 1
+
+        while width < length:
+            # Merge every pair of adjacent runs in one pass. Tagging each
+            # value with its block number keeps the concatenated runs sorted,
+            # so one searchsorted per side finds every element's position in
+            # the opposite run.
+            block = indices // (2 * width)
+            offset_in_block = indices % (2 * width)
+            in_right = offset_in_block >= width
+            keys = block * span + ranks
+
+            left_keys = keys[~in_right]
+            right_keys = keys[in_right]
+            left_block = block[~in_right]
+            right_block = block[in_right]
+
+            left_dest = (
+                left_block * 2 * width
+                + offset_in_block[~in_right]
+                + np.searchsorted(right_keys, left_keys, side="left")
+                - np.searchsorted(right_keys, left_block * span, side="left")
+            )
+            right_dest = (
+                right_block * 2 * width
+                + offset_in_block[in_right]
+                - width
+                + np.searchsorted(left_keys, right_keys, side="right")
+                - np.searchsorted(left_keys, right_block * span, side="left")
+            )
+
+            output[left_dest] = ranks[~in_right]
+            output[right_dest] = ranks[in_right]
+            ranks, output = output, ranks
+            width *= 2
+
+        arr[:] = values[ranks]
+
+    @staticmethod
+    def radix_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        max_value = arr.max()
+        exp = 1
+
+        while max_value // exp > 0:
+            # A stable sort of the digits keeps the order of the previous
+            # passes among equal digits, like the counting sort's scatter.
+            arr[:] = arr[np.argsort((arr // exp) % 10, kind="stable")]
+            exp *= 10
+
+    @staticmethod
+    def pigeonhole_sort(arr: np.ndarray, length: int) -> None:
+        if length < 2:
+            return
+        min_value = arr.min()
+        holes = np.bincount(arr - min_value)
+        arr[:] = np.repeat(
+            np.arange(min_value, min_value + len(holes), dtype=arr.dtype),
+            holes,
+        )
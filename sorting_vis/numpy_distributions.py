@@ -0,0 +1,87 @@
+"""Vectorised NumPy versions of the input distributions. NumPy is an optional
+dependency, so this module should only be imported through
+``sorting_vis.distributions``.
+"""
+
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from sorting_vis.distributions import (
+    SAWTOOTH_TEETH,
+    few_unique_values,
+    nearly_sorted_swaps,
+)
+
+
+def _random(rng: np.random.Generator, n: int, lower: int, upper: int):
+    return rng.integers(lower, upper, n, dtype=np.int64, endpoint=True)
+
+
+def _sorted(rng: np.random.Generator, n: int, lower: int, upper: int):
+    return np.sort(_random(rng, n, lower, upper))
+
+
+def _reversed(rng: np.random.Generator, n: int, lower: int, upper: int):
+    return _sorted(rng, n, lower, upper)[::-1]
+
+
+def _nearly_sorted(rng: np.random.Generator, n: int, lower: int, upper: int):
+    arr = _sorted(rng, n, lower, upper)
+    # Distinct positions, so that the swaps can be made all at once
+    swaps = min(nearly_sorted_swaps(n), n // 2)
+    left, right = rng.choice(n, 2 * swaps, replace=False).reshape(2, swaps)
+    arr[left], arr[right] = arr[right], arr[left]
+    return arr
+
+
+def _few_unique(rng: np.random.Generator, n: int, lower: int, upper: int):
+    values = np.array(few_unique_values(lower, upper), dtype=np.int64)
+    return values[rng.integers(0, len(values), n)]
+
+
+def _sawtooth(rng: np.random.Generator, n: int, lower: int, upper: int):
+    tooth = -(-n // SAWTOOTH_TEETH)
+    return lower + (upper - lower) * (
+        np.arange(n, dtype=np.int64) % tooth
+    ) // max(1, tooth - 1)
+
+
+def _organ_pipe(rng: np.random.Generator, n: int, lower: int, upper: int):
+    arr = _sorted(rng, n, lower, upper)
+    return np.concatenate((arr[::2], arr[1::2][::-1]))
+
+
+def _gaussian(rng: np.random.Generator, n: int, lower: int, upper: int):
+    values = rng.normal((lower + upper) / 2, (upper - lower) / 6, n)
+    return np.clip(np.rint(values), lower, upper).astype(np.int64)
+
+
+def _partitioned(rng: np.random.Generator, n: int, lower: int, upper: int):
+    arr = _random(rng, n, lower, upper)
+    pivot = np.partition(arr, n // 2)[n // 2] if n else 0
+    return np.concatenate(
+        (arr[arr < pivot], arr[arr == pivot], arr[arr > pivot])
+    )
+
+
+NUMPY_DISTRIBUTIONS: Dict[
+    str, Callable[[np.random.Generator, int, int, int], np.ndarray]
+] = {
+    "random": _random,
+    "sorted": _sorted,
+    "reversed": _reversed,
+    "nearly_sorted": _nearly_sorted,
+    "few_unique": _few_unique,
+    "sawtooth": _sawtooth,
+    "organ_pipe": _organ_pipe,
+    "gaussian": _gaussian,
+    "partitioned": _partitioned,
+}
+
+
+def generate_numpy(
+    distribution: str, n: int, lower: int, upper: int, seed: int
+) -> List[int]:
+    rng = np.random.default_rng(seed)
+    return NUMPY_DISTRIBUTIONS[distribution](rng, n, lower, upper).tolist()
@@ -0,0 +1,43 @@
+"""Operation events yielded by the step-by-step sorting algorithms"""
+
+from typing import MutableSequence, NamedTuple, Tuple
+
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+MARK = 3
+STAGE = 4
+
+
+class Operation(NamedTuple):
+    """A single step of a sorting algorithm.
+
+    ``COMPARE`` and ``SWAP`` operations store a second array index in
+    ``value``, ``WRITE`` operations store the value written to ``index`` and
+    ``MARK`` operations store a tag (``0`` for a plain highlight, or one
+    more than the id of the worker that now owns ``index`` in the parallel
+    algorithms). ``STAGE`` operations touch no index and mark the start of a
+    stage of a sorting network, whose compare-exchanges are independent of
+    each other. A ``COMPARE`` of an index with itself compares it with a
+    value the algorithm holds outside the array.
+    """
+
+    kind: int
+    index: int
+    value: int = 0
+
+    @property
+    def indices(self) -> Tuple[int, ...]:
+        if self.kind == COMPARE or self.kind == SWAP:
+            return (self.index, self.value)
+        if self.kind == STAGE:
+            return ()
+        return (self.index,)
+
+
+def apply_operation(arr: MutableSequence[int], op: Operation) -> None:
+    """Replay ``op`` on ``arr``; only swaps and writes change the array."""
+    if op.kind == SWAP:
+        arr[op.index], arr[op.value] = arr[op.value], arr[op.index]
+    elif op.kind == WRITE:
+        arr[op.index] = op.value
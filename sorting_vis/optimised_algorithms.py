@@ -0,0 +1,113 @@
+"""Allocation-free kernels for the bare algorithms whose reference versions
+allocate inside their loops.
+
+They sort exactly like their ``BareAlgorithms`` counterparts, but merge
+through one preallocated buffer, find maxima without copying and reuse their
+counting buffers. Their inner loops only touch local names already, so
+nothing is gained by binding lookups to locals. Like the reference kernels
+they only index, iterate and measure ``arr``, so they can be counted on an
+``InstrumentedList`` as well.
+"""
+
+from itertools import islice
+from typing import List
+
+
+class OptimisedAlgorithms:
+    @staticmethod
+    def merge_sort(arr: List[int], length: int) -> None:
+        # Each call sorts dst[low:high] using src, which holds the same
+        # values there, as scratch: the halves are sorted into src with the
+        # roles swapped, then merged straight back into dst. One copy of the
+        # array is all the memory the whole sort needs.
+        def sort(src, dst, low, high):
+            if high - low < 2:
+                return
+
+            mid = (low + high) // 2
+            sort(dst, src, low, mid)
+            sort(dst, src, mid, high)
+
+            i = low
+            j = mid
+            k = low
+            left = src[i]
+            right = src[j]
+            while True:
+                if left <= right:
+                    dst[k] = left
+                    k += 1
+                    i += 1
+                    if i == mid:
+                        break
+                    left = src[i]
+                else:
+                    dst[k] = right
+                    k += 1
+                    j += 1
+                    if j == high:
+                        break
+                    right = src[j]
+
+            while i < mid:
+                dst[k] = src[i]
+                k += 1
+                i += 1
+            while j < high:
+                dst[k] = src[j]
+                k += 1
+                j += 1
+
+        sort(arr[:length], arr, 0, length)
+
+    @staticmethod
+    def radix_sort(arr: List[int], length: int) -> None:
+        if not length:
+            return
+
+        # Alternates between arr and one buffer instead of copying every
+        # digit's pass back, with a single count table
+        max_value = max(arr)
+        count = [0] * 10
+        src = arr
+        dst = [0] * length
+        exp = 1
+
+        while max_value // exp > 0:
+            count[:] = (0,) * 10
+            for value in src:
+                count[value // exp % 10] += 1
+
+            total = 0
+            for digit in range(10):
+                total += count[digit]
+                count[digit] = total
+
+            for value in reversed(src):
+                digit = value // exp % 10
+                count[digit] -= 1
+                dst[count[digit]] = value
+
+            src, dst = dst, src
+            exp *= 10
+
+        if src is not arr:
+            for i in range(length):
+                arr[i] = src[i]
+
+    @staticmethod
+    def pancake_sort(arr: List[int], length: int) -> None:
+        def flip(arr, k):
+            left = 0
+            while left < k:
+                arr[left], arr[k] = arr[k], arr[left]
+                left += 1
+                k -= 1
+
+        for size in range(length, 1, -1):
+            # The maximum of the prefix is found without copying it, and
+            # its first occurrence is always inside the prefix
+            max_index = arr.index(max(islice(arr, size)))
+            if max_index != size - 1:
+                flip(arr, max_index)
+                flip(arr, size - 1)
@@ -0,0 +1,251 @@
+"""Multi-process kernels for the parallel algorithms of ``BareAlgorithms``
+
+The array is copied once into shared memory and split into one contiguous
+chunk per worker. The workers of a process pool, kept alive between sorts,
+sort (or classify and scatter) their own slice of the shared buffer in place,
+so only slice bounds are ever pickled. Arrays shorter than
+``PARALLEL_THRESHOLD`` are not worth the round trips and are sorted serially.
+"""
+
+import heapq
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from random import Random
+from typing import List, MutableSequence, Optional, Sequence
+
+from sorting_vis.bare_algorithms import BareAlgorithms
+
+PARALLEL_ALGORITHMS = ["parallel_merge_sort", "sample_sort"]
+PARALLEL_THRESHOLD = 10_000
+OVERSAMPLING = 16  # sampled elements per splitter
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def available_workers() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def terminate_pool() -> None:
+    """Kill the workers of the pool, if there is one, abandoning whatever
+    they are sorting.
+    """
+    global _pool, _pool_workers
+
+    if _pool is None:
+        return
+    for process in list(_pool._processes.values()):
+        process.terminate()
+    _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_workers = 0
+
+
+def _share(arr: Sequence[int]) -> SharedMemory:
+    data = array("q", arr).tobytes()
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    return shm
+
+
+def _chunk_bounds(length: int, chunks: int) -> List[int]:
+    return [length * k // chunks for k in range(chunks + 1)]
+
+
+def _sort_slice(name: str, start: int, stop: int) -> None:
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("q")
+        data = view[start:stop].tolist()
+        BareAlgorithms.merge_sort(data, len(data))
+        view[start:stop] = array("q", data)
+        view.release()
+    finally:
+        shm.close()
+
+
+def _count_buckets(
+    name: str, start: int, stop: int, splitters: List[int]
+) -> List[int]:
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("q")
+        counts = [0] * (len(splitters) + 1)
+        for value in view[start:stop]:
+            counts[bisect_right(splitters, value)] += 1
+        view.release()
+    finally:
+        shm.close()
+    return counts
+
+
+def _scatter(
+    source_name: str,
+    dest_name: str,
+    start: int,
+    stop: int,
+    splitters: List[int],
+    offsets: List[int],
+) -> None:
+    """Move ``source[start:stop]`` into the buckets of ``dest``, starting
+    each bucket at this chunk's offset into it.
+    """
+    source = SharedMemory(name=source_name)
+    dest = SharedMemory(name=dest_name)
+    try:
+        source_view = source.buf.cast("q")
+        dest_view = dest.buf.cast("q")
+        for value in source_view[start:stop]:
+            bucket = bisect_right(splitters, value)
+            dest_view[offsets[bucket]] = value
+            offsets[bucket] += 1
+        source_view.release()
+        dest_view.release()
+    finally:
+        source.close()
+        dest.close()
+
+
+def _copy_back(
+    arr: MutableSequence[int], shm: SharedMemory, length: int
+) -> None:
+    view = shm.buf.cast("q")
+    for i, value in enumerate(view[:length]):
+        arr[i] = value
+    view.release()
+
+
+def parallel_merge_sort(
+    arr: MutableSequence[int], length: int, workers: Optional[int] = None
+) -> None:
+    """Merge sort one chunk per worker, then k-way merge the sorted chunks
+    in this process.
+    """
+    workers = workers or available_workers()
+    if length < PARALLEL_THRESHOLD or workers < 2:
+        BareAlgorithms.merge_sort(arr, length)
+        return
+
+    bounds = _chunk_bounds(length, workers)
+    shm = _share(arr)
+    try:
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_sort_slice, shm.name, bounds[w], bounds[w + 1])
+            for w in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+        view = shm.buf.cast("q")
+        runs = [
+            view[bounds[w] : bounds[w + 1]].tolist() for w in range(workers)
+        ]
+        view.release()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    for i, value in enumerate(heapq.merge(*runs)):
+        arr[i] = value
+
+
+def sample_sort(
+    arr: MutableSequence[int], length: int, workers: Optional[int] = None
+) -> None:
+    """Split the values into one bucket per worker around splitters drawn
+    from a sorted sample, have every worker scatter its chunk into the
+    buckets, then sort the buckets in parallel.
+    """
+    workers = workers or available_workers()
+    if length < PARALLEL_THRESHOLD or workers < 2:
+        BareAlgorithms.merge_sort(arr, length)
+        return
+
+    # Seeded by the length so that repeated runs split the same way
+    rng = Random(length)
+    sample = sorted(
+        arr[i]
+        for i in rng.sample(range(length), min(length, workers * OVERSAMPLING))
+    )
+    splitters = [sample[len(sample) * k // workers] for k in range(1, workers)]
+
+    bounds = _chunk_bounds(length, workers)
+    source = _share(arr)
+    dest = SharedMemory(create=True, size=source.size)
+    try:
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(
+                _count_buckets,
+                source.name,
+                bounds[w],
+                bounds[w + 1],
+                splitters,
+            )
+            for w in range(workers)
+        ]
+        counts = [future.result() for future in futures]
+
+        # Bucket b starts after every smaller bucket, and within it chunk w
+        # starts after the elements that chunks 0..w-1 send to it.
+        bucket_starts = [0]
+        for b in range(workers):
+            bucket_starts.append(
+                bucket_starts[-1] + sum(chunk[b] for chunk in counts)
+            )
+        offsets = []
+        for w in range(workers):
+            offsets.append(
+                [
+                    bucket_starts[b] + sum(chunk[b] for chunk in counts[:w])
+                    for b in range(workers)
+                ]
+            )
+
+        futures = [
+            pool.submit(
+                _scatter,
+                source.name,
+                dest.name,
+                bounds[w],
+                bounds[w + 1],
+                splitters,
+                offsets[w],
+            )
+            for w in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+        futures = [
+            pool.submit(
+                _sort_slice, dest.name, bucket_starts[b], bucket_starts[b + 1]
+            )
+            for b in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+        _copy_back(arr, dest, length)
+    finally:
+        for shm in (source, dest):
+            shm.close()
+            shm.unlink()
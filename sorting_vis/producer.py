@@ -0,0 +1,150 @@
+"""Runs a step-by-step algorithm ahead of the gui in a background thread.
+
+The producer thread pulls operations from the generator and pushes them, in
+batches, into a bounded ring buffer. When the buffer is full the producer
+blocks until the gui has drained some of it, so a sort never gets more than
+the buffer's capacity ahead of what has been drawn. The gui only ever drains
+the buffer from its frame callback, and never waits on the algorithm.
+"""
+
+from array import array
+from threading import Condition, Thread
+from typing import Iterator, List, Optional
+
+from sorting_vis.operations import Operation
+from sorting_vis.trace import Trace
+
+BUFFER_CAPACITY = 1 << 16
+# Operations the producer collects before taking the buffer's lock, unless
+# the gui is already waiting for them
+PRODUCER_BATCH = 256
+
+
+class OperationBuffer:
+    """A bounded ring buffer of operations, stored as flat ``array('I')``
+    ``(kind, index, value)`` triples, between one producer thread and one
+    consumer thread.
+    """
+
+    def __init__(self, capacity: int = BUFFER_CAPACITY) -> None:
+        self.capacity = capacity
+        self.slots = array("I", bytes(capacity * 3 * 4))
+        # Operations ever written and read; their difference is the fill
+        self.written = 0
+        self.read = 0
+        self.finished = False
+        self.cancelled = False
+        self.starved = False
+        self.condition = Condition()
+
+    def __len__(self) -> int:
+        return self.written - self.read
+
+    def put(self, ops: List[Operation]) -> bool:
+        """Append ``ops`` (at most ``capacity`` of them), blocking while the
+        buffer is too full. Returns ``False`` if the consumer cancelled.
+        """
+        with self.condition:
+            while (
+                self.written - self.read + len(ops) > self.capacity
+                and not self.cancelled
+            ):
+                self.condition.wait()
+            if self.cancelled:
+                return False
+
+            slots = self.slots
+            i = self.written % self.capacity * 3
+            for kind, index, value in ops:
+                slots[i] = kind
+                slots[i + 1] = index
+                slots[i + 2] = value
+                i = (i + 3) % len(slots)
+            self.written += len(ops)
+            self.starved = False
+            self.condition.notify_all()
+        return True
+
+    def finish(self) -> None:
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+    def cancel(self) -> None:
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify_all()
+
+    def drain_into(
+        self, trace: Trace, limit: Optional[int] = None, wait: bool = False
+    ) -> bool:
+        """Move up to ``limit`` buffered operations into ``trace``. With
+        ``wait``, first block until there is at least one or the producer
+        has finished. Returns ``False`` once the producer has finished and
+        every operation has been moved.
+        """
+        with self.condition:
+            while wait and not len(self) and not self.finished:
+                self.starved = True
+                self.condition.wait()
+
+            count = len(self) if limit is None else min(limit, len(self))
+            slots = self.slots
+            i = self.read % self.capacity * 3
+            for _ in range(count):
+                trace.append(Operation(slots[i], slots[i + 1], slots[i + 2]))
+                i = (i + 3) % len(slots)
+            self.read += count
+            # An empty buffer makes the producer hand over its partial batch
+            self.starved = not count and not self.finished
+            self.condition.notify_all()
+            return not (self.finished and not len(self))
+
+
+class OperationProducer:
+    """Exhausts ``steps`` on a daemon thread into an ``OperationBuffer``."""
+
+    def __init__(
+        self,
+        steps: Iterator[Operation],
+        capacity: int = BUFFER_CAPACITY,
+    ) -> None:
+        self.buffer = OperationBuffer(capacity)
+        self.error: Optional[BaseException] = None
+        self.thread = Thread(target=self._produce, args=(steps,), daemon=True)
+        self.thread.start()
+
+    def _produce(self, steps: Iterator[Operation]) -> None:
+        buffer = self.buffer
+        batch = []
+        try:
+            for op in steps:
+                batch.append(op)
+                if len(batch) >= PRODUCER_BATCH or buffer.starved:
+                    if not buffer.put(batch):
+                        return
+                    batch = []
+        except Exception as e:
+            self.error = e
+        finally:
+            # Hands over what the algorithm did before it finished or failed;
+            # a cancelled buffer refuses it straight away
+            buffer.put(batch)
+            buffer.finish()
+
+    def drain_into(
+        self, trace: Trace, limit: Optional[int] = None, wait: bool = False
+    ) -> bool:
+        """See ``OperationBuffer.drain_into``. An exception raised by the
+        algorithm is re-raised here once its operations have been drained.
+        """
+        more = self.buffer.drain_into(trace, limit, wait)
+        if not more and self.error is not None:
+            raise self.error
+        return more
+
+    def cancel(self) -> None:
+        """Stop the producer at its next batch. The thread is a daemon, so
+        it is left to finish the step it is on in the background.
+        """
+        self.buffer.cancel()
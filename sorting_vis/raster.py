@@ -0,0 +1,169 @@
+"""Rendering of arrays too large to draw as one canvas rectangle per element
+
+The elements are aggregated into pixel columns that are drawn into a single
+palette image, and each frame only redraws the columns whose elements were
+touched.
+"""
+
+from typing import Iterable, Optional, Sequence, Tuple
+
+from PIL import Image, ImageColor, ImageDraw
+
+from sorting_vis.constants import (
+    ACTIVE_BAR_FILL,
+    ACTIVE_BAR_OUTLINE,
+    BAR_FILL,
+    BAR_OUTLINE,
+    CANVAS_BACKGROUND,
+    FAILED_BAR_FILL,
+    FAILED_BAR_OUTLINE,
+    SORTED_BAR_FILL,
+    SORTED_BAR_OUTLINE,
+    WORKER_BAR_COLOURS,
+)
+
+BACKGROUND, BAR, ACTIVE_BAR, SORTED_BAR, FAILED_BAR = range(5)
+WORKER_BARS = list(range(5, 5 + len(WORKER_BAR_COLOURS)))
+BAR_COLOURS = {
+    BAR: (BAR_FILL, BAR_OUTLINE),
+    ACTIVE_BAR: (ACTIVE_BAR_FILL, ACTIVE_BAR_OUTLINE),
+    SORTED_BAR: (SORTED_BAR_FILL, SORTED_BAR_OUTLINE),
+    FAILED_BAR: (FAILED_BAR_FILL, FAILED_BAR_OUTLINE),
+    **dict(zip(WORKER_BARS, WORKER_BAR_COLOURS)),
+}
+# Bars of colour ``c`` use palette index ``2c - 1`` for their fill and ``2c``
+# for their outline.
+PALETTE = [*ImageColor.getrgb(CANVAS_BACKGROUND)] + [
+    channel
+    for colours in BAR_COLOURS.values()
+    for colour in colours
+    for channel in ImageColor.getrgb(colour)
+]
+
+
+class RasterColumns:
+    """An array drawn as at most ``width`` pixel columns.
+
+    Each column is filled up to the minimum of its elements, shows the range
+    up to their maximum in the outline colour and marks their mean with a
+    line in the fill colour.
+    """
+
+    def __init__(
+        self,
+        arr: Sequence[int],
+        width: int,
+        height: int,
+        minval: int,
+        maxval: int,
+    ) -> None:
+        self.length = len(arr)
+        self.width = width
+        self.height = height
+        self.columns = min(width, self.length)
+        # Column c holds the elements in [bounds[c], bounds[c + 1]).
+        self.bounds = [
+            -(-c * self.length // self.columns)
+            for c in range(self.columns + 1)
+        ]
+        self.minval = minval
+        self.range = maxval - minval or 1
+        self.colours = [BAR] * self.columns
+        # The colour each column returns to when it is not highlighted
+        self.bases = [BAR] * self.columns
+        self.highlighted = set()
+        # The first and last columns redrawn since the last take_dirty_box
+        self.dirty_low = self.columns
+        self.dirty_high = -1
+
+        self.image = Image.new("P", (width, height), BACKGROUND)
+        self.image.putpalette(PALETTE)
+        self.draw = ImageDraw.Draw(self.image)
+        self.draw_all(arr)
+
+    def column(self, index: int) -> int:
+        return index * self.columns // self.length
+
+    def _y(self, value: float) -> int:
+        return min(
+            int(self.height * (1 - (value - self.minval) / self.range)),
+            self.height - 1,
+        )
+
+    def _draw_column(self, arr: Sequence[int], c: int) -> None:
+        values = arr[self.bounds[c] : self.bounds[c + 1]]
+        x1 = c * self.width // self.columns
+        x2 = (c + 1) * self.width // self.columns - 1
+        bottom = self.height - 1
+        low = self._y(min(values))
+        high = self._y(max(values))
+        mean = self._y(sum(values) / len(values))
+        fill = self.colours[c] * 2 - 1
+
+        self.draw.rectangle((x1, 0, x2, bottom), fill=BACKGROUND)
+        self.draw.rectangle((x1, high, x2, low), fill=fill + 1)
+        self.draw.rectangle((x1, low, x2, bottom), fill=fill)
+        self.draw.line((x1, mean, x2, mean), fill=fill)
+        if c < self.dirty_low:
+            self.dirty_low = c
+        if c > self.dirty_high:
+            self.dirty_high = c
+
+    def take_dirty_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return the pixel box of every column redrawn since the last call,
+        or ``None`` if there are none.
+        """
+        if self.dirty_high < 0:
+            return None
+        box = (
+            self.dirty_low * self.width // self.columns,
+            0,
+            (self.dirty_high + 1) * self.width // self.columns,
+            self.height,
+        )
+        self.dirty_low = self.columns
+        self.dirty_high = -1
+        return box
+
+    def draw_all(
+        self, arr: Sequence[int], colour: Optional[int] = None
+    ) -> None:
+        """Redraw every column in ``colour``, or in its base colour."""
+        if colour is None:
+            self.colours = [*self.bases]
+        else:
+            self.colours = [colour] * self.columns
+        self.highlighted = set()
+        for c in range(self.columns):
+            self._draw_column(arr, c)
+
+    def recolour(
+        self, arr: Sequence[int], start: int, stop: int, colour: int
+    ) -> None:
+        """Redraw the columns holding indices ``[start, stop)`` in
+        ``colour``.
+        """
+        if start >= stop:
+            return
+        for c in range(self.column(start), self.column(stop - 1) + 1):
+            self.colours[c] = colour
+            self._draw_column(arr, c)
+
+    def set_base(self, index: int, colour: int) -> None:
+        """Make ``colour`` the base colour of the column holding ``index``;
+        it is drawn once the column is next redrawn.
+        """
+        self.bases[self.column(index)] = colour
+
+    def update(self, arr: Sequence[int], indices: Iterable[int]) -> None:
+        """Redraw the columns of ``indices`` highlighted, and restore the
+        columns that were highlighted by the previous update.
+        """
+        columns = {self.column(i) for i in indices}
+        for c in self.highlighted - columns:
+            self.colours[c] = self.bases[c]
+            self._draw_column(arr, c)
+        for c in columns:
+            self.colours[c] = ACTIVE_BAR
+            self._draw_column(arr, c)
+        self.highlighted = columns
@@ -0,0 +1,364 @@
+"""Performance regression checks against stored baselines, runnable with
+``python -m sorting_vis regress``
+
+``record`` times every (path, algorithm, size, distribution) case and stores
+the raw samples in a versioned results file. ``check`` reruns exactly the
+cases of that file and reports the ones whose samples are significantly
+slower (a one-sided Mann-Whitney U test) by more than a relative threshold,
+exiting with a non-zero status if there are any.
+
+Two paths are timed: ``bare``, the ``BareAlgorithms`` kernel, and ``steps``,
+the visualiser's path of pulling every operation from the ``Algorithms``
+generator, recording it and replaying it onto the displayed array. Cases
+run in this process rather than a pool, so that they don't compete for
+cores.
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser, Namespace
+from math import erfc, sqrt
+from statistics import median
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.bare_algorithms import BareAlgorithms
+from sorting_vis.benchmark import time_algorithm
+from sorting_vis.constants import (
+    AVAILABLE_SORTING_FUNCTIONS,
+    MAXIMUM_ARRAY_VALUE,
+    MINIMUM_ARRAY_VALUE,
+)
+from sorting_vis.counters import InstrumentedList
+from sorting_vis.distributions import DISTRIBUTIONS, generate
+from sorting_vis.operations import apply_operation
+from sorting_vis.trace import KEYFRAME_INTERVAL, Trace
+
+RESULTS_VERSION = 1
+PATHS = ["bare", "steps"]
+# Its running time is unbounded, so it can't have a baseline
+EXCLUDED_ALGORITHMS = ["bogo_sort"]
+DEFAULT_BASELINES = "baselines.json"
+DEFAULT_SIZES = [256]
+DEFAULT_REPEATS = 9
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_ALPHA = 0.01
+
+
+class Case(NamedTuple):
+    path: str
+    algorithm: str
+    size: int
+    distribution: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.path}/{self.algorithm} n={self.size} {self.distribution}"
+        )
+
+
+class Comparison(NamedTuple):
+    case: Case
+    baseline: float  # median seconds
+    current: float
+    change: float  # relative change of the median
+    p_value: float  # that the current samples are slower
+
+
+def mann_whitney_greater(sample: List[float], other: List[float]) -> float:
+    """One-sided p-value of the Mann-Whitney U test that values of
+    ``sample`` tend to be greater than those of ``other``.
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is adequate from around eight samples each.
+    """
+    n1, n2 = len(sample), len(other)
+    n = n1 + n2
+    combined = sorted(
+        [(value, 0) for value in sample] + [(value, 1) for value in other]
+    )
+
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        # Tied values share the mean of their ranks (1-based)
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(
+            1 for k in range(i, j + 1) if not combined[k][1]
+        )
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sqrt(variance)
+    return 0.5 * erfc(z / sqrt(2))
+
+
+def _steps_runner(algorithm: str) -> Callable[[List[int], int], None]:
+    def run(arr: List[int], length: int) -> None:
+        # What the visualiser does per operation, without the drawing
+        displayed = [*arr]
+        trace = Trace(displayed, KEYFRAME_INTERVAL, length)
+        steps = getattr(Algorithms, algorithm)(InstrumentedList(arr), length)
+        for op in steps:
+            trace.append(op)
+            apply_operation(displayed, op)
+
+    return run
+
+
+def _runner(path: str, algorithm: str) -> Callable[[List[int], int], None]:
+    if path == "bare":
+        return getattr(BareAlgorithms, algorithm)
+    return _steps_runner(algorithm)
+
+
+def time_cases(
+    cases: List[Case], repeats: int, seed: int, warmups: int = 1
+) -> Dict[Case, List[float]]:
+    """Time every case ``repeats`` times, one case after another in each
+    round, so that a slow spell of the machine is shared by all cases
+    instead of landing on a few of them.
+    """
+    runs = []
+    for case in cases:
+        arr = generate(
+            case.distribution,
+            case.size,
+            MINIMUM_ARRAY_VALUE,
+            MAXIMUM_ARRAY_VALUE,
+            seed,
+        )
+        func = _runner(case.path, case.algorithm)
+        time_algorithm(func, arr, warmups, 0)
+        runs.append((case, func, arr))
+
+    samples = {case: [] for case in cases}
+    for _ in range(repeats):
+        for case, func, arr in runs:
+            samples[case].extend(time_algorithm(func, arr, 0, 1))
+    return samples
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+    }
+
+
+def save_baselines(
+    path: str,
+    samples: Dict[Case, List[float]],
+    repeats: int,
+    seed: int,
+) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "version": RESULTS_VERSION,
+                "environment": environment(),
+                "repeats": repeats,
+                "seed": seed,
+                "cases": [
+                    {**case._asdict(), "samples": case_samples}
+                    for case, case_samples in samples.items()
+                ],
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def load_baselines(path: str) -> Tuple[dict, Dict[Case, List[float]]]:
+    """Return the results file's settings and its samples by case. Raises
+    ``ValueError`` for files of another version.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(
+            f"{path} has results version {data.get('version')}, expected "
+            f"{RESULTS_VERSION}; record new baselines"
+        )
+    samples = {}
+    for entry in data["cases"]:
+        case_samples = entry.pop("samples")
+        samples[Case(**entry)] = case_samples
+    return data, samples
+
+
+def compare(
+    baselines: Dict[Case, List[float]], current: Dict[Case, List[float]]
+) -> List[Comparison]:
+    comparisons = []
+    for case, baseline_samples in baselines.items():
+        if case not in current:
+            continue
+        baseline = median(baseline_samples)
+        current_median = median(current[case])
+        comparisons.append(
+            Comparison(
+                case,
+                baseline,
+                current_median,
+                current_median / baseline - 1,
+                mann_whitney_greater(current[case], baseline_samples),
+            )
+        )
+    return comparisons
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
+
+
+def format_report(
+    comparisons: List[Comparison],
+    threshold: float,
+    alpha: float,
+    verbose: bool = False,
+) -> Tuple[str, int]:
+    """Return a readable diff of ``comparisons`` and the number of
+    regressions in it.
+    """
+    lines = []
+    regressions = improvements = 0
+    for comparison in sorted(comparisons, key=lambda c: -c.change):
+        if comparison.change > threshold and comparison.p_value < alpha:
+            status = "- REGRESSED"
+            regressions += 1
+        elif (
+            # A p-value near 1 means the current samples are significantly
+            # faster
+            comparison.change < -threshold
+            and comparison.p_value > 1 - alpha
+        ):
+            status = "+ improved "
+            improvements += 1
+        elif verbose:
+            status = "  unchanged"
+        else:
+            continue
+        lines.append(
+            f"{status}  {comparison.case}: "
+            f"{_format_time(comparison.baseline)} -> "
+            f"{_format_time(comparison.current)} "
+            f"({comparison.change:+.1%}, p={comparison.p_value:.4f})"
+        )
+
+    unchanged = len(comparisons) - regressions - improvements
+    lines.append(
+        f"{regressions} regressed, {improvements} improved and {unchanged} "
+        f"unchanged of {len(comparisons)} cases (threshold {threshold:.0%}, "
+        f"alpha {alpha})"
+    )
+    return "\n".join(lines), regressions
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    actions = parser.add_subparsers(dest="action", required=True)
+
+    record = actions.add_parser("record", help="time the cases and store them")
+    record.add_argument(
+        "-a",
+        "--algorithms",
+        nargs="+",
+        choices=AVAILABLE_SORTING_FUNCTIONS,
+        metavar="ALGORITHM",
+        help="defaults to every algorithm with a bounded running time",
+    )
+    record.add_argument(
+        "-p", "--paths", nargs="+", choices=PATHS, default=PATHS
+    )
+    record.add_argument(
+        "-n", "--sizes", nargs="+", type=int, default=DEFAULT_SIZES
+    )
+    record.add_argument(
+        "-d",
+        "--distributions",
+        nargs="+",
+        choices=list(DISTRIBUTIONS),
+        default=["random"],
+    )
+    record.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("-o", "--output", default=DEFAULT_BASELINES)
+
+    check = actions.add_parser(
+        "check", help="rerun the stored cases and compare them"
+    )
+    check.add_argument("baselines", nargs="?", default=DEFAULT_BASELINES)
+    check.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown of the median that counts as a regression",
+    )
+    check.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help="significance level of the Mann-Whitney U test",
+    )
+    check.add_argument(
+        "-v", "--verbose", action="store_true", help="list unchanged cases"
+    )
+
+
+def run(args: Namespace) -> int:
+    if args.action == "record":
+        algorithms = args.algorithms or [
+            algorithm
+            for algorithm in AVAILABLE_SORTING_FUNCTIONS
+            if algorithm not in EXCLUDED_ALGORITHMS
+        ]
+        cases = [
+            Case(path, algorithm, size, distribution)
+            for path in args.paths
+            for algorithm in algorithms
+            for size in args.sizes
+            for distribution in args.distributions
+        ]
+        samples = time_cases(cases, args.repeats, args.seed)
+        save_baselines(args.output, samples, args.repeats, args.seed)
+        print(f"Recorded {len(cases)} cases to {args.output}", file=sys.stderr)
+        return 0
+
+    try:
+        settings, baselines = load_baselines(args.baselines)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read baselines: {e}", file=sys.stderr)
+        return 2
+    if settings["environment"] != environment():
+        print(
+            "Warning: the baselines were recorded in a different "
+            "environment, so timings may not be comparable",
+            file=sys.stderr,
+        )
+
+    current = time_cases(
+        list(baselines), settings["repeats"], settings["seed"]
+    )
+    report, regressions = format_report(
+        compare(baselines, current), args.threshold, args.alpha, args.verbose
+    )
+    print(report)
+    return 1 if regressions else 0
@@ -0,0 +1,184 @@
+"""An in-memory store for the settings in ``config.ini``
+
+Changing a setting never touches the disk directly: the store is marked
+dirty and saved once no further changes have been made for
+``SAVE_DELAY`` seconds, or when it is closed. Saves write a temporary file
+and rename it over the config, so a crash mid-write cannot corrupt it.
+"""
+
+import os
+import tempfile
+from argparse import ArgumentParser, Namespace
+from configparser import ConfigParser
+from pathlib import Path
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from sorting_vis.constants import (
+    AVAILABLE_SORTING_FUNCTIONS,
+    CONFIG_PATH,
+    DEFAULT_CHECK_FRAMES,
+    DEFAULT_OPS_PER_FRAME,
+    MAXIMUM_ARRAY_VALUE,
+    MAXIMUM_OPS_PER_FRAME,
+    MINIMUM_ARRAY_VALUE,
+)
+from sorting_vis.distributions import DISTRIBUTIONS
+
+SECTION = "main"
+SAVE_DELAY = 1.0
+
+
+class Field(NamedTuple):
+    type: Callable[[str], Any]
+    default: Any
+    validate: Callable[[Any], bool] = lambda value: True
+
+
+def _parse_bool(text: str) -> bool:
+    return bool(int(text))
+
+
+# lsb, usb and sc hold the home screen's entries, where 0 means empty.
+FIELDS: Dict[str, Field] = {
+    "check": Field(_parse_bool, True),
+    "check_frames": Field(int, DEFAULT_CHECK_FRAMES, lambda value: value > 0),
+    "algo": Field(
+        str,
+        "Bubble_Sort",
+        lambda value: value.casefold() in AVAILABLE_SORTING_FUNCTIONS,
+    ),
+    "lsb": Field(int, 0, lambda value: value >= 0),
+    "usb": Field(int, 0, lambda value: value >= 0),
+    "sc": Field(int, 0, lambda value: value >= 0),
+    "speed": Field(
+        int,
+        DEFAULT_OPS_PER_FRAME,
+        lambda value: 1 <= value <= MAXIMUM_OPS_PER_FRAME,
+    ),
+    "distribution": Field(str, "random", lambda value: value in DISTRIBUTIONS),
+    # The seed of the array currently shown by the visualiser
+    "seed": Field(int, 0, lambda value: value >= 0),
+}
+
+
+class Settings:
+    """Typed, validated settings backed by an ini file."""
+
+    def __init__(self, path: Path, save_delay: float = SAVE_DELAY) -> None:
+        self.path = Path(path)
+        self.save_delay = save_delay
+        self.values = {name: field.default for name, field in FIELDS.items()}
+        self.dirty = False
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+        self.load()
+
+    def load(self) -> None:
+        """Read the config file, keeping the defaults of missing or invalid
+        settings.
+        """
+        cfg = ConfigParser()
+        cfg.read(self.path)
+        if not cfg.has_section(SECTION):
+            return
+        for name, field in FIELDS.items():
+            text = cfg.get(SECTION, name, fallback=None)
+            try:
+                value = field.type(text)
+            except (TypeError, ValueError):
+                continue
+            if field.validate(value):
+                self.values[name] = value
+
+    def get(self, name: str) -> Any:
+        return self.values[name]
+
+    def set(self, name: str, value: Any) -> None:
+        field = FIELDS[name]
+        if not isinstance(value, type(field.default)) or not field.validate(
+            value
+        ):
+            raise ValueError(f"invalid value for setting {name!r}: {value!r}")
+        with self._lock:
+            if self.values[name] == value:
+                return
+            self.values[name] = value
+            self.dirty = True
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = Timer(self.save_delay, self.save)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.dirty:
+                return
+            cfg = ConfigParser()
+            cfg[SECTION] = {
+                name: str(int(value) if isinstance(value, bool) else value)
+                for name, value in self.values.items()
+            }
+            self.dirty = False
+
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=".config-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    cfg.write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                self.dirty = True
+                os.remove(temp_path)
+                raise
+
+    def close(self) -> None:
+        """Cancel any pending save and write outstanding changes now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.save()
+
+
+def add_input_arguments(parser: ArgumentParser) -> None:
+    """Add the ``--lower``, ``--upper`` and ``--seed`` options of the
+    commands that generate arrays. They default to the bounds and seed of
+    the gui's current array, so that it can be reproduced exactly.
+    """
+    settings = Settings(CONFIG_PATH)
+    parser.add_argument(
+        "--lower",
+        type=int,
+        default=settings.get("lsb") or MINIMUM_ARRAY_VALUE,
+        help="smallest value; defaults to the gui's lower bound",
+    )
+    parser.add_argument(
+        "--upper",
+        type=int,
+        default=settings.get("usb") or MAXIMUM_ARRAY_VALUE,
+        help="largest value; defaults to the gui's upper bound",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=settings.get("seed"),
+        help="defaults to the seed of the gui's current array",
+    )
+
+
+def check_input_arguments(parser: ArgumentParser, args: Namespace) -> None:
+    # The saved bounds are only checked when the gui opens its visualiser
+    if args.lower < 0:
+        parser.error(f"--lower must not be negative, not {args.lower}")
+    if args.lower > args.upper:
+        parser.error(
+            f"--lower ({args.lower}) must not be greater than --upper "
+            f"({args.upper})"
+        )
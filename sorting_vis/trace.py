@@ -0,0 +1,103 @@
+"""Compact recordings of sort runs that can be rebuilt at any step"""
+
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from sorting_vis.operations import SWAP, WRITE, Operation, apply_operation
+
+KEYFRAME_INTERVAL = 1024
+
+
+class Trace:
+    """The operations of a sort run stored as flat ``array('I')``
+    ``(kind, index, value)`` triples.
+
+    A keyframe is taken every ``keyframe_interval`` operations, so the state
+    at any step is rebuilt by replaying at most that many operations onto
+    the nearest earlier keyframe. Copying a long array at every keyframe
+    would take far more memory than the operations, so only one keyframe in
+    every ``snapshot_interval`` operations holds a full snapshot. The ones
+    in between only hold the indices changed since the previous keyframe
+    and their new values, which are applied onto the snapshot in turn.
+    """
+
+    def __init__(
+        self,
+        arr: List[int],
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        snapshot_interval: int = KEYFRAME_INTERVAL,
+    ) -> None:
+        self.keyframe_interval = keyframe_interval
+        # Keyframes per snapshot
+        self.snapshot_keyframes = max(
+            1, -(-snapshot_interval // keyframe_interval)
+        )
+        self.ops = array("I")
+        # snapshots[s] is the array after s * snapshot_keyframes keyframes
+        self.snapshots = [array("I", arr)]
+        # deltas[k] holds the changes made between keyframes k - 1 and k,
+        # or is None for the keyframes with a snapshot
+        self.deltas: List[Optional[Tuple[array, array]]] = [None]
+        self._state = array("I", arr)
+
+    def __len__(self) -> int:
+        return len(self.ops) // 3
+
+    def append(self, op: Operation) -> None:
+        length = len(self)
+        if length and not length % self.keyframe_interval:
+            self._take_keyframe(length)
+        self.ops.extend(op)
+        apply_operation(self._state, op)
+
+    def _take_keyframe(self, length: int) -> None:
+        if not len(self.deltas) % self.snapshot_keyframes:
+            self.snapshots.append(array("I", self._state))
+            self.deltas.append(None)
+            return
+
+        ops = self.ops
+        changed = set()
+        for i in range((length - self.keyframe_interval) * 3, length * 3, 3):
+            kind = ops[i]
+            if kind == SWAP:
+                changed.add(ops[i + 1])
+                changed.add(ops[i + 2])
+            elif kind == WRITE:
+                changed.add(ops[i + 1])
+        indices = array("I", changed)
+        self.deltas.append(
+            (indices, array("I", map(self._state.__getitem__, indices)))
+        )
+
+    def extend(
+        self, steps: Iterator[Operation], limit: Optional[int] = None
+    ) -> bool:
+        """Record operations from ``steps`` until it is exhausted (returning
+        ``True``) or ``limit`` operations have been recorded.
+        """
+        for count, op in enumerate(steps, 1):
+            self.append(op)
+            if count == limit:
+                return False
+        return True
+
+    def operation(self, step: int) -> Operation:
+        i = step * 3
+        return Operation(self.ops[i], self.ops[i + 1], self.ops[i + 2])
+
+    def state_at(self, step: int) -> array:
+        """Return a copy of the array after the first ``step`` operations."""
+        # The keyframe at the very end of the trace is only taken once the
+        # next operation is recorded.
+        keyframe = min(step // self.keyframe_interval, len(self.deltas) - 1)
+        snapshot = keyframe // self.snapshot_keyframes
+        state = array("I", self.snapshots[snapshot])
+        for delta in self.deltas[
+            snapshot * self.snapshot_keyframes + 1 : keyframe + 1
+        ]:
+            for index, value in zip(*delta):
+                state[index] = value
+        for i in range(keyframe * self.keyframe_interval, step):
+            apply_operation(state, self.operation(i))
+        return state
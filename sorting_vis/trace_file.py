@@ -0,0 +1,420 @@
+"""A versioned binary file format for recorded sort runs.
+
+Layout (all integers little-endian)::
+
+    header      HEADER struct, then the utf-8 algorithm and distribution
+                names
+    block 0     keyframe: the array as ``samplecount`` uint32s,
+                then up to ``keyframe_interval`` encoded operations
+    block 1     ...
+    table       ``keyframe_count`` uint64 file offsets of the blocks
+
+Each operation is a kind byte followed by zigzag varints: the index as a
+delta from the previous operation's index, then the second index of a
+compare/swap as a delta from the first, the value of a write as a delta from
+the previous write, or the tag of a mark. The deltas restart at every block,
+so decoding can begin at any keyframe. Files are read through ``mmap`` and
+decoded lazily, so large traces open instantly.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from argparse import ArgumentParser, Namespace
+from array import array
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.constants import (
+    AVAILABLE_SORTING_FUNCTIONS,
+    MAXIMUM_BAR_SAMPLES,
+)
+from sorting_vis.distributions import DISTRIBUTIONS, generate
+from sorting_vis.operations import (
+    COMPARE,
+    SWAP,
+    WRITE,
+    Operation,
+    apply_operation,
+)
+from sorting_vis.settings import add_input_arguments, check_input_arguments
+from sorting_vis.trace import KEYFRAME_INTERVAL
+
+MAGIC = b"SVTRACE\0"
+VERSION = 2
+# magic, version, algorithm name length, distribution name length, seed,
+# lowerbound, upperbound, samplecount, keyframe interval, op count, keyframe
+# count, table offset
+HEADER = struct.Struct("<8sHHHqIIIIQIQ")
+# Values, like the bounds in the header, are stored as uint32s
+MAXIMUM_VALUE = 2**32 - 1
+
+
+class TraceFormatError(Exception):
+    pass
+
+
+def _uint32_array(data: bytes) -> array:
+    arr = array("I")
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _uint32_bytes(arr: List[int]) -> bytes:
+    arr = array("I", arr)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    value = value << 1 if value >= 0 else (-value << 1) - 1
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+class TraceWriter:
+    """Streams operations to a trace file, keeping only the current array
+    and the block offsets in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        algorithm: str,
+        arr: List[int],
+        seed: int = -1,
+        lowerbound: int = 0,
+        upperbound: int = 0,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        distribution: str = "",
+    ) -> None:
+        self.path = path
+        self.algorithm = algorithm.encode()
+        self.distribution = distribution.encode()
+        self.seed = seed
+        self.lowerbound = lowerbound
+        self.upperbound = upperbound
+        self.keyframe_interval = keyframe_interval
+        self.state = [*arr]
+        self.op_count = 0
+        self.block_offsets: List[int] = []
+        self.buffer = bytearray()
+
+        # Packed first, so that a header that doesn't fit creates no file
+        header = self._header(0)
+        self.file: BinaryIO = open(path, "wb")
+        try:
+            self.file.write(header)
+            self._start_block()
+        except BaseException:
+            self.discard()
+            raise
+
+    def _header(self, table_offset: int) -> bytes:
+        return (
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(self.algorithm),
+                len(self.distribution),
+                self.seed,
+                self.lowerbound,
+                self.upperbound,
+                len(self.state),
+                self.keyframe_interval,
+                self.op_count,
+                len(self.block_offsets),
+                table_offset,
+            )
+            + self.algorithm
+            + self.distribution
+        )
+
+    def _start_block(self) -> None:
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.block_offsets.append(self.file.tell())
+        self.file.write(_uint32_bytes(self.state))
+        self.last_index = self.last_value = 0
+
+    def append(self, op: Operation) -> None:
+        if self.op_count and not self.op_count % self.keyframe_interval:
+            self._start_block()
+
+        kind, index, value = op
+        self.buffer.append(kind)
+        _write_varint(self.buffer, index - self.last_index)
+        if kind == COMPARE or kind == SWAP:
+            _write_varint(self.buffer, value - index)
+        elif kind == WRITE:
+            _write_varint(self.buffer, value - self.last_value)
+            self.last_value = value
+        else:
+            _write_varint(self.buffer, value)
+        self.last_index = index
+
+        apply_operation(self.state, op)
+        self.op_count += 1
+
+    def extend(self, steps: Iterator[Operation]) -> None:
+        for op in steps:
+            self.append(op)
+
+    def close(self) -> None:
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        table_offset = self.file.tell()
+        self.file.write(
+            struct.pack(f"<{len(self.block_offsets)}Q", *self.block_offsets)
+        )
+        self.file.seek(0)
+        self.file.write(self._header(table_offset))
+        self.file.close()
+
+    def discard(self) -> None:
+        """Close and delete the unfinished file."""
+        self.file.close()
+        os.remove(self.path)
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+class TraceFile:
+    """A memory-mapped trace file.
+
+    Offers the same ``len`` and ``state_at`` as an in-memory ``Trace``, and
+    streams operations from any step without loading the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            # mmap can't map an empty file
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise TraceFormatError(f"{path} is not a sorting_vis trace")
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            name_length,
+            distribution_length,
+            self.seed,
+            self.lowerbound,
+            self.upperbound,
+            self.samplecount,
+            self.keyframe_interval,
+            self.op_count,
+            self.keyframe_count,
+            table_offset,
+        ) = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC:
+            self.mmap.close()
+            raise TraceFormatError(f"{path} is not a sorting_vis trace")
+        if version != VERSION:
+            self.mmap.close()
+            raise TraceFormatError(
+                f"{path} uses trace format version {version}, "
+                f"expected {VERSION}"
+            )
+        if table_offset + 8 * self.keyframe_count > len(self.mmap):
+            self.mmap.close()
+            raise TraceFormatError(f"{path} is truncated")
+        names = HEADER.size + name_length
+        self.algorithm = self.mmap[HEADER.size : names].decode()
+        self.distribution = self.mmap[
+            names : names + distribution_length
+        ].decode()
+        self.block_offsets = struct.unpack_from(
+            f"<{self.keyframe_count}Q", self.mmap, table_offset
+        )
+        self.snapshot_size = self.samplecount * 4
+        self._cursor: Optional[Iterator[Operation]] = None
+        self._cursor_step = -1
+
+    def __len__(self) -> int:
+        return self.op_count
+
+    def keyframe(self, block: int) -> array:
+        offset = self.block_offsets[block]
+        return _uint32_array(self.mmap[offset : offset + self.snapshot_size])
+
+    def operations(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Operation]:
+        """Decode the operations in ``[start, stop)`` straight from the
+        mapped file.
+        """
+        stop = self.op_count if stop is None else min(stop, self.op_count)
+        data = self.mmap
+        step = start - start % self.keyframe_interval
+        block = step // self.keyframe_interval
+
+        while step < stop:
+            if not step % self.keyframe_interval:
+                pos = self.block_offsets[block] + self.snapshot_size
+                block += 1
+                last_index = last_value = 0
+
+            kind = data[pos]
+            pos += 1
+            numbers = []
+            for _ in range(2):
+                shift = result = 0
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    result |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                numbers.append(
+                    result >> 1 if not result & 1 else -((result + 1) >> 1)
+                )
+
+            index = last_index + numbers[0]
+            if kind == COMPARE or kind == SWAP:
+                value = index + numbers[1]
+            elif kind == WRITE:
+                value = last_value = last_value + numbers[1]
+            else:
+                value = numbers[1]
+            last_index = index
+
+            if step >= start:
+                yield Operation(kind, index, value)
+            step += 1
+
+    def operation(self, step: int) -> Operation:
+        # Playback reads consecutive steps, so keep decoding from where the
+        # last call stopped instead of restarting at the keyframe.
+        if step != self._cursor_step:
+            self._cursor = self.operations(step)
+        self._cursor_step = step + 1
+        return next(self._cursor)
+
+    def state_at(self, step: int) -> array:
+        """Return the array after the first ``step`` operations."""
+        block = min(step // self.keyframe_interval, self.keyframe_count - 1)
+        state = self.keyframe(block)
+        for op in self.operations(block * self.keyframe_interval, step):
+            apply_operation(state, op)
+        return state
+
+    def close(self) -> None:
+        self._cursor = None
+        self.mmap.close()
+
+    def __enter__(self) -> "TraceFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def record_trace(
+    path: str,
+    algorithm: str,
+    samplecount: int,
+    lowerbound: int,
+    upperbound: int,
+    seed: int,
+    keyframe_interval: int = KEYFRAME_INTERVAL,
+    max_operations: Optional[int] = None,
+    distribution: str = "random",
+) -> int:
+    """Generate a seeded array, sort it with the step-by-step algorithm and
+    write every operation to ``path``. Returns the number of operations.
+    """
+    arr = generate(distribution, samplecount, lowerbound, upperbound, seed)
+    steps = getattr(Algorithms, algorithm)([*arr], samplecount)
+
+    with TraceWriter(
+        path,
+        algorithm,
+        arr,
+        seed,
+        lowerbound,
+        upperbound,
+        keyframe_interval,
+        distribution,
+    ) as writer:
+        writer.extend(islice(steps, max_operations))
+    return writer.op_count
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument("algorithm", choices=AVAILABLE_SORTING_FUNCTIONS)
+    parser.add_argument("-o", "--output", help="defaults to ALGORITHM.svtrace")
+    parser.add_argument(
+        "-n", "--samples", type=int, default=MAXIMUM_BAR_SAMPLES
+    )
+    parser.add_argument(
+        "-d", "--distribution", choices=list(DISTRIBUTIONS), default="random"
+    )
+    add_input_arguments(parser)
+    parser.add_argument(
+        "--keyframe-interval", type=int, default=KEYFRAME_INTERVAL
+    )
+    parser.add_argument(
+        "--max-operations",
+        type=int,
+        help="stop recording after this many operations (e.g. for bogo_sort)",
+    )
+
+
+def check_recording_arguments(parser: ArgumentParser, args: Namespace) -> None:
+    """Check the options that ``record_trace`` is called with, before the
+    file is created.
+    """
+    check_input_arguments(parser, args)
+    if args.upper > MAXIMUM_VALUE:
+        parser.error(f"--upper must be at most {MAXIMUM_VALUE}")
+    if args.samples < 1:
+        parser.error(f"--samples must be positive, not {args.samples}")
+    if args.max_operations is not None and args.max_operations < 0:
+        parser.error(
+            f"--max-operations must not be negative, not "
+            f"{args.max_operations}"
+        )
+
+
+def check_arguments(parser: ArgumentParser, args: Namespace) -> None:
+    check_recording_arguments(parser, args)
+    if args.keyframe_interval < 1:
+        parser.error(
+            f"--keyframe-interval must be positive, not "
+            f"{args.keyframe_interval}"
+        )
+
+
+def run(args: Namespace) -> int:
+    output = args.output or f"{args.algorithm}.svtrace"
+    op_count = record_trace(
+        output,
+        args.algorithm,
+        args.samples,
+        args.lower,
+        args.upper,
+        args.seed,
+        args.keyframe_interval,
+        args.max_operations,
+        args.distribution,
+    )
+    print(
+        f"Wrote {op_count:,} operations (seed {args.seed}) to {output}",
+        file=sys.stderr,
+    )
+    return 0
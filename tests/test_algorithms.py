@@ -0,0 +1,95 @@
+import pytest
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.backends import BACKEND_NAMES, get_backend, sorting_functions
+from sorting_vis.constants import AVAILABLE_SORTING_FUNCTIONS
+from sorting_vis.distributions import generate
+from sorting_vis.parallel import (
+    PARALLEL_THRESHOLD,
+    parallel_merge_sort,
+    sample_sort,
+)
+from sorting_vis.trace import Trace
+
+INPUTS = {
+    "empty": [],
+    "single": [500],
+    "all_equal": [42] * 37,
+    "sorted": list(range(10, 74)),
+    "reversed": list(range(74, 10, -1)),
+    "random": generate("random", 65, 10, 1000, 1),
+    "few_unique": generate("few_unique", 63, 10, 1000, 2),
+}
+# bogo_sort only finishes on the shortest inputs
+BOGO_LENGTH = 5
+
+
+def _input(algorithm, shape):
+    arr = INPUTS[shape]
+    return arr[:BOGO_LENGTH] if algorithm == "bogo_sort" else [*arr]
+
+
+def _backend_cases():
+    for name in BACKEND_NAMES:
+        try:
+            backend = get_backend(name)
+        except ImportError as e:
+            yield pytest.param(name, None, marks=pytest.mark.skip(str(e)))
+            continue
+        for algorithm in sorting_functions(backend):
+            yield pytest.param(name, algorithm)
+
+
+@pytest.mark.parametrize("shape", list(INPUTS))
+@pytest.mark.parametrize("backend_name, algorithm", list(_backend_cases()))
+def test_backends_sort(backend_name, algorithm, shape):
+    backend = get_backend(backend_name)
+    arr = _input(algorithm, shape)
+    converted = backend.convert(arr)
+
+    getattr(backend.algorithms, algorithm)(converted, len(converted))
+    assert list(converted) == sorted(arr)
+
+
+@pytest.mark.parametrize("shape", list(INPUTS))
+@pytest.mark.parametrize("algorithm", AVAILABLE_SORTING_FUNCTIONS)
+def test_generators_sort_and_replay(algorithm, shape):
+    arr = _input(algorithm, shape)
+    steps = [*arr]
+    trace = Trace(arr, 16, 64)
+    trace.extend(getattr(Algorithms, algorithm)(steps, len(steps)))
+
+    # The generator sorts its own list, and replaying the operations it
+    # yielded must sort the original the same way
+    assert steps == sorted(arr)
+    assert list(trace.state_at(len(trace))) == sorted(arr)
+
+
+@pytest.mark.parametrize(
+    "shape", ["all_equal", "sorted", "reversed", "random"]
+)
+@pytest.mark.parametrize("kernel", [parallel_merge_sort, sample_sort])
+def test_parallel_kernels_sort(kernel, shape):
+    # Long enough that the chunks are really sorted on the pool
+    arr = {
+        "all_equal": [7] * PARALLEL_THRESHOLD,
+        "sorted": list(range(PARALLEL_THRESHOLD)),
+        "reversed": list(range(PARALLEL_THRESHOLD, 0, -1)),
+        "random": generate("random", PARALLEL_THRESHOLD + 3, 1, 10**6, 3),
+    }[shape]
+    result = [*arr]
+
+    kernel(result, len(result), 3)
+    assert result == sorted(arr)
+
+
+def test_numpy_merge_sort_wide_values():
+    np = pytest.importorskip("numpy")
+    from sorting_vis.numpy_algorithms import NumpyAlgorithms
+
+    # block * span would overflow int64 if the keys spanned the values
+    arr = np.random.default_rng(0).integers(0, 10**15, 100_000)
+    expected = np.sort(arr)
+
+    NumpyAlgorithms.merge_sort(arr, len(arr))
+    assert np.array_equal(arr, expected)
@@ -0,0 +1,24 @@
+from sorting_vis.benchmark import run_benchmarks
+
+
+def test_speedup_over_the_serial_merge_sort():
+    rows = run_benchmarks(
+        ["parallel_merge_sort", "heap_sort"],
+        [300],
+        ["random", "sorted"],
+        repeats=2,
+        counts=False,
+        workers=1,
+    )
+
+    # The reference merge sort is timed, but has no row of its own
+    assert [row["algorithm"] for row in rows] == [
+        "parallel_merge_sort",
+        "heap_sort",
+    ] * 2
+    for row in rows:
+        assert row["repeats"] == 2
+        if row["algorithm"] == "parallel_merge_sort":
+            assert row["speedup"] > 0
+        else:
+            assert row["speedup"] is None
@@ -0,0 +1,50 @@
+from math import log2
+
+import pytest
+
+from sorting_vis.complexity import (
+    MODELS,
+    fit_complexity,
+    geometric_sizes,
+    model_exponent,
+)
+
+SIZES = geometric_sizes(128, 2048, 2)
+
+
+def test_geometric_sizes():
+    assert SIZES == [128, 256, 512, 1024, 2048]
+    sizes = geometric_sizes(10, 20, 1.05)
+    assert sizes[0] == 10 and sizes[-1] <= 20
+    assert sizes == sorted(set(sizes))
+
+
+@pytest.mark.parametrize(
+    "model, exponent",
+    [("n", 1.0), ("n^1.5", 1.5), ("n^2", 2.0)],
+)
+def test_exact_power_laws(model, exponent):
+    fit = fit_complexity(SIZES, [3.0 * MODELS[model](n) for n in SIZES])
+    assert fit.exponent == pytest.approx(exponent)
+    assert fit.stderr == pytest.approx(0.0, abs=1e-9)
+    assert fit.best_model == model
+
+
+@pytest.mark.parametrize("model, power", [("n log n", 1), ("n log^2 n", 2)])
+def test_logarithmic_factors(model, power):
+    fit = fit_complexity(SIZES, [MODELS[model](n) / 7 for n in SIZES])
+    assert fit.best_model == model
+    assert fit.exponent == pytest.approx(model_exponent(model, SIZES))
+    # log2 n grows from 7 to 11 while n grows 16-fold, adding about
+    # 0.16 to the exponent per power of the logarithm
+    assert fit.exponent == pytest.approx(
+        1 + power * log2(11 / 7) / log2(16), rel=0.01
+    )
+
+
+def test_noisy_fit():
+    values = [n**2 * (1.05 if i % 2 else 0.95) for i, n in enumerate(SIZES)]
+    fit = fit_complexity(SIZES, values)
+    assert fit.best_model == "n^2"
+    assert fit.stderr > 0
+    assert abs(fit.exponent - 2) < 2 * fit.stderr + 0.05
@@ -0,0 +1,122 @@
+import importlib
+import inspect
+import sys
+from importlib.util import cache_from_source
+from pathlib import Path
+
+import pytest
+
+from sorting_vis import derive
+from sorting_vis.derive import CACHE_TAG, derive_bare
+
+SOURCE = """
+def _bump(arr, i, step):
+    yield ("write", i)
+    arr[i] += step
+    return arr[i]
+
+
+class Steps:
+    @staticmethod
+    def total(arr, length):
+        total = 0
+        for i in range(length):
+            yield ("read", i)
+            total += yield from _bump(arr, i, STEP)
+        for i in range(length):
+            yield ("mark", i)
+        arr.append(total)
+
+    @staticmethod
+    def endless(arr, length):
+        while True:
+            yield ("read", 0)
+"""
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    """Import a fresh module of generators from ``SOURCE``, returning it
+    and the path of its source.
+    """
+    path = tmp_path / "derive_sample.py"
+    path.write_text("STEP = 1\n" + SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "derive_sample", raising=False)
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    yield importlib.import_module("derive_sample"), path
+    sys.modules.pop("derive_sample", None)
+
+
+def test_strips_operations(module):
+    sample, _ = module
+    bare = derive_bare(sample.Steps, "Bare", exclude=["endless"])
+
+    assert not inspect.isgeneratorfunction(bare.total)
+    assert not hasattr(bare, "endless")
+    arr = [1, 2, 3]
+    # The values returned through ``yield from`` are kept
+    assert bare.total(arr, 3) is None
+    assert arr == [2, 3, 4, 9]
+    # The generators themselves are untouched
+    assert list(sample.Steps.total([1], 1)) == [
+        ("read", 0),
+        ("write", 0),
+        ("mark", 0),
+    ]
+
+
+def test_strips_module_helpers():
+    tree = derive._strip_class(
+        derive.ast.parse("STEP = 1\n" + SOURCE), "Steps", "Bare", ["endless"]
+    )
+    helper, cls = tree.body
+    assert helper.name == "_bump"
+    assert cls.name == "Bare"
+    code = derive.ast.unparse(tree)
+    assert "yield" not in code
+    # The loop that only yielded is gone
+    assert "mark" not in code
+    assert code.count("for i in range(length)") == 1
+
+
+def test_rejects_used_yields():
+    tree = derive.ast.parse(
+        "class Steps:\n"
+        "    @staticmethod\n"
+        "    def echo(arr, length):\n"
+        "        value = yield 1\n"
+    )
+    with pytest.raises(SyntaxError, match="whose value is used"):
+        derive._strip_class(tree, "Steps", "Bare", [])
+
+
+def test_cache_is_reused(module, monkeypatch):
+    sample, path = module
+    derive_bare(sample.Steps, "Bare", exclude=["endless"])
+    assert Path(cache_from_source(str(path), optimization=CACHE_TAG)).exists()
+
+    def parse(*args, **kwargs):
+        raise AssertionError("the cached kernels were not used")
+
+    monkeypatch.setattr(derive.ast, "parse", parse)
+    bare = derive_bare(sample.Steps, "Bare", exclude=["endless"])
+    arr = [1]
+    bare.total(arr, 1)
+    assert arr == [2, 2]
+
+
+def test_cache_is_invalidated(module):
+    sample, path = module
+    derive_bare(sample.Steps, "Bare", exclude=["endless"])
+
+    # The cache is keyed by the source, so an edit is picked up at once
+    path.write_text("STEP = 1\n" + SOURCE.replace("+= step", "+= 2 * step"))
+    bare = derive_bare(sample.Steps, "Bare", exclude=["endless"])
+    arr = [1]
+    bare.total(arr, 1)
+    assert arr == [3, 3]
+
+    # So does a different selection of kernels
+    bare = derive_bare(sample.Steps, "Bare", exclude=[])
+    assert hasattr(bare, "endless")
@@ -0,0 +1,71 @@
+import pytest
+
+from sorting_vis.distributions import (
+    DISTRIBUTIONS,
+    FEW_UNIQUE_VALUES,
+    NUMPY_THRESHOLD,
+    generate,
+    nearly_sorted_swaps,
+)
+
+# Below and above the length from which NumPy generates the arrays
+LENGTHS = [0, 1, 2, 257, NUMPY_THRESHOLD + 1]
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+def test_length_bounds_and_seed(distribution, n):
+    arr = generate(distribution, n, 10, 1000, 7)
+
+    assert len(arr) == n
+    assert all(isinstance(value, int) for value in arr)
+    assert all(10 <= value <= 1000 for value in arr)
+    assert generate(distribution, n, 10, 1000, 7) == arr
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("distribution", list(DISTRIBUTIONS))
+def test_equal_bounds(distribution, n):
+    assert generate(distribution, n, 5, 5, 1) == [5] * n
+
+
+@pytest.mark.parametrize("n", [257, NUMPY_THRESHOLD + 1])
+def test_shapes(n):
+    def shape(distribution, seed=3):
+        return generate(distribution, n, 10, 1000, seed)
+
+    assert shape("random") != shape("random", 4)
+    assert shape("sorted") == sorted(shape("sorted"))
+    assert shape("reversed") == sorted(shape("reversed"), reverse=True)
+
+    nearly_sorted = shape("nearly_sorted")
+    out_of_place = sum(
+        a != b for a, b in zip(nearly_sorted, sorted(nearly_sorted))
+    )
+    assert 0 < out_of_place <= 2 * nearly_sorted_swaps(n)
+
+    assert len(set(shape("few_unique"))) <= FEW_UNIQUE_VALUES
+
+    sawtooth = shape("sawtooth")
+    assert sum(a > b for a, b in zip(sawtooth, sawtooth[1:])) < 8
+
+    organ_pipe = shape("organ_pipe")
+    peak = organ_pipe.index(max(organ_pipe))
+    assert organ_pipe[: peak + 1] == sorted(organ_pipe[: peak + 1])
+    assert organ_pipe[peak:] == sorted(organ_pipe[peak:], reverse=True)
+
+    # About 68% of the values are within a standard deviation of the mean
+    gaussian = shape("gaussian")
+    within = sum(340 <= value <= 670 for value in gaussian)
+    assert 0.6 < within / n < 0.76
+
+    partitioned = shape("partitioned")
+    pivot = sorted(partitioned)[n // 2]
+    below = sum(value < pivot for value in partitioned)
+    assert max(partitioned[:below], default=pivot) < pivot
+    assert min(partitioned[below:]) >= pivot
+
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError, match="Unknown distribution"):
+        generate("no_such_shape", 10, 1, 2, 0)
@@ -0,0 +1,87 @@
+import time
+from itertools import count
+
+import pytest
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.distributions import generate
+from sorting_vis.operations import COMPARE, Operation
+from sorting_vis.producer import PRODUCER_BATCH, OperationProducer
+from sorting_vis.trace import Trace
+
+TIMEOUT = 5
+
+
+def _endless():
+    for i in count():
+        yield Operation(COMPARE, i % 10, i % 7)
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _drain(producer, trace):
+    while producer.drain_into(trace, wait=True):
+        pass
+
+
+def test_delivers_every_operation():
+    arr = generate("random", 300, 1, 1000, 4)
+    expected = list(Algorithms.merge_sort([*arr], len(arr)))
+    # Smaller than the sort, so the producer has to wait for the consumer
+    producer = OperationProducer(
+        Algorithms.merge_sort([*arr], len(arr)), capacity=PRODUCER_BATCH
+    )
+    trace = Trace(arr)
+
+    _drain(producer, trace)
+    assert [trace.operation(i) for i in range(len(trace))] == expected
+    producer.thread.join(TIMEOUT)
+    assert not producer.thread.is_alive()
+
+
+def test_backpressure():
+    producer = OperationProducer(_endless(), capacity=PRODUCER_BATCH * 2)
+    buffer = producer.buffer
+
+    _wait_until(lambda: len(buffer) == buffer.capacity)
+    written = buffer.written
+    time.sleep(0.1)
+    # Blocked on the full buffer rather than running ahead of the gui
+    assert buffer.written == written
+    assert producer.thread.is_alive()
+
+    producer.drain_into(Trace([0] * 10), limit=PRODUCER_BATCH)
+    _wait_until(lambda: buffer.written == written + PRODUCER_BATCH)
+    assert len(buffer) == buffer.capacity
+    producer.cancel()
+
+
+def test_cancel_stops_a_blocked_producer():
+    producer = OperationProducer(_endless(), capacity=PRODUCER_BATCH)
+    _wait_until(lambda: len(producer.buffer) == PRODUCER_BATCH)
+
+    producer.cancel()
+    producer.thread.join(TIMEOUT)
+    assert not producer.thread.is_alive()
+    assert producer.buffer.finished
+    assert len(producer.buffer) == PRODUCER_BATCH
+
+
+def test_reraises_the_algorithms_error():
+    def failing():
+        yield Operation(COMPARE, 0, 1)
+        yield Operation(COMPARE, 1, 2)
+        raise RuntimeError("boom")
+
+    producer = OperationProducer(failing())
+    trace = Trace([3, 2, 1])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        _drain(producer, trace)
+    # Only after the operations made before the error
+    assert len(trace) == 2
@@ -0,0 +1,83 @@
+from math import erfc, sqrt
+
+import pytest
+
+from sorting_vis.regression import (
+    Case,
+    Comparison,
+    format_report,
+    mann_whitney_greater,
+)
+
+
+def _p_value(u, n1, n2, variance):
+    z = (u - n1 * n2 / 2 - 0.5) / sqrt(variance)
+    return 0.5 * erfc(z / sqrt(2))
+
+
+def test_disjoint_samples():
+    slow = [10.0 + i for i in range(8)]
+    fast = [float(i) for i in range(8)]
+
+    # Every slow sample outranks every fast one: U = 8 * 8
+    expected = _p_value(64, 8, 8, 8 * 8 / 12 * 17)
+    assert mann_whitney_greater(slow, fast) == pytest.approx(expected)
+    assert expected == pytest.approx(0.00046955, rel=1e-4)
+    assert mann_whitney_greater(fast, slow) == pytest.approx(0.99967896)
+
+
+def test_tied_samples():
+    sample = [1, 2, 2, 3, 4, 5, 5, 6]
+    other = [0, 1, 1, 2, 3, 3, 4, 4]
+
+    # Rank sum 81, so U = 81 - 36; the ties of 3, 3, 3, 3 and 2 values
+    # contribute 4 * (27 - 3) + (8 - 2) to the correction
+    variance = 8 * 8 / 12 * (17 - 102 / (16 * 15))
+    assert mann_whitney_greater(sample, other) == pytest.approx(
+        _p_value(45, 8, 8, variance)
+    )
+    assert mann_whitney_greater(sample, other) == pytest.approx(
+        0.0918438, rel=1e-5
+    )
+
+
+def test_identical_samples():
+    assert mann_whitney_greater([1.0] * 8, [1.0] * 8) == 1.0
+
+
+def _comparison(change, p_value, algorithm="merge_sort"):
+    return Comparison(
+        Case("bare", algorithm, 256, "random"),
+        1.0,
+        1.0 + change,
+        change,
+        p_value,
+    )
+
+
+def test_report_threshold():
+    comparisons = [
+        _comparison(0.5, 0.001, "regressed"),
+        # Significant, but within the threshold
+        _comparison(0.05, 0.001, "small"),
+        # Over the threshold, but not significant
+        _comparison(0.5, 0.2, "noisy"),
+        _comparison(-0.5, 0.999, "improved"),
+        _comparison(-0.5, 0.5, "noisy_improvement"),
+    ]
+    report, regressions = format_report(comparisons, 0.1, 0.01)
+    lines = report.splitlines()
+
+    assert regressions == 1
+    assert len(lines) == 3
+    assert lines[0].startswith("- REGRESSED  bare/regressed n=256 random")
+    assert lines[1].startswith("+ improved   bare/improved n=256 random")
+    assert lines[2] == (
+        "1 regressed, 1 improved and 3 unchanged of 5 cases "
+        "(threshold 10%, alpha 0.01)"
+    )
+
+    verbose, _ = format_report(comparisons, 0.1, 0.01, verbose=True)
+    assert verbose.count("unchanged  bare/") == 3
+    # A looser threshold lets the small change through
+    assert format_report(comparisons, 0.01, 0.01)[1] == 2
@@ -0,0 +1,99 @@
+import os
+import time
+
+import pytest
+
+from sorting_vis.settings import FIELDS, Settings
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "config.ini"
+
+
+def test_defaults_without_a_config(path):
+    settings = Settings(path)
+
+    assert settings.values == {
+        name: field.default for name, field in FIELDS.items()
+    }
+    assert not path.exists()
+
+
+def test_load_keeps_defaults_of_invalid_values(path):
+    path.write_text(
+        "[main]\nspeed = 0\nlsb = -3\nusb = 400\nseed = x\n"
+        "algo = no_such_sort\ndistribution = gaussian\n"
+    )
+    settings = Settings(path)
+
+    assert settings.get("speed") == FIELDS["speed"].default
+    assert settings.get("lsb") == 0
+    assert settings.get("usb") == 400
+    assert settings.get("seed") == 0
+    assert settings.get("algo") == FIELDS["algo"].default
+    assert settings.get("distribution") == "gaussian"
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [("speed", 0), ("lsb", -1), ("seed", "7"), ("check", 1), ("sc", 2.0)],
+)
+def test_set_rejects_invalid_values(path, name, value):
+    settings = Settings(path)
+
+    with pytest.raises(ValueError, match=name):
+        settings.set(name, value)
+    assert settings.get(name) == FIELDS[name].default
+    assert not settings.dirty
+
+
+def test_saves_are_debounced(path, monkeypatch):
+    settings = Settings(path, save_delay=0.2)
+    saves = []
+    save = settings.save
+    monkeypatch.setattr(settings, "save", lambda: saves.append(save()))
+
+    for seed in range(1, 6):
+        settings.set("seed", seed)
+        time.sleep(0.05)
+    assert not path.exists()
+
+    time.sleep(0.5)
+    assert len(saves) == 1
+    assert Settings(path).get("seed") == 5
+
+
+def test_close_saves_pending_changes(path):
+    settings = Settings(path, save_delay=60)
+    settings.set("usb", 900)
+    settings.set("check", False)
+    settings.close()
+
+    reloaded = Settings(path)
+    assert reloaded.get("usb") == 900
+    assert reloaded.get("check") is False
+    assert not settings.dirty
+
+
+def test_failed_save_keeps_the_old_config(path, monkeypatch):
+    settings = Settings(path, save_delay=60)
+    settings.set("seed", 1)
+    settings.close()
+    before = path.read_text()
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    settings.set("seed", 2)
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        settings.close()
+
+    assert path.read_text() == before
+    assert os.listdir(path.parent) == [path.name]
+    # Still dirty, so the next save retries
+    assert settings.dirty
+    monkeypatch.undo()
+    settings.close()
+    assert Settings(path).get("seed") == 2
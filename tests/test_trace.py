@@ -0,0 +1,39 @@
+import pytest
+
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.distributions import generate
+from sorting_vis.operations import apply_operation
+from sorting_vis.trace import Trace
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["heap_sort", "merge_sort", "cycle_sort"]
+)
+@pytest.mark.parametrize(
+    "keyframe_interval, snapshot_interval",
+    [(1, 1), (16, 16), (7, 50), (5, 3), (64, 10_000)],
+)
+def test_sparse_keyframes(algorithm, keyframe_interval, snapshot_interval):
+    arr = generate("few_unique", 80, 1, 1000, 5)
+    ops = list(getattr(Algorithms, algorithm)([*arr], len(arr)))
+    trace = Trace(arr, keyframe_interval, snapshot_interval)
+    trace.extend(iter(ops))
+
+    state = [*arr]
+    for step in range(len(ops) + 1):
+        assert list(trace.state_at(step)) == state
+        if step < len(ops):
+            apply_operation(state, ops[step])
+
+
+def test_snapshots_are_sparse():
+    arr = generate("random", 500, 1, 1000, 1)
+    trace = Trace(arr, 16, len(arr))
+    trace.extend(Algorithms.merge_sort([*arr], len(arr)))
+
+    # One full snapshot per array length's worth of operations
+    assert len(trace.snapshots) == len(trace) // 16 // 32 + 1
+    for delta in trace.deltas:
+        if delta is not None:
+            indices, values = delta
+            assert len(indices) == len(values) <= 2 * 16
@@ -0,0 +1,183 @@
+import struct
+
+import pytest
+
+from sorting_vis.__main__ import main
+from sorting_vis.algorithms import Algorithms
+from sorting_vis.distributions import generate
+from sorting_vis.operations import (
+    COMPARE,
+    MARK,
+    SWAP,
+    WRITE,
+    Operation,
+    apply_operation,
+)
+from sorting_vis.trace import Trace
+from sorting_vis.trace_file import (
+    HEADER,
+    TraceFile,
+    TraceFormatError,
+    TraceWriter,
+    _write_varint,
+    record_trace,
+)
+
+
+def _encode(value):
+    buffer = bytearray()
+    _write_varint(buffer, value)
+    return bytes(buffer)
+
+
+def _replay(arr, ops, step):
+    state = [*arr]
+    for op in ops[:step]:
+        apply_operation(state, op)
+    return state
+
+
+@pytest.mark.parametrize(
+    "value, encoded",
+    [
+        (0, b"\x00"),
+        (-1, b"\x01"),
+        (1, b"\x02"),
+        (63, b"\x7e"),
+        (-64, b"\x7f"),
+        (64, b"\x80\x01"),
+        (-65, b"\x81\x01"),
+        (300, b"\xd8\x04"),
+    ],
+)
+def test_varint_known_answers(value, encoded):
+    assert _encode(value) == encoded
+
+
+def test_operations_round_trip(tmp_path):
+    path = tmp_path / "ops.svtrace"
+    arr = list(range(1000))
+    # Deltas of both signs and every varint length, up to the uint32 limits
+    ops = [
+        Operation(WRITE, 0, 2**32 - 1),
+        Operation(WRITE, 999, 0),
+        Operation(COMPARE, 5, 999),
+        Operation(COMPARE, 999, 5),
+        Operation(SWAP, 999, 0),
+        Operation(MARK, 3, 7),
+        Operation(MARK, 500),
+        Operation(WRITE, 128, 2**31),
+        Operation(WRITE, 127, 1),
+    ]
+    with TraceWriter(str(path), "test", arr, keyframe_interval=4) as writer:
+        writer.extend(iter(ops))
+
+    with TraceFile(str(path)) as trace:
+        assert len(trace) == len(ops)
+        assert list(trace.operations()) == ops
+        for start in range(len(ops) + 1):
+            assert list(trace.operations(start)) == ops[start:]
+        assert list(trace.state_at(len(ops))) == _replay(arr, ops, len(ops))
+
+
+def test_header_round_trip(tmp_path):
+    path = tmp_path / "merge_sort.svtrace"
+    op_count = record_trace(
+        str(path), "merge_sort", 100, 5, 90, 42, 64, None, "sawtooth"
+    )
+
+    with TraceFile(str(path)) as trace:
+        assert len(trace) == op_count
+        assert trace.algorithm == "merge_sort"
+        assert trace.distribution == "sawtooth"
+        assert (trace.seed, trace.lowerbound, trace.upperbound) == (42, 5, 90)
+        assert trace.samplecount == 100
+        assert trace.keyframe_interval == 64
+        assert list(trace.state_at(0)) == generate("sawtooth", 100, 5, 90, 42)
+
+
+def test_other_versions_are_rejected(tmp_path):
+    path = tmp_path / "old.svtrace"
+    with TraceWriter(str(path), "test", [1, 2]) as writer:
+        writer.append(Operation(SWAP, 0, 1))
+    data = bytearray(path.read_bytes())
+    data[8:10] = (1).to_bytes(2, "little")
+    path.write_bytes(data)
+
+    with pytest.raises(TraceFormatError, match="version 1"):
+        TraceFile(str(path))
+
+
+@pytest.mark.parametrize("size", [0, HEADER.size - 1])
+def test_short_files_are_rejected(tmp_path, size):
+    path = tmp_path / "short.svtrace"
+    path.write_bytes(b"\0" * size)
+    with pytest.raises(TraceFormatError):
+        TraceFile(str(path))
+
+
+def test_truncated_files_are_rejected(tmp_path):
+    path = tmp_path / "truncated.svtrace"
+    record_trace(str(path), "bubble_sort", 20, 1, 100, 0)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(TraceFormatError, match="truncated"):
+        TraceFile(str(path))
+
+
+def test_failed_writes_leave_no_file(tmp_path):
+    path = tmp_path / "failed.svtrace"
+    # The bounds don't fit the header's uint32s
+    with pytest.raises(struct.error):
+        TraceWriter(str(path), "test", [1, 2], lowerbound=-5)
+    assert not path.exists()
+
+    with pytest.raises(RuntimeError):
+        with TraceWriter(str(path), "test", [1, 2]) as writer:
+            writer.append(Operation(SWAP, 0, 1))
+            raise RuntimeError
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        (["--lower", "-5"], "--lower must not be negative"),
+        (["--lower", "700", "--upper", "300"], "must not be greater"),
+        (["--upper", str(2**32)], "--upper must be at most"),
+        (["-n", "0"], "--samples must be positive"),
+        (["--keyframe-interval", "0"], "--keyframe-interval must be"),
+        (["--max-operations", "-1"], "--max-operations must not be"),
+    ],
+)
+def test_invalid_options_create_no_file(tmp_path, capsys, options, message):
+    path = tmp_path / "invalid.svtrace"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["trace", "bubble_sort", "-o", str(path), *options])
+
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("keyframe_interval", [1, 7, 64])
+def test_keyframe_seek(tmp_path, keyframe_interval):
+    arr = generate("random", 60, 1, 1000, 3)
+    ops = list(Algorithms.merge_sort([*arr], len(arr)))
+    path = tmp_path / "seek.svtrace"
+    with TraceWriter(
+        str(path), "merge_sort", arr, keyframe_interval=keyframe_interval
+    ) as writer:
+        writer.extend(iter(ops))
+    trace = Trace(arr, keyframe_interval)
+    trace.extend(iter(ops))
+
+    with TraceFile(str(path)) as trace_file:
+        assert trace_file.keyframe_count == -(-len(ops) // keyframe_interval)
+        # Backwards, so every seek lands away from the decoding cursor
+        for step in reversed(range(len(ops) + 1)):
+            expected = _replay(arr, ops, step)
+            assert list(trace.state_at(step)) == expected
+            assert list(trace_file.state_at(step)) == expected
+        assert [trace_file.operation(i) for i in range(len(ops))] == ops
+        assert [trace.operation(i) for i in range(len(ops))] == ops